@@ -0,0 +1,88 @@
+"""
+Tile animation tables
+One cycle of symbol offsets is precomputed per animated tile class, and
+each tile reads it at its own phase so the map does not move in lockstep.
+A frame costs one table lookup per tile, and only tiles whose offset
+changed have to be redrawn into the cached map layer.
+"""
+
+import math
+import numpy as np
+
+# Animated tile classes: the symbol's axis of motion, angular speed per
+# frame, amplitude in pixels and color
+TILE_ANIMATIONS = {
+    "T": {"axis": "x", "speed": 0.1, "amplitude": 2, "color": 3},  # Tree sway
+    "o": {"axis": "y", "speed": 0.2, "amplitude": 1, "color": 12},  # Water wave
+}
+
+
+def build_cycle(speed, amplitude):
+    """Integer offsets for one full sine cycle at `speed` radians per frame"""
+    period = max(1, round(2 * math.pi / speed))
+    return np.array(
+        [round(math.sin(2 * math.pi * i / period) * amplitude) for i in range(period)],
+        dtype=np.int8,
+    )
+
+
+class TileAnimator:
+    """Per-tile animation offsets for every animated tile of a map"""
+
+    def __init__(self, tiles, tile_codes, tile_size, seed=0):
+        rng = np.random.default_rng(seed)
+        # Symbols must stay inside their tile, so small tiles move less
+        max_amplitude = max(0, (tile_size - 1) // 2)
+        self.classes = []
+        for tile, spec in TILE_ANIMATIONS.items():
+            ys, xs = np.nonzero(tiles == tile_codes[tile])
+            amplitude = min(spec["amplitude"], max_amplitude)
+            table = build_cycle(spec["speed"], amplitude)
+            phases = rng.integers(0, len(table), len(xs))
+            self.classes.append(
+                {
+                    "tile": tile,
+                    "spec": spec,
+                    "xs": xs,
+                    "ys": ys,
+                    "table": table,
+                    "phases": phases,
+                    "drawn": None,  # Offsets currently in the layer
+                }
+            )
+
+    def invalidate(self):
+        """Forget what was drawn, e.g. after the layer was re-rendered"""
+        for anim in self.classes:
+            anim["drawn"] = None
+
+    def offsets(self, tile, frame):
+        """Current offset of every tile of a class"""
+        for anim in self.classes:
+            if anim["tile"] == tile:
+                table = anim["table"]
+                return table[(frame + anim["phases"]) % len(table)]
+        raise KeyError(tile)
+
+    def changes(self, frame):
+        """(tile, spec, xs, ys, offsets) of the tiles that need redrawing"""
+        for anim in self.classes:
+            if not len(anim["xs"]):
+                continue
+            table = anim["table"]
+            offsets = table[(frame + anim["phases"]) % len(table)]
+            drawn = anim["drawn"]
+            if drawn is None:
+                changed = slice(None)
+            else:
+                changed = np.flatnonzero(offsets != drawn)
+                if not len(changed):
+                    continue
+            anim["drawn"] = offsets
+            yield (
+                anim["tile"],
+                anim["spec"],
+                anim["xs"][changed],
+                anim["ys"][changed],
+                offsets[changed],
+            )
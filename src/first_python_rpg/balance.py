@@ -0,0 +1,214 @@
+"""
+Monte Carlo balance simulator
+Plays out many runs of the overworld event loop per difficulty. Each run
+is a row in a batch of numpy arrays, so every roll for every move of every
+run in a chunk is drawn at once, and chunks are spread over a process pool.
+
+Usage: python -m first_python_rpg.balance --runs 1000000 --steps 300
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .map_data import DIFFICULTY_LEVELS, ENEMY_TYPES, EVENT_TYPES
+from .player import Player
+
+EVENT_CHANCE = 0.2  # Per move, as in GameEngine.move_player
+ENCOUNTER_CHANCE = 0.2
+
+
+def event_outcomes(difficulty="Easy"):
+    """(health change, gold change) of each entry in EVENT_TYPES
+
+    Read off by applying each event's effect to a fresh player of the
+    difficulty, so the simulator follows any change to the events themselves.
+    """
+    outcomes = {}
+    for event in EVENT_TYPES:
+        player = Player(difficulty)
+        health, gold = player.health, player.gold
+        if event["effect"]:
+            event["effect"](player)
+        outcomes[event["name"]] = (player.health - health, player.gold - gold)
+    return outcomes
+
+
+class BalanceReport:
+    """Aggregated results of a batch of simulated runs"""
+
+    def __init__(self, difficulty, runs, steps):
+        self.difficulty = difficulty
+        self.runs = runs
+        self.steps = steps
+        self.alive = np.zeros(steps + 1, dtype=np.int64)  # Alive after each move
+        self.gold = np.zeros(steps + 1, dtype=np.float64)  # Summed over runs
+        self.death_causes = {}
+
+    @property
+    def survival(self):
+        """Fraction of runs still alive after each move"""
+        return self.alive / self.runs
+
+    @property
+    def mean_gold(self):
+        """Average gold held after each move"""
+        return self.gold / self.runs
+
+    def merge(self, partial):
+        """Add the results of one simulated chunk"""
+        self.alive += partial["alive"]
+        self.gold += partial["gold"]
+        for cause, count in partial["death_causes"].items():
+            self.death_causes[cause] = self.death_causes.get(cause, 0) + count
+
+    def median_lifetime(self):
+        """Move at which half of the runs have died, or None"""
+        dead_half = np.nonzero(self.survival <= 0.5)[0]
+        return int(dead_half[0]) if len(dead_half) else None
+
+    def summary(self):
+        """Human readable report"""
+        lines = [f"{self.difficulty}: {self.runs} runs x {self.steps} moves"]
+        for step in sorted({10, 50, 100, self.steps} & set(range(self.steps + 1))):
+            lines.append(
+                f"  move {step:>4}: {self.survival[step]:6.1%} alive, "
+                f"{self.mean_gold[step]:6.1f} gold"
+            )
+        lines.append(f"  median lifetime: {self.median_lifetime()}")
+        deaths = sum(self.death_causes.values()) or 1
+        for cause, count in sorted(self.death_causes.items(), key=lambda c: -c[1]):
+            lines.append(f"  killed by {cause}: {count / deaths:.1%}")
+        return "\n".join(lines)
+
+
+def difficulty_rules(difficulty, random_events=True, enemy_encounters=True):
+    """Simulation parameters for one entry of DIFFICULTY_LEVELS"""
+    level = DIFFICULTY_LEVELS[difficulty]
+    outcomes = event_outcomes(difficulty)
+    return {
+        "max_health": level["max_health"],
+        "event_health": [outcomes[e["name"]][0] for e in EVENT_TYPES],
+        "event_gold": [outcomes[e["name"]][1] for e in EVENT_TYPES],
+        "damage_scale": level["enemy_damage_scale"],
+        "random_events": random_events,
+        "enemy_encounters": enemy_encounters,
+    }
+
+
+def simulate_chunk(task):
+    """Simulate a chunk of runs; task is (seed sequence, runs, steps, rules)"""
+    seed, runs, steps, rules = task
+    rng = np.random.default_rng(seed)
+    shape = (runs, steps)
+
+    # Random events happen first; encounters only when no event fired
+    if rules["random_events"]:
+        event = rng.random(shape) < EVENT_CHANCE
+    else:
+        event = np.zeros(shape, dtype=bool)
+    event_type = rng.integers(0, len(EVENT_TYPES), shape, dtype=np.int8)
+    if rules["enemy_encounters"]:
+        encounter = ~event & (rng.random(shape) < ENCOUNTER_CHANCE)
+    else:
+        encounter = np.zeros(shape, dtype=bool)
+
+    # Enemy(strength=randint(1, 3)) with a random type's damage modifier,
+    # then damage is randint(1, strength) scaled by the difficulty, as in
+    # GameEngine.move_player
+    enemy_type = rng.integers(0, len(ENEMY_TYPES), shape, dtype=np.int8)
+    dmg_mods = np.array([etype["dmg_mod"] for etype in ENEMY_TYPES])
+    strength = rng.integers(1, 4, shape) + dmg_mods[enemy_type]
+    strength = np.maximum(strength, 1)
+    damage = (rng.random(shape) * strength).astype(np.int64) + 1
+    damage = np.maximum(1, np.rint(damage * rules["damage_scale"])).astype(np.int64)
+
+    event_health = np.array(rules["event_health"])
+    event_gold = np.array(rules["event_gold"])
+    health_delta = np.where(event, event_health[event_type], 0)
+    health_delta -= np.where(encounter, damage, 0)
+    gold_delta = np.where(event, event_gold[event_type], 0)
+
+    health = rules["max_health"] + np.cumsum(health_delta, axis=1)
+    dead = health <= 0
+    died = dead.any(axis=1)
+    death_step = np.where(died, dead.argmax(axis=1), steps)  # Index of fatal move
+
+    # Nothing happens after death, so freeze gold from the fatal move on
+    step_index = np.arange(steps)
+    gold = np.cumsum(np.where(step_index <= death_step[:, None], gold_delta, 0), axis=1)
+
+    alive = np.empty(steps + 1, dtype=np.int64)
+    alive[0] = runs
+    alive[1:] = (death_step[:, None] > step_index).sum(axis=0)
+    gold_totals = np.zeros(steps + 1)
+    gold_totals[1:] = gold.sum(axis=0)
+
+    # Name what dealt the fatal blow
+    death_causes = {}
+    fatal_runs = np.nonzero(died)[0]
+    fatal_steps = death_step[fatal_runs]
+    by_event = event[fatal_runs, fatal_steps]
+    causes = np.where(
+        by_event,
+        event_type[fatal_runs, fatal_steps],
+        len(EVENT_TYPES) + enemy_type[fatal_runs, fatal_steps].astype(np.int64),
+    )
+    names = [e["name"] for e in EVENT_TYPES] + [e["name"] for e in ENEMY_TYPES]
+    for cause, count in zip(*np.unique(causes, return_counts=True)):
+        death_causes[names[cause]] = int(count)
+
+    return {"alive": alive, "gold": gold_totals, "death_causes": death_causes}
+
+
+def simulate(
+    difficulty="Easy",
+    runs=10000,
+    steps=300,
+    workers=None,
+    seed=None,
+    chunk_size=2000,
+    random_events=True,
+    enemy_encounters=True,
+):
+    """Simulate `runs` complete runs of up to `steps` moves at a difficulty
+
+    workers=1 simulates in this process, otherwise chunks go to a process
+    pool with that many workers (None lets the pool decide).
+    """
+    rules = difficulty_rules(difficulty, random_events, enemy_encounters)
+    chunk_runs = [chunk_size] * (runs // chunk_size)
+    if runs % chunk_size:
+        chunk_runs.append(runs % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_runs))
+    tasks = [(s, n, steps, rules) for s, n in zip(seeds, chunk_runs)]
+
+    report = BalanceReport(difficulty, runs, steps)
+    if workers == 1:
+        for task in tasks:
+            report.merge(simulate_chunk(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for partial in pool.map(simulate_chunk, tasks):
+                report.merge(partial)
+    return report
+
+
+def main(argv=None):
+    """Run the balance simulation for every difficulty and print reports"""
+    parser = argparse.ArgumentParser(description="Monte Carlo balance simulator")
+    parser.add_argument("--runs", type=int, default=100000)
+    parser.add_argument("--steps", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    for difficulty in DIFFICULTY_LEVELS:
+        start = time.perf_counter()
+        report = simulate(difficulty, args.runs, args.steps, args.workers, args.seed)
+        print(report.summary())
+        print(f"  ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Feature pipeline benchmark
+Starts a headless game once for each of the 128 combinations of the seven
+feature flags and times idle ticks, so the per-frame cost of every
+feature, and of every mix of them, shows up side by side. By default only
+the update systems run; --draw also times the draw systems, which needs
+a Pyxel window.
+
+Benchmark: python -m first_python_rpg.benchmark [--draw] [--ticks N]
+"""
+
+import argparse
+import itertools
+import random
+import time
+from .engine import GameEngine
+from .game import Game
+
+
+def feature_combinations(features):
+    """Every on/off assignment of the given feature names"""
+    for flags in itertools.product((False, True), repeat=len(features)):
+        yield dict(zip(features, flags))
+
+
+def benchmark_features(ticks=1000, seed=0, draw=False):
+    """Microseconds per idle tick for each feature combination
+
+    With `draw`, each tick also runs the playing screen's draw systems in
+    a windowed Game. Returns (enabled feature names, microseconds) pairs
+    in combination order.
+    """
+    engine = Game() if draw else GameEngine()
+    results = []
+    for combination in feature_combinations(list(engine.features)):
+        random.seed(seed)
+        engine.features.update(combination)
+        engine.start_game()
+        engine.state = "playing"
+        start = time.perf_counter()
+        for _ in range(ticks):
+            engine.step()
+            if draw:
+                engine.draw_playing()
+        elapsed = time.perf_counter() - start
+        enabled = tuple(name for name, on in combination.items() if on)
+        results.append((enabled, elapsed / ticks * 1e6))
+    engine.generation.shutdown()
+    return results
+
+
+def feature_costs(results):
+    """Mean extra microseconds per tick with each feature on versus off"""
+    features = {name for enabled, _ in results for name in enabled}
+    costs = {}
+    for name in sorted(features):
+        on = [micros for enabled, micros in results if name in enabled]
+        off = [micros for enabled, micros in results if name not in enabled]
+        costs[name] = sum(on) / len(on) - sum(off) / len(off)
+    return costs
+
+
+def main(argv=None):
+    """Print the per-tick cost of each feature combination, cheapest first"""
+    parser = argparse.ArgumentParser(prog="python -m first_python_rpg.benchmark")
+    parser.add_argument(
+        "--draw",
+        action="store_true",
+        help="also time the draw systems (opens a Pyxel window)",
+    )
+    parser.add_argument(
+        "--ticks", type=int, default=1000, help="ticks timed per combination"
+    )
+    args = parser.parse_args(argv)
+    results = benchmark_features(ticks=args.ticks, draw=args.draw)
+    if args.draw:
+        print("Timing update and draw systems per tick")
+    else:
+        print("Timing update systems only; pass --draw to include drawing")
+    baseline = results[0][1]
+    for enabled, micros in sorted(results, key=lambda result: result[1]):
+        names = ", ".join(enabled) or "(none)"
+        print(f"{micros:8.1f} us  {micros - baseline:+8.1f}  {names}")
+    print()
+    for name, cost in feature_costs(results).items():
+        print(f"{name:<20} {cost:+8.2f} us/tick")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Chunked overworld streaming
+Terrain is generated lazily, one chunk at a time, from the world seed and
+the chunk coordinates, and only a bounded working set stays in memory.
+"""
+
+import pyxel
+import random
+from collections import OrderedDict
+import numpy as np
+from .map import (
+    MAP_OFFSET_Y,
+    TILE_CHARS,
+    TILE_COLOR_TABLE,
+    WALKABLE,
+    generate_tiles,
+)
+from .map_data import MAP_SIZE
+
+CHUNK_SIZE = 32
+MAX_CHUNKS = 16
+
+
+class Chunk:
+    """A square block of terrain at chunk coordinates (cx, cy)"""
+
+    def __init__(self, cx, cy, tiles):
+        self.cx = cx
+        self.cy = cy
+        self.tiles = tiles
+        self.walkable = WALKABLE[tiles]
+
+
+class ChunkManager:
+    """Generates chunks on demand and evicts the least recently used ones"""
+
+    def __init__(self, seed=None, chunk_size=CHUNK_SIZE, max_chunks=MAX_CHUNKS):
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict()  # (cx, cy) -> Chunk, oldest first
+        self.generated = 0
+        self.evicted = 0
+
+    def generate_chunk(self, cx, cy):
+        """Generate a chunk; the same seed and coordinates give the same tiles"""
+        # SeedSequence only takes non-negative entropy, so fold the signs away
+        rng = np.random.default_rng([self.seed, cx & 0xFFFFFFFF, cy & 0xFFFFFFFF])
+        self.generated += 1
+        return Chunk(cx, cy, generate_tiles(rng, (self.chunk_size, self.chunk_size)))
+
+    def get_chunk(self, cx, cy):
+        """Get a chunk, generating it if needed and marking it as recently used"""
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.generate_chunk(cx, cy)
+            self.chunks[key] = chunk
+            if len(self.chunks) > self.max_chunks:
+                self.chunks.popitem(last=False)
+                self.evicted += 1
+        else:
+            self.chunks.move_to_end(key)
+        return chunk
+
+    def chunk_coords(self, x, y):
+        """Convert world tile coordinates to chunk coordinates"""
+        return x // self.chunk_size, y // self.chunk_size
+
+    def load_around(self, x, y, radius=1):
+        """Make sure the chunks within `radius` of a world tile are resident"""
+        if (2 * radius + 1) ** 2 > self.max_chunks:
+            raise ValueError(
+                f"Radius {radius} needs more than {self.max_chunks} chunks"
+            )
+        center_cx, center_cy = self.chunk_coords(x, y)
+        for cy in range(center_cy - radius, center_cy + radius + 1):
+            for cx in range(center_cx - radius, center_cx + radius + 1):
+                self.get_chunk(cx, cy)
+        # Touch the center last so it is the last candidate for eviction
+        self.get_chunk(center_cx, center_cy)
+
+    def tile_code(self, x, y):
+        """Get the tile code at world tile coordinates"""
+        chunk = self.get_chunk(*self.chunk_coords(x, y))
+        return chunk.tiles[y % self.chunk_size, x % self.chunk_size]
+
+    def tile_at(self, x, y):
+        """Get the tile character at world tile coordinates"""
+        return TILE_CHARS[self.tile_code(x, y)]
+
+    def is_walkable(self, x, y):
+        """Check if a world tile is walkable"""
+        chunk = self.get_chunk(*self.chunk_coords(x, y))
+        return bool(chunk.walkable[y % self.chunk_size, x % self.chunk_size])
+
+
+def ring_tiles(x, y, radius):
+    """Tiles on the square ring `radius` steps from (x, y), in row order"""
+    if radius == 0:
+        yield x, y
+        return
+    for tx in range(x - radius, x + radius + 1):
+        yield tx, y - radius
+    for ty in range(y - radius + 1, y + radius):
+        yield x - radius, ty
+        yield x + radius, ty
+    for tx in range(x - radius, x + radius + 1):
+        yield tx, y + radius
+
+
+class ChunkedMapPyxel:
+    """Unbounded map streamed from a ChunkManager, drawn as a view around a focus"""
+
+    def __init__(
+        self,
+        seed=None,
+        view_size=MAP_SIZE,
+        chunk_size=CHUNK_SIZE,
+        max_chunks=MAX_CHUNKS,
+    ):
+        self.chunks = ChunkManager(seed, chunk_size, max_chunks)
+        self.seed = self.chunks.seed
+        self.size = view_size
+        self.tile_size = max(1, 256 // view_size)
+        self.focus_x = 0
+        self.focus_y = 0
+        self.layer = None  # Rendered view, built on first draw
+        self.layer_origin = None  # View origin the layer was rendered at
+        self.follow(0, 0)
+
+    def follow(self, x, y):
+        """Center the view on a world tile and stream in the chunks around it"""
+        self.focus_x = x
+        self.focus_y = y
+        self.chunks.load_around(x, y)
+
+    def find_spawn(self, x=0, y=0, max_radius=64):
+        """Find the walkable tile nearest to (x, y), searching in square rings"""
+        for radius in range(max_radius + 1):
+            for tx, ty in ring_tiles(x, y, radius):
+                if self.is_walkable(tx, ty):
+                    return tx, ty
+        return x, y
+
+    def is_walkable(self, x, y):
+        """Check if a world tile is walkable"""
+        return self.chunks.is_walkable(x, y)
+
+    def tile_at(self, x, y):
+        """Get the tile character at world tile coordinates"""
+        return self.chunks.tile_at(x, y)
+
+    def view_origin(self):
+        """World coordinates of the top-left tile of the view"""
+        return self.focus_x - self.size // 2, self.focus_y - self.size // 2
+
+    def view_tiles(self):
+        """Tile codes in view, copied from each visible chunk once"""
+        origin_x, origin_y = self.view_origin()
+        size = self.chunks.chunk_size
+        view = np.empty((self.size, self.size), dtype=np.uint8)
+        for cy in range(origin_y // size, (origin_y + self.size - 1) // size + 1):
+            y0 = max(origin_y, cy * size)
+            y1 = min(origin_y + self.size, (cy + 1) * size)
+            for cx in range(origin_x // size, (origin_x + self.size - 1) // size + 1):
+                x0 = max(origin_x, cx * size)
+                x1 = min(origin_x + self.size, (cx + 1) * size)
+                tiles = self.chunks.get_chunk(cx, cy).tiles
+                view[y0 - origin_y : y1 - origin_y, x0 - origin_x : x1 - origin_x] = (
+                    tiles[
+                        y0 - cy * size : y1 - cy * size, x0 - cx * size : x1 - cx * size
+                    ]
+                )
+        return view
+
+    def render_layer(self):
+        """Render the view into the off-screen layer in one vectorized write"""
+        ts = self.tile_size
+        if self.layer is None:
+            self.layer = pyxel.Image(self.size * ts, self.size * ts)
+        pixels = np.frombuffer(self.layer.data_ptr(), dtype=np.uint8)
+        colors = TILE_COLOR_TABLE[self.view_tiles()]
+        pixels[:] = colors.repeat(ts, axis=0).repeat(ts, axis=1).ravel()
+        self.layer_origin = self.view_origin()
+
+    def draw(self):
+        """Blit the view, re-rendering it only after the view has moved"""
+        if self.layer_origin != self.view_origin():
+            self.render_layer()
+        pyxel.blt(
+            0, MAP_OFFSET_Y, self.layer, 0, 0, self.layer.width, self.layer.height
+        )
+
+    def move_player(self, player, dx, dy):
+        """Move player without wrapping and keep the view on them"""
+        if player.confused > 0 and random.random() < 0.5:
+            dx, dy = random.choice([(0, 1), (0, -1), (1, 0), (-1, 0)])
+
+        new_x = player.x + dx
+        new_y = player.y + dy
+
+        if self.is_walkable(new_x, new_y):
+            player.x = new_x
+            player.y = new_y
+            self.follow(new_x, new_y)
+
+        if player.confused > 0:
+            player.confused -= 1
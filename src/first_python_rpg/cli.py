@@ -1,17 +1,69 @@
 #!/usr/bin/env python3
 """CLI entry point for First Python RPG"""
 
+import argparse
+import atexit
 import sys
 import pyxel
 from .game import Game
+from .replay import InputRecorder, benchmark_replay
 
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(prog="first-python-rpg")
+    parser.add_argument(
+        "--profile-csv",
+        metavar="PATH",
+        help="stream per-frame stage timings to a CSV file",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="record the RNG seed and every frame's input to a replay file",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="replay a recording headless as fast as possible and report timing",
+    )
+    parser.add_argument(
+        "--chunked-world",
+        action="store_true",
+        help="explore an endless map streamed in chunks (also needed to replay "
+        "recordings made with it)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main CLI entry point"""
+    args = parse_args(argv)
+
+    if args.replay:
+        result = benchmark_replay(args.replay, chunked_world=args.chunked_world)
+        print(
+            f"Replayed {result['frames']} frames in {result['seconds']:.2f}s "
+            f"({result['frames_per_second']:.0f} frames/s), "
+            f"final state: {result['state']}"
+        )
+        return
+
     print("Starting First Python RPG...")
 
+    recorder = None
+    if args.record:
+        recorder = InputRecorder()
+        recorder.start()
+        # Pyxel exits the process on quit, so save from an exit hook
+        atexit.register(recorder.save, args.record)
+
     try:
-        game = Game()
+        game = Game(recorder, chunked_world=args.chunked_world)
+        if args.profile_csv:
+            game.profiler.start_csv(args.profile_csv)
+            # Flush the buffered tail of the CSV when Pyxel exits
+            atexit.register(game.profiler.stop_csv)
         game.run()
     except KeyboardInterrupt:
         print("\nGame interrupted by user")
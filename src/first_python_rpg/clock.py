@@ -0,0 +1,63 @@
+"""
+Fixed-timestep simulation clock
+Converts elapsed wall time into a whole number of fixed simulation ticks
+per rendered frame. Leftover time carries over in an accumulator, and a
+cap on catch-up ticks keeps a long stall from freezing the game.
+"""
+
+import time
+
+TICK_RATE = 60  # Simulation ticks per second
+MAX_TICKS_PER_FRAME = 5  # Catch-up cap; time beyond it is dropped
+
+
+class SimulationClock:
+    """Decides how many fixed ticks each rendered frame must simulate"""
+
+    def __init__(
+        self,
+        tick_rate=TICK_RATE,
+        max_ticks=MAX_TICKS_PER_FRAME,
+        time_source=time.perf_counter,
+    ):
+        self.tick_rate = tick_rate
+        self.tick_seconds = 1.0 / tick_rate
+        self.max_ticks = max_ticks
+        self.time_source = time_source
+        self.accumulator = 0.0  # Seconds not yet simulated
+        self.last_time = None
+        self.ticks = 0  # Ticks simulated so far
+        self.dropped_seconds = 0.0  # Time thrown away by the catch-up cap
+        self.behind = False  # Whether the last frame hit the cap
+
+    def advance(self):
+        """Ticks to simulate for the frame starting now"""
+        now = self.time_source()
+        if self.last_time is None:
+            elapsed = self.tick_seconds  # The first frame runs one tick
+        else:
+            elapsed = now - self.last_time
+        self.last_time = now
+
+        self.accumulator += elapsed
+        # A hair of tolerance so exact 1/60 s frames never round down
+        ticks = int(self.accumulator * self.tick_rate + 1e-6)
+        self.accumulator = max(0.0, self.accumulator - ticks * self.tick_seconds)
+
+        self.behind = ticks > self.max_ticks
+        if self.behind:
+            self.dropped_seconds += (ticks - self.max_ticks) * self.tick_seconds
+            ticks = self.max_ticks
+        self.ticks += ticks
+        return ticks
+
+    @property
+    def alpha(self):
+        """How far the clock is between the last tick and the next (0-1)"""
+        return min(1.0, self.accumulator * self.tick_rate)
+
+    def reset(self):
+        """Forget elapsed time, e.g. after loading or a debugger pause"""
+        self.accumulator = 0.0
+        self.last_time = None
+        self.behind = False
@@ -0,0 +1,160 @@
+"""
+Turn-based boss combat
+Turns wait in a queue ordered by the tick they come due. The fight only
+advances when the player acts on their turn or a scheduled boss turn
+comes due; every other tick is a single comparison. Each resolved turn
+produces structured CombatEvents, and the message shown is rebuilt from
+the latest turn instead of growing every frame.
+"""
+
+import heapq
+import itertools
+import random
+from .map_data import BOSS_NAMES
+
+BOSS_TURN_DELAY = 30  # Ticks between the player's move and the boss's reply
+ABILITY_COOLDOWN = 3  # Boss turns between special abilities
+SPELL_COST = 3  # Mana for a fireball
+MANA_REGEN = 1  # Mana regained at the end of each round
+
+# Special ability of each boss, by boss index
+ABILITIES = ("lash", "shield", "breath")
+
+MESSAGES = {
+    "attack": "You attack for {damage}!",
+    "spell": "Fireball hits for {damage}!",
+    "no_mana": "Not enough mana!",
+    "lash": "Hydra lashes twice! {damage} and {second} damage!",
+    "shield": "Golem shields itself (half damage next turn)!",
+    "breath": "Drake breathes fire! {damage} damage!",
+    "blocked": "You blocked the boss's attack!",
+    "boss_attack": "Boss hits you for {damage}!",
+    "victory": "{boss} is defeated!",
+    "defeat": "You have fallen!",
+    "fled": "You fled the battle.",
+}
+
+
+class CombatEvent:
+    """Something that happened in a fight, such as a hit or the outcome"""
+
+    def __init__(self, kind, **data):
+        self.kind = kind
+        self.data = data  # damage, second, boss, depending on the kind
+
+    def __repr__(self):
+        return f"CombatEvent({self.kind!r}, {self.data!r})"
+
+    def describe(self):
+        return MESSAGES[self.kind].format(**self.data)
+
+
+class BossCombat:
+    """A boss fight between the player and one boss, advanced turn by turn"""
+
+    def __init__(self, player, boss_idx, strength, health):
+        self.player = player
+        self.boss_idx = boss_idx
+        self.boss_name = BOSS_NAMES[boss_idx]
+        self.strength = strength
+        self.boss_health = health
+        self.boss_max_health = health
+        self.ability_cd = ABILITY_COOLDOWN
+        self.shielded = False  # Halves the player's next hit
+        self.outcome = None  # "victory", "defeat" or "fled" once over
+        self.message = f"Boss Fight: {self.boss_name}!"
+
+        self.tick = 0
+        self.queue = []  # Heap of (due tick, order, "player" or "boss")
+        self.order = itertools.count()
+        self.schedule(0, "player")
+
+    def schedule(self, delay, actor):
+        heapq.heappush(self.queue, (self.tick + delay, next(self.order), actor))
+
+    @property
+    def player_turn(self):
+        """True while the fight is waiting for the player's move"""
+        return bool(self.queue) and self.queue[0][2] == "player"
+
+    def update(self, actions=()):
+        """Advance one tick and return the events of any turn resolved on it"""
+        self.tick += 1
+        if not self.queue or self.queue[0][0] > self.tick:
+            return []
+        if self.queue[0][2] == "player":
+            events = self.take_player_turn(actions)
+        else:
+            heapq.heappop(self.queue)
+            events = self.take_boss_turn()
+        if events:
+            self.message = " ".join(event.describe() for event in events)
+        return events
+
+    def finish(self, outcome):
+        self.outcome = outcome
+        self.queue.clear()
+        return [CombatEvent(outcome, boss=self.boss_name)]
+
+    def take_player_turn(self, actions):
+        """Resolve the player's move; no move keeps the turn waiting"""
+        player = self.player
+        if "attack" in actions:
+            kind, damage = "attack", random.randint(2, 4) + player.sword_level
+        elif "spell" in actions:
+            if player.mana < SPELL_COST:
+                return [CombatEvent("no_mana")]
+            kind, damage = "spell", random.randint(3, 6)
+            player.mana -= SPELL_COST
+        elif "menu" in actions:
+            return self.finish("fled")
+        else:
+            return []
+
+        heapq.heappop(self.queue)
+        if self.shielded:
+            damage //= 2
+            self.shielded = False
+        self.boss_health -= damage
+        events = [CombatEvent(kind, damage=damage)]
+        if self.boss_health <= 0:
+            return events + self.finish("victory")
+        self.schedule(BOSS_TURN_DELAY, "boss")
+        return events
+
+    def take_boss_turn(self):
+        """The boss's ability when it is ready, then its attack"""
+        player = self.player
+        events = []
+        self.ability_cd -= 1
+        if self.ability_cd <= 0:
+            events.append(self.use_ability())
+            self.ability_cd = ABILITY_COOLDOWN
+
+        if player.block_next:
+            events.append(CombatEvent("blocked"))
+            player.block_next = False
+        else:
+            damage = random.randint(3, 6) + self.strength
+            player.take_damage(damage)
+            events.append(CombatEvent("boss_attack", damage=damage))
+
+        player.mana = min(player.max_mana, player.mana + MANA_REGEN)
+        if player.health <= 0:
+            return events + self.finish("defeat")
+        self.schedule(0, "player")
+        return events
+
+    def use_ability(self):
+        ability = ABILITIES[self.boss_idx]
+        if ability == "lash":
+            damage = random.randint(2, 4) + self.strength
+            self.player.take_damage(damage)
+            self.player.take_damage(damage // 2)
+            return CombatEvent(ability, damage=damage, second=damage // 2)
+        if ability == "shield":
+            self.shielded = True
+            return CombatEvent(ability)
+        damage = random.randint(4, 8) + self.strength
+        self.player.take_damage(damage)
+        return CombatEvent(ability, damage=damage)
@@ -0,0 +1,118 @@
+"""
+Connectivity analysis
+Labels the 4-connected components of a walkability mask with a vectorized
+union-find: every pass hooks the larger root of each open edge onto the
+smaller one, then pointer jumping flattens the trees. A handful of passes
+label a 1024x1024 map, and the labels drive map repair.
+"""
+
+import numpy as np
+
+
+def label_components(walkable):
+    """Label connected walkable regions
+
+    Returns (labels, sizes): labels is an int32 array shaped like the mask
+    with 0 on blocked tiles and 1..n on components, sizes[label] is the
+    tile count of each component (sizes[0] is 0).
+    """
+    height, width = walkable.shape
+    index = np.arange(height * width).reshape(height, width)
+    across = walkable[:, :-1] & walkable[:, 1:]
+    down = walkable[:-1, :] & walkable[1:, :]
+    first = np.concatenate([index[:, :-1][across], index[:-1, :][down]])
+    second = np.concatenate([index[:, 1:][across], index[1:, :][down]])
+
+    parent = np.arange(height * width)
+    while True:
+        root_a, root_b = parent[first], parent[second]
+        split = root_a != root_b
+        if not split.any():
+            break
+        # Edges already inside one tree stay there, so drop them
+        first, second = first[split], second[split]
+        root_a, root_b = root_a[split], root_b[split]
+        np.minimum.at(parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+    roots = parent.reshape(height, width)
+    labels = np.zeros((height, width), dtype=np.int32)
+    unique_roots, inverse = np.unique(roots[walkable], return_inverse=True)
+    labels[walkable] = inverse + 1
+    sizes = np.bincount(labels.ravel(), minlength=len(unique_roots) + 1)
+    sizes[0] = 0
+    return labels, sizes
+
+
+def reachable_fraction(walkable, spawn, labels=None, sizes=None):
+    """Share of walkable tiles in the spawn's component (0 if it is blocked)"""
+    if labels is None:
+        labels, sizes = label_components(walkable)
+    x, y = spawn
+    total = int(sizes.sum())
+    if not total or not labels[y, x]:
+        return 0.0
+    return sizes[labels[y, x]] / total
+
+
+def neighbor_labels(labels):
+    """Labels of the four neighbours of every tile (0 beyond the edge)"""
+    padded = np.pad(labels, 1)
+    return (
+        padded[:-2, 1:-1],
+        padded[2:, 1:-1],
+        padded[1:-1, :-2],
+        padded[1:-1, 2:],
+    )
+
+
+def repair_mask(walkable, spawn, min_fraction):
+    """Blocked tiles to open so the spawn reaches min_fraction of open ground
+
+    Each pass opens one bridge tile per component that sits a single tile
+    away from the spawn's component; when there are none, the spawn's
+    component grows by one ring. The map's outer edge is never opened.
+    """
+    walkable = walkable.copy()
+    opened = np.zeros_like(walkable)
+    interior = np.zeros_like(walkable)
+    interior[1:-1, 1:-1] = True
+    x, y = spawn
+    if not walkable[y, x]:
+        walkable[y, x] = opened[y, x] = True
+
+    while True:
+        labels, sizes = label_components(walkable)
+        spawn_label = labels[y, x]
+        if reachable_fraction(walkable, spawn, labels, sizes) >= min_fraction:
+            return opened
+
+        around = neighbor_labels(labels)
+        touches_spawn = np.zeros_like(walkable)
+        for side in around:
+            touches_spawn |= side == spawn_label
+        candidates = touches_spawn & ~walkable & interior
+        if not candidates.any():
+            return opened  # Nothing left to open
+
+        bridge_tiles = []
+        for side in around:
+            other = candidates & (side != 0) & (side != spawn_label)
+            flat = np.flatnonzero(other)
+            bridge_tiles.append((side.ravel()[flat], flat))
+        other_labels = np.concatenate([side_labels for side_labels, _ in bridge_tiles])
+        flat_tiles = np.concatenate([tiles for _, tiles in bridge_tiles])
+
+        if len(flat_tiles):
+            _, first = np.unique(other_labels, return_index=True)
+            to_open = np.zeros(walkable.size, dtype=bool)
+            to_open[flat_tiles[first]] = True
+            to_open = to_open.reshape(walkable.shape)
+        else:
+            to_open = candidates
+        walkable |= to_open
+        opened |= to_open
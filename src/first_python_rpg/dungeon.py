@@ -0,0 +1,138 @@
+"""
+Dungeon generation
+Binary space partitioning for room-and-corridor dungeons and a cellular
+automaton for caves. Both carve whole rooms, corridors and smoothing
+passes as numpy slice operations and return a uint8 tile array that
+MapPyxel can use directly.
+
+Benchmark: python -m first_python_rpg.dungeon
+"""
+
+import time
+import numpy as np
+from .map import TILE_CODES
+from .connectivity import label_components
+
+FLOOR = TILE_CODES["."]
+WALL = TILE_CODES["#"]
+
+MIN_LEAF = 6  # Smallest BSP partition side, walls included
+MIN_ROOM = 3  # Smallest room side
+
+
+def carve_corridor(tiles, start, end, horizontal_first):
+    """Carve an L-shaped corridor between two points with two slices"""
+    (x1, y1), (x2, y2) = start, end
+    if horizontal_first:
+        tiles[y1, min(x1, x2) : max(x1, x2) + 1] = FLOOR
+        tiles[min(y1, y2) : max(y1, y2) + 1, x2] = FLOOR
+    else:
+        tiles[min(y1, y2) : max(y1, y2) + 1, x1] = FLOOR
+        tiles[y2, min(x1, x2) : max(x1, x2) + 1] = FLOOR
+
+
+def room_center(room):
+    """Tile at the middle of an (x, y, w, h) room"""
+    x, y, w, h = room
+    return x + w // 2, y + h // 2
+
+
+def generate_bsp(size, rng, min_leaf=MIN_LEAF):
+    """Room-and-corridor dungeon; returns (tiles, rooms as (x, y, w, h))"""
+    if size - 2 < MIN_ROOM + 1:
+        raise ValueError(f"Dungeon size {size} is too small for a room")
+    # Small dungeons use smaller partitions so they still get several rooms
+    min_leaf = max(MIN_ROOM + 1, min(min_leaf, (size - 2) // 2))
+    tiles = np.full((size, size), WALL, dtype=np.uint8)
+
+    # Split breadth-first; children always come after their parent
+    nodes = [[1, 1, size - 2, size - 2, None]]  # x, y, w, h, first child
+    index = 0
+    while index < len(nodes):
+        x, y, w, h, _ = nodes[index]
+        can_cut_x = w >= 2 * min_leaf
+        can_cut_y = h >= 2 * min_leaf
+        if can_cut_x and (not can_cut_y or w > h or (w == h and rng.random() < 0.5)):
+            cut = int(rng.integers(min_leaf, w - min_leaf + 1))
+            children = [[x, y, cut, h, None], [x + cut, y, w - cut, h, None]]
+        elif can_cut_y:
+            cut = int(rng.integers(min_leaf, h - min_leaf + 1))
+            children = [[x, y, w, cut, None], [x, y + cut, w, h - cut, None]]
+        else:
+            index += 1
+            continue
+        nodes[index][4] = len(nodes)
+        nodes.extend(children)
+        index += 1
+
+    # Rooms in the leaves, then join sibling subtrees bottom-up. The last
+    # row and column of every leaf stay wall so neighbouring rooms never merge
+    room_of = [None] * len(nodes)
+    rooms = []
+    for index in range(len(nodes) - 1, -1, -1):
+        x, y, w, h, child = nodes[index]
+        if child is None:
+            room_w = int(rng.integers(MIN_ROOM, w))
+            room_h = int(rng.integers(MIN_ROOM, h))
+            room_x = x + int(rng.integers(0, w - room_w))
+            room_y = y + int(rng.integers(0, h - room_h))
+            tiles[room_y : room_y + room_h, room_x : room_x + room_w] = FLOOR
+            room_of[index] = (room_x, room_y, room_w, room_h)
+            rooms.append(room_of[index])
+        else:
+            first, second = room_of[child], room_of[child + 1]
+            carve_corridor(
+                tiles, room_center(first), room_center(second), rng.random() < 0.5
+            )
+            room_of[index] = first if rng.random() < 0.5 else second
+    rooms.reverse()
+    return tiles, rooms
+
+
+def generate_caves(size, rng, fill=0.45, steps=5):
+    """Cave dungeon from a cellular automaton, trimmed to its largest cave"""
+    wall = rng.random((size, size)) < fill
+    for _ in range(steps):
+        wall[0, :] = wall[-1, :] = wall[:, 0] = wall[:, -1] = True
+        padded = np.pad(wall, 1, constant_values=True).astype(np.uint8)
+        neighbors = (
+            padded[:-2, :-2]
+            + padded[:-2, 1:-1]
+            + padded[:-2, 2:]
+            + padded[1:-1, :-2]
+            + padded[1:-1, 2:]
+            + padded[2:, :-2]
+            + padded[2:, 1:-1]
+            + padded[2:, 2:]
+        )
+        # 4-5 rule: walls survive with 4+ wall neighbours, floors fill at 5+
+        wall = (neighbors >= 5) | (wall & (neighbors >= 4))
+    wall[0, :] = wall[-1, :] = wall[:, 0] = wall[:, -1] = True
+
+    # Only keep the biggest cave so every floor tile is reachable
+    labels, sizes = label_components(~wall)
+    if len(sizes) > 1:
+        wall = labels != sizes.argmax()
+    return np.where(wall, WALL, FLOOR).astype(np.uint8)
+
+
+def benchmark_dungeons(sizes=(64, 256, 1024), seed=0):
+    """Seconds to generate a dungeon of each size in both modes"""
+    results = []
+    for size in sizes:
+        for mode, generate in (("bsp", generate_bsp), ("caves", generate_caves)):
+            rng = np.random.default_rng(seed)
+            start = time.perf_counter()
+            generate(size, rng)
+            results.append((mode, size, time.perf_counter() - start))
+    return results
+
+
+def main():
+    """Print the generation benchmark"""
+    for mode, size, seconds in benchmark_dungeons():
+        print(f"{mode:>5} {size:>4}x{size:<4} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
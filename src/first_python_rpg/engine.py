@@ -0,0 +1,355 @@
+"""
+Headless game engine
+All game state and rules live here, with no dependency on a Pyxel window.
+Each tick takes the set of abstract input actions pressed on that frame,
+so the engine can be driven by the Pyxel front-end, a bot or a test.
+"""
+
+import random
+from .player import Player
+from .enemy import Enemy
+from .map import MapPyxel, MAP_OFFSET_Y
+from .chunks import ChunkedMapPyxel
+from .map_data import MAP_SIZE, EVENT_TYPES, DIFFICULTY_LEVELS
+from .pyxel_enhancements import (
+    EnhancedMapPyxel,
+    ProceduralDungeonGenerator,
+    QuestGenerator,
+    ParticleSystem,
+)
+from .profiler import FrameProfiler
+from .exploration import ExplorationMap
+from .pregen import GenerationService
+from .events import EventBus
+from .quests import ACTIVE_QUESTS, QuestManager
+from .clock import TICK_RATE
+from .scenes import SceneStack
+
+# Abstract input actions; the front-end maps each one to a key
+ACTIONS = (
+    "up",  # Arrow up
+    "down",  # Arrow down
+    "left",  # Arrow left
+    "right",  # Arrow right
+    "toggle",  # Space
+    "confirm",  # Enter
+    "back",  # Escape
+    "menu",  # Q: quest panel, quit to menu, leave battle
+    "weather",  # W
+    "attack",  # A
+    "spell",  # S
+)
+
+
+class GameEngine:
+    """Game rules and state, advanced one tick at a time without rendering"""
+
+    def __init__(self, background_generation=False, chunked_world=False):
+        # Logical screen size, used to place effects in screen space
+        self.WINDOW_WIDTH = 256
+        self.WINDOW_HEIGHT = 256
+
+        # Game state
+        self.running = True
+        self.scenes = SceneStack(self)
+        self.state = "feature_select"  # 'feature_select', 'playing', 'paused', 'gameover', 'boss_battle'
+        self.frame = 0
+
+        # Enhanced features
+        self.features = {
+            "random_events": False,
+            "difficulty_levels": False,
+            "enemy_encounters": False,
+            "procedural_dungeons": False,
+            "dynamic_quests": False,
+            "weather_system": False,
+            "particle_effects": False,
+        }
+        self.selected_feature = 0
+        self.feature_names = [
+            ("Random Events", "random_events"),
+            ("Difficulty Levels", "difficulty_levels"),
+            ("Enemy Encounters", "enemy_encounters"),
+            ("Procedural Dungeons", "procedural_dungeons"),
+            ("Dynamic Quests", "dynamic_quests"),
+            ("Weather System", "weather_system"),
+            ("Particle Effects", "particle_effects"),
+        ]
+
+        # Game objects
+        self.player = None
+        self.map = None
+        self.enemies = []
+        self.event_message = None
+        self.event_timer = 0
+        self.combat = None  # BossCombat while in a boss battle
+        # Play on an endless map streamed in chunks instead of a fixed one
+        self.chunked_world = chunked_world
+
+        # Enhanced systems
+        self.events = EventBus()
+        self.play_ticks = 0  # Ticks spent playing, for time_elapsed events
+        self.quest_generator = QuestGenerator()
+        self.quests = QuestManager(self.events, self.complete_quest)
+        self.particle_system = ParticleSystem()
+        self.dungeon_generator = ProceduralDungeonGenerator()
+        # Levels are queued ahead of time, in a worker process if requested
+        self.generation = GenerationService(background=background_generation)
+        self.generation.prefetch(("map", MAP_SIZE))
+        self.profiler = FrameProfiler()
+
+        # UI state
+        self.show_quest_ui = False
+        self.show_weather_ui = False
+
+        # Per-tick systems for the chosen features, compiled by start_game
+        self.update_systems = []
+
+    @property
+    def state(self):
+        """Name of the scene on top of the scene stack"""
+        return self.scenes.top.name
+
+    @state.setter
+    def state(self, name):
+        self.scenes.go(name)
+
+    def step(self, actions=()):
+        """Advance the game by one tick with the given input actions"""
+        self.frame += 1
+        self.profiler.run(self.update_systems)
+        with self.profiler.section("state_update"):
+            self.scenes.top.update(actions)
+
+    def build_pipelines(self):
+        """Compile the per-tick systems for the chosen feature set
+
+        Disabled features are left out of the list entirely, so they cost
+        nothing per tick. Rebuilt whenever a game starts.
+        """
+        systems = []
+        if self.features["particle_effects"]:
+            systems.append(("particles_update", self.particle_system.update))
+        if self.features["weather_system"] and hasattr(self.map, "update"):
+            systems.append(("weather_update", self.map.update))
+        self.update_systems = systems
+
+    def update_feature_select(self, actions):
+        """Handle feature selection state"""
+        if "up" in actions:
+            self.selected_feature = (self.selected_feature - 1) % len(
+                self.feature_names
+            )
+        elif "down" in actions:
+            self.selected_feature = (self.selected_feature + 1) % len(
+                self.feature_names
+            )
+        elif "toggle" in actions:
+            # Toggle selected feature
+            feature_name = self.feature_names[self.selected_feature][1]
+            self.features[feature_name] = not self.features[feature_name]
+        elif "confirm" in actions:
+            # Start game
+            self.start_game()
+            self.state = "playing"
+        elif "back" in actions:
+            self.running = False
+
+    def start_game(self):
+        """Initialize game objects with enhanced features"""
+        difficulty = "Easy"  # Default difficulty
+        if self.features["difficulty_levels"]:
+            difficulty = "Hard"
+
+        self.player = Player(difficulty)
+
+        if self.chunked_world:
+            # An endless world has no entire map to reveal, so no Explorer
+            self.map = ChunkedMapPyxel(seed=random.getrandbits(32))
+            self.player.x, self.player.y = self.map.find_spawn()
+            self.map.follow(self.player.x, self.player.y)
+            self.player.explored = None
+        else:
+            # Take an enhanced or regular map from the pre-generated queue
+            map_class = (
+                EnhancedMapPyxel if self.features["weather_system"] else MapPyxel
+            )
+            self.map = self.generation.take_map(MAP_SIZE, map_class)
+            self.player.explored = ExplorationMap.for_map(self.map)
+            self.player.explored.reveal(self.player.x, self.player.y)
+
+        self.enemies = []
+        self.event_message = None
+        self.play_ticks = 0
+
+        # Generate the initial quests if enabled
+        self.quests.clear()
+        if self.features["dynamic_quests"]:
+            for _ in range(ACTIVE_QUESTS):
+                self.add_quest()
+
+        self.build_pipelines()
+
+    def update_playing(self, actions):
+        """Handle playing state with enhanced features"""
+        if "back" in actions:
+            self.state = "paused"
+            return
+
+        # Toggle quest UI
+        if "menu" in actions:
+            self.show_quest_ui = not self.show_quest_ui
+
+        # Toggle weather UI
+        if "weather" in actions:
+            self.show_weather_ui = not self.show_weather_ui
+
+        # Handle movement
+        dx, dy = 0, 0
+        if "up" in actions:
+            dy = -1
+        elif "down" in actions:
+            dy = 1
+        elif "left" in actions:
+            dx = -1
+        elif "right" in actions:
+            dx = 1
+
+        if dx != 0 or dy != 0:
+            self.move_player(dx, dy)
+
+        # A second of play time passes every TICK_RATE ticks
+        self.play_ticks += 1
+        if self.play_ticks % TICK_RATE == 0:
+            self.events.emit("time_elapsed", seconds=1)
+
+        # Clear event message after some time
+        if self.event_message and self.event_timer > 0:
+            self.event_timer -= 1
+            if self.event_timer <= 0:
+                self.event_message = None
+
+    def move_player(self, dx, dy):
+        """Move player and handle enhanced events"""
+        new_x = self.player.x + dx
+        new_y = self.player.y + dy
+
+        if self.map.is_walkable(new_x, new_y):
+            self.player.move(dx, dy, wrap=not self.chunked_world)
+            if self.chunked_world:
+                self.map.follow(self.player.x, self.player.y)
+
+            # Create movement particles if enabled
+            if self.features["particle_effects"]:
+                player_x, player_y = self.player_screen_pos()
+                self.particle_system.add_particle(player_x, player_y, 0, -1, 7, 10)
+
+            # Location quests listen for the tiles they care about
+            self.events.emit("tile_entered", x=self.player.x, y=self.player.y)
+
+            # Trigger random event if enabled
+            if self.features["random_events"] and random.random() < 0.2:
+                event = random.choice(EVENT_TYPES)
+                self.event_message = event["desc"]
+                self.event_timer = 180  # 3 seconds at 60 FPS
+                gold = self.player.gold
+                if event["effect"]:
+                    event["effect"](self.player)
+                if self.player.health <= 0:
+                    self.state = "gameover"
+                elif self.player.gold != gold:
+                    self.events.emit(
+                        "gold_changed",
+                        gold=self.player.gold,
+                        delta=self.player.gold - gold,
+                    )
+
+            # Trigger enemy encounter if enabled
+            elif self.features["enemy_encounters"] and random.random() < 0.2:
+                enemy = Enemy(strength=random.randint(1, 3))
+                # Slimes lose a point of strength and can reach zero
+                dmg = random.randint(1, max(1, enemy.strength))
+                # The difficulty scales enemy damage, never below 1
+                level = DIFFICULTY_LEVELS[self.player.difficulty]
+                dmg = max(1, round(dmg * level["enemy_damage_scale"]))
+                self.player.take_damage(dmg)
+
+                # Create combat particles
+                if self.features["particle_effects"]:
+                    player_x, player_y = self.player_screen_pos()
+                    self.particle_system.create_spell_effect(
+                        player_x, player_y, "fireball"
+                    )
+
+                self.event_message = (
+                    f"Enemy Encounter! Took {dmg} damage from a {enemy.name}."
+                )
+                self.event_timer = 180
+                if self.player.health <= 0:
+                    self.state = "gameover"
+                else:
+                    self.strike_back(enemy)
+
+            self.update_exploration()
+
+    def player_screen_pos(self):
+        """Screen pixel of the player's tile, relative to the map view"""
+        origin_x, origin_y = self.map.view_origin()
+        return (
+            (self.player.x - origin_x) * (self.WINDOW_WIDTH // MAP_SIZE),
+            (self.player.y - origin_y) * (self.WINDOW_HEIGHT // MAP_SIZE)
+            + MAP_OFFSET_Y,
+        )
+
+    def strike_back(self, enemy):
+        """The player's answer to an encounter; only a kill defeats the enemy"""
+        enemy.health -= random.randint(2, 4) + self.player.sword_level
+        if enemy.is_alive():
+            self.event_message += " It got away."
+            return
+        self.event_message += " You defeated it!"
+        self.events.emit("enemy_defeated", name=enemy.name)
+
+    def update_exploration(self):
+        """Reveal the tiles around the player and check the Explorer achievement"""
+        explored = self.player.explored
+        if explored is None:
+            return
+        if explored.reveal(self.player.x, self.player.y) and explored.complete:
+            if "Explorer" not in self.player.achievements:
+                self.player.achievements.add("Explorer")
+                self.event_message = "Achievement unlocked: Explorer!"
+                self.event_timer = 180
+
+    def add_quest(self):
+        """Generate a quest for the current map and start tracking it"""
+        start = (self.player.x, self.player.y)
+        # Reach targets are picked on a fixed map; the endless world has none
+        map_obj = None if self.chunked_world else self.map
+        return self.quests.add(self.quest_generator.create_quest(map_obj, start))
+
+    def complete_quest(self, quest):
+        """Reward a completed quest and replace it with a new one"""
+        self.player.gold += quest.reward
+        self.event_message = f"Quest completed! Received {quest.reward} gold."
+        self.event_timer = 180
+        self.events.emit(
+            "gold_changed", gold=self.player.gold, delta=quest.reward, reward=True
+        )
+
+        # Generate new quest
+        self.add_quest()
+
+    def update_paused(self, actions):
+        """Handle paused state"""
+        if "back" in actions:
+            self.state = "playing"
+        elif "menu" in actions:
+            self.state = "feature_select"
+
+    def update_gameover(self, actions):
+        """Handle game over state"""
+        if "toggle" in actions:
+            self.state = "feature_select"
+        elif "back" in actions:
+            self.running = False
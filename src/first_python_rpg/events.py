@@ -0,0 +1,40 @@
+"""
+Game event bus
+Systems announce what happened (an enemy was defeated, gold changed, the
+player entered a tile, time passed) and listeners subscribe only to the
+events they care about.
+"""
+
+EVENTS = (
+    "enemy_defeated",  # name: the enemy or boss name
+    "gold_changed",  # gold: new total, delta: change, reward: from a quest
+    "tile_entered",  # x, y: the tile the player moved onto
+    "time_elapsed",  # seconds: play time that passed
+)
+
+
+class EventBus:
+    """Named game events dispatched to their subscribers"""
+
+    def __init__(self):
+        self.handlers = {event: [] for event in EVENTS}
+
+    def subscribe(self, event, handler):
+        """Call `handler(**data)` whenever `event` is emitted"""
+        if event not in self.handlers:
+            raise ValueError(f"Unknown event: {event}")
+        self.handlers[event].append(handler)
+        return handler
+
+    def unsubscribe(self, event, handler):
+        """Stop calling a handler; unknown handlers are ignored"""
+        handlers = self.handlers.get(event, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def emit(self, event, **data):
+        """Dispatch an event; handlers may unsubscribe while it runs"""
+        handlers = self.handlers[event]
+        if handlers:
+            for handler in tuple(handlers):
+                handler(**data)
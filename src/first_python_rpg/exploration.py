@@ -0,0 +1,80 @@
+"""
+Exploration tracking
+Revealed tiles live in a bool array with a running count of the revealed
+tiles that matter for the Explorer achievement, so each move updates only
+the tiles around the player and completion is a single comparison.
+"""
+
+import numpy as np
+
+REVEAL_RADIUS = 1  # Tiles revealed around the player in every direction
+
+
+def revealable_mask(reachable, radius=REVEAL_RADIUS):
+    """Tiles that come into view from some reachable tile (square radius)"""
+    mask = reachable.copy()
+    for _ in range(radius):
+        grown = mask.copy()
+        grown[1:, :] |= mask[:-1, :]
+        grown[:-1, :] |= mask[1:, :]
+        grown[:, 1:] |= grown[:, :-1].copy()
+        grown[:, :-1] |= grown[:, 1:].copy()
+        mask = grown
+    return mask
+
+
+class ExplorationMap:
+    """Revealed tiles of a map and progress toward revealing all of it"""
+
+    def __init__(self, width, height, goal=None):
+        self.revealed = np.zeros((height, width), dtype=bool)
+        # Tiles that count toward "Reveal the entire map"
+        self.goal = np.ones((height, width), dtype=bool) if goal is None else goal
+        self.goal_total = int(self.goal.sum())
+        self.goal_revealed = 0
+        self.revealed_count = 0
+
+    @classmethod
+    def for_map(cls, map_obj, radius=REVEAL_RADIUS):
+        """Track a map, only asking for the tiles reachable from its spawn"""
+        labels, _ = map_obj.components()
+        x, y = map_obj.spawn
+        if labels[y, x]:
+            goal = revealable_mask(labels == labels[y, x], radius)
+        else:
+            goal = None
+        return cls(map_obj.size, map_obj.size, goal)
+
+    def __len__(self):
+        return self.revealed_count
+
+    def __contains__(self, position):
+        x, y = position
+        height, width = self.revealed.shape
+        return 0 <= x < width and 0 <= y < height and bool(self.revealed[y, x])
+
+    def reveal(self, x, y, radius=REVEAL_RADIUS):
+        """Reveal the square around (x, y); returns the number of new tiles"""
+        height, width = self.revealed.shape
+        x0, x1 = max(0, x - radius), min(width, x + radius + 1)
+        y0, y1 = max(0, y - radius), min(height, y + radius + 1)
+        if x0 >= x1 or y0 >= y1:
+            return 0
+        window = self.revealed[y0:y1, x0:x1]
+        new_tiles = ~window
+        added = int(new_tiles.sum())
+        if added:
+            self.goal_revealed += int((new_tiles & self.goal[y0:y1, x0:x1]).sum())
+            self.revealed_count += added
+            window[:] = True
+        return added
+
+    @property
+    def progress(self):
+        """Fraction of the goal tiles revealed so far"""
+        return self.goal_revealed / self.goal_total if self.goal_total else 1.0
+
+    @property
+    def complete(self):
+        """Whether every goal tile has been revealed"""
+        return self.goal_revealed == self.goal_total
@@ -1,6 +1,10 @@
 import pyxel
 import random
+import numpy as np
 from .map_data import MAP_SIZE
+from .sprites import ATLAS
+from .connectivity import label_components, reachable_fraction, repair_mask
+from .pathfinding import Pathfinder
 
 # Pyxel color palette mapping for terrain
 TILE_COLORS = {
@@ -13,66 +17,212 @@ TILE_COLORS = {
     "R": 6,  # rock (light gray)
 }
 
+# Tile alphabet: a tile's integer code is its index in this string
+TILE_CHARS = ".~#^oTR"
+TILE_CODES = {tile: code for code, tile in enumerate(TILE_CHARS)}
+TILE_WEIGHTS = [30, 10, 10, 20, 10, 10, 10]
+BLOCKING_TILES = ("o", "#", "T", "R")
+
+# Lookup tables indexed by tile code
+WALKABLE = np.array([tile not in BLOCKING_TILES for tile in TILE_CHARS], dtype=bool)
+TILE_COLOR_TABLE = np.array([TILE_COLORS[tile] for tile in TILE_CHARS], dtype=np.uint8)
+_TILE_CHAR_TABLE = np.array(list(TILE_CHARS))
+
+MAP_OFFSET_Y = 20  # The map is drawn below the HUD bar
+
+
+def tile_chars(tiles):
+    """Character array for an array of tile codes"""
+    return _TILE_CHAR_TABLE[tiles]
+
+
+def generate_tiles(rng, shape):
+    """Draw a block of tile codes with the terrain weights in one call"""
+    weights = np.array(TILE_WEIGHTS, dtype=float)
+    codes = rng.choice(len(TILE_CHARS), size=shape, p=weights / weights.sum())
+    return codes.astype(np.uint8)
+
 
 class MapPyxel:
-    def __init__(self):
-        self.size = MAP_SIZE
-        self.grid = self.generate_map()
-        self.tile_size = 256 // MAP_SIZE  # Calculate tile size based on screen size
+    detail_tiles = ("T", "R", "o", "#")  # Tiles drawn with a sprite on top
+    spawn_coverage = 0.5  # Share of walkable tiles reachable from the spawn
+    generation_attempts = 3  # Fresh maps tried before repairing the last
+    terrain = "noise"  # "noise" (independent tiles) or "wfc" (coherent biomes)
+
+    def __init__(self, size=MAP_SIZE, seed=None, spawn=None, tiles=None, terrain=None):
+        if tiles is not None:
+            size = tiles.shape[0]  # Pre-built tiles, e.g. from a dungeon
+        if terrain is not None:
+            self.terrain = terrain
+        self.size = size
+        self.spawn = (size // 2, size // 2) if spawn is None else spawn
+        # Draw the seed from `random` so seeding it also fixes the terrain
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.tiles = self.generate_map() if tiles is None else tiles
+        self.walkable = WALKABLE[self.tiles]
+        self.tile_size = max(1, 256 // size)  # Tile size based on screen size
+        self.layer = None  # Pre-rendered terrain image, built on first draw
+        self.dirty_tiles = set()
+        self.walkable_version = 0  # Bumped whenever walkability changes
+        self.components_cache = None  # (walkable_version, labels, sizes)
+        self.pathfinder = None  # Shared by every path query, built on first use
 
     def generate_map(self):
-        """Generate a simple procedural map"""
-        grid = []
-        tile_types = [".", "~", "#", "^", "o", "T", "R"]
-        weights = [30, 10, 10, 20, 10, 10, 10]
-
-        for y in range(self.size):
-            row = []
-            for x in range(self.size):
-                # Border is always rock
-                if x == 0 or y == 0 or x == self.size - 1 or y == self.size - 1:
-                    tile = "R"
-                else:
-                    tile = random.choices(tile_types, weights=weights, k=1)[0]
-                row.append(tile)
-            grid.append(row)
-        return grid
+        """Generate a procedural map as a grid of uint8 tile codes
+
+        Maps where the spawn reaches less than `spawn_coverage` of the open
+        ground are rejected; after `generation_attempts` the last one is
+        repaired by opening dirt paths instead.
+        """
+        from .wfc import generate_wfc_tiles  # Imported here: wfc imports this module
+
+        rng = np.random.default_rng(self.seed)
+        shape = (self.size, self.size)
+        for _ in range(self.generation_attempts):
+            if self.terrain == "wfc":
+                tiles = generate_wfc_tiles(rng, shape, spawn=self.spawn)
+            elif self.terrain == "noise":
+                tiles = generate_tiles(rng, shape)
+            else:
+                raise ValueError(f"Unknown terrain mode: {self.terrain}")
+
+            # Border is always rock
+            rock = TILE_CODES["R"]
+            tiles[0, :] = rock
+            tiles[-1, :] = rock
+            tiles[:, 0] = rock
+            tiles[:, -1] = rock
+
+            walkable = WALKABLE[tiles]
+            if reachable_fraction(walkable, self.spawn) >= self.spawn_coverage:
+                return tiles
+
+        tiles[repair_mask(walkable, self.spawn, self.spawn_coverage)] = TILE_CODES["."]
+        return tiles
+
+    @property
+    def grid(self):
+        """Character view of the tiles (builds a new array, prefer `tiles`)"""
+        return tile_chars(self.tiles)
+
+    def tile_at(self, x, y):
+        """Get the tile character at a position"""
+        return TILE_CHARS[self.tiles[y, x]]
+
+    def set_tile(self, x, y, tile):
+        """Change a tile and keep the walkability mask in sync"""
+        code = TILE_CODES[tile]
+        self.tiles[y, x] = code
+        if self.walkable[y, x] != WALKABLE[code]:
+            self.walkable[y, x] = WALKABLE[code]
+            self.walkable_version += 1
+        self.dirty_tiles.add((x, y))
 
     def is_walkable(self, x, y):
         """Check if a position is walkable"""
         if 0 <= x < self.size and 0 <= y < self.size:
-            return self.grid[y][x] not in ("o", "#", "T", "R")
+            return bool(self.walkable[y, x])
         return False
 
+    def components(self):
+        """Connected walkable regions as (labels, sizes), cached until edits"""
+        cache = self.components_cache
+        if cache is None or cache[0] != self.walkable_version:
+            labels, sizes = label_components(self.walkable)
+            cache = self.components_cache = (self.walkable_version, labels, sizes)
+        return cache[1], cache[2]
+
+    def component_sizes(self):
+        """Tile count of every connected walkable region, largest first"""
+        _, sizes = self.components()
+        return np.sort(sizes[1:])[::-1]
+
+    def get_pathfinder(self):
+        """The map's Pathfinder, so its distance fields are cached per map"""
+        if self.pathfinder is None:
+            self.pathfinder = Pathfinder(self)
+        return self.pathfinder
+
+    def is_reachable(self, start, goal):
+        """Whether a walking path exists between two tiles"""
+        labels, _ = self.components()
+        (x1, y1), (x2, y2) = start, goal
+        if not (self.is_walkable(x1, y1) and self.is_walkable(x2, y2)):
+            return False
+        return labels[y1, x1] == labels[y2, x2]
+
+    def reachable_fraction(self):
+        """Share of walkable tiles reachable from the spawn"""
+        labels, sizes = self.components()
+        return reachable_fraction(self.walkable, self.spawn, labels, sizes)
+
+    def tile_color(self, tile):
+        """Base color of a single tile"""
+        return TILE_COLORS.get(tile, 0)
+
+    def layer_colors(self):
+        """Base color of every tile, as an array shaped like `tiles`"""
+        return TILE_COLOR_TABLE[self.tiles]
+
+    def draw_tile_detail(self, target, px, py, tile):
+        """Draw the procedural sprite on top of a tile's base color"""
+        if tile == "T":  # Tree
+            ATLAS.draw_sprite("tree", px, py, self.tile_size, 11, target)
+        elif tile == "R":  # Rock
+            ATLAS.draw_sprite("rock", px, py, self.tile_size, 13, target)
+        elif tile == "o":  # Water (keep simple for now)
+            center_x = px + self.tile_size // 2
+            center_y = py + self.tile_size // 2
+            target.pset(center_x, center_y, 12)  # Blue pixel
+        elif tile == "#":  # Stone (keep simple for now)
+            center_x = px + self.tile_size // 2
+            center_y = py + self.tile_size // 2
+            target.pset(center_x, center_y, 5)  # Dark gray pixel
+
+    def render_layer(self):
+        """Pre-render the whole terrain into an off-screen image"""
+        ts = self.tile_size
+        self.layer = pyxel.Image(self.size * ts, self.size * ts)
+
+        # Fill every tile's base color in one vectorized write
+        pixels = np.frombuffer(self.layer.data_ptr(), dtype=np.uint8)
+        colors = self.layer_colors().repeat(ts, axis=0).repeat(ts, axis=1)
+        pixels[:] = colors.ravel()
+
+        # Only tiles with a sprite need individual draw calls
+        detail_codes = [TILE_CODES[tile] for tile in self.detail_tiles]
+        ys, xs = np.nonzero(np.isin(self.tiles, detail_codes))
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            self.draw_tile_detail(self.layer, x * ts, y * ts, self.tile_at(x, y))
+        self.dirty_tiles.clear()
+
+    def render_dirty_tiles(self):
+        """Re-render only the tiles that changed since the last draw"""
+        ts = self.tile_size
+        for x, y in self.dirty_tiles:
+            tile = self.tile_at(x, y)
+            px, py = x * ts, y * ts
+            self.layer.rect(px, py, ts, ts, self.tile_color(tile))
+            self.draw_tile_detail(self.layer, px, py, tile)
+        self.dirty_tiles.clear()
+
+    def refresh_layer(self):
+        """Build the cached terrain layer or re-render its dirty tiles"""
+        if self.layer is None:
+            self.render_layer()
+        elif self.dirty_tiles:
+            self.render_dirty_tiles()
+
+    def view_origin(self):
+        """Map coordinates of the top-left tile on screen; the whole map fits"""
+        return 0, 0
+
     def draw(self):
-        """Draw the map using Pyxel with procedural sprites"""
-        from .map_data import SPRITES
-
-        for y in range(self.size):
-            for x in range(self.size):
-                tile = self.grid[y][x]
-                color = TILE_COLORS.get(tile, 0)
-
-                # Calculate pixel position
-                px = x * self.tile_size
-                py = y * self.tile_size + 20  # Offset for HUD
-
-                # Draw base tile
-                pyxel.rect(px, py, self.tile_size, self.tile_size, color)
-
-                # Draw procedural sprites for special tiles
-                if tile == "T":  # Tree
-                    SPRITES["tree"](px, py, self.tile_size, 11)
-                elif tile == "R":  # Rock
-                    SPRITES["rock"](px, py, self.tile_size, 13)
-                elif tile == "o":  # Water (keep simple for now)
-                    center_x = px + self.tile_size // 2
-                    center_y = py + self.tile_size // 2
-                    pyxel.pset(center_x, center_y, 12)  # Blue pixel
-                elif tile == "#":  # Stone (keep simple for now)
-                    center_x = px + self.tile_size // 2
-                    center_y = py + self.tile_size // 2
-                    pyxel.pset(center_x, center_y, 5)  # Dark gray pixel
+        """Draw the map by blitting the cached terrain layer"""
+        self.refresh_layer()
+        pyxel.blt(
+            0, MAP_OFFSET_Y, self.layer, 0, 0, self.layer.width, self.layer.height
+        )
 
     def move_player(self, player, dx, dy):
         """Move player with map constraints"""
@@ -1,5 +1,11 @@
+import random
+
 MAP_SIZE = 11
 
+# Visual-only randomness has its own generator, so drawing never advances
+# the gameplay `random` stream that seeded replays depend on
+FX_RANDOM = random.Random()
+
 ENEMY_TYPES = [
     {"name": "Goblin", "hp_mod": 0, "dmg_mod": 0, "effect": None},
     {"name": "Orc", "hp_mod": 2, "dmg_mod": 1, "effect": "rage"},
@@ -43,144 +49,164 @@ DIRECTIONS = {
 
 
 # Procedural sprite drawing functions for pyxel
-def draw_player_sprite(x, y, size=8, color=8):
+# Pass a pyxel.Image as `target` to draw off-screen instead of on the screen
+def draw_player_sprite(x, y, size=8, color=8, target=None):
     """Draw player sprite as a colored rectangle with details"""
     try:
         import pyxel
 
+        gfx = pyxel if target is None else target
+
         # Main body (rectangle)
-        pyxel.rect(x, y, size, size, color)
+        gfx.rect(x, y, size, size, color)
         # Eyes (small pixels)
-        pyxel.pset(x + 2, y + 2, 7)  # Left eye (white)
-        pyxel.pset(x + 5, y + 2, 7)  # Right eye (white)
+        gfx.pset(x + 2, y + 2, 7)  # Left eye (white)
+        gfx.pset(x + 5, y + 2, 7)  # Right eye (white)
         # Mouth (small line)
-        pyxel.line(x + 2, y + 5, x + 5, y + 5, 7)
+        gfx.line(x + 2, y + 5, x + 5, y + 5, 7)
     except:
         # Handle case where pyxel is not initialized (for testing)
         pass
 
 
-def draw_enemy_sprite(x, y, size=8, color=8):
+def draw_enemy_sprite(x, y, size=8, color=8, target=None):
     """Draw enemy sprite as a triangle with menacing features"""
     try:
         import pyxel
 
+        gfx = pyxel if target is None else target
+
         # Enemy body (triangle shape using lines)
-        pyxel.tri(x + size // 2, y, x, y + size, x + size, y + size, color)
+        gfx.tri(x + size // 2, y, x, y + size, x + size, y + size, color)
         # Eyes (red pixels)
-        pyxel.pset(x + 2, y + 3, 8)  # Left eye (red)
-        pyxel.pset(x + 5, y + 3, 8)  # Right eye (red)
+        gfx.pset(x + 2, y + 3, 8)  # Left eye (red)
+        gfx.pset(x + 5, y + 3, 8)  # Right eye (red)
     except:
         pass
 
 
-def draw_tree_sprite(x, y, size=8, color=11):
+def draw_tree_sprite(x, y, size=8, color=11, target=None):
     """Draw tree sprite with trunk and foliage"""
     try:
         import pyxel
 
+        gfx = pyxel if target is None else target
+
         # Trunk (brown rectangle)
-        pyxel.rect(x + 3, y + 4, 2, 4, 4)  # Brown trunk
+        gfx.rect(x + 3, y + 4, 2, 4, 4)  # Brown trunk
         # Foliage (green circle approximation)
-        pyxel.circ(x + 4, y + 3, 3, color)  # Green foliage
+        gfx.circ(x + 4, y + 3, 3, color)  # Green foliage
     except:
         pass
 
 
-def draw_rock_sprite(x, y, size=8, color=13):
+def draw_rock_sprite(x, y, size=8, color=13, target=None):
     """Draw rock sprite as an irregular shape"""
     try:
         import pyxel
 
+        gfx = pyxel if target is None else target
+
         # Rock body (gray rectangle with irregular edges)
-        pyxel.rect(x + 1, y + 2, 6, 5, color)
+        gfx.rect(x + 1, y + 2, 6, 5, color)
         # Add some irregular pixels
-        pyxel.pset(x, y + 3, color)
-        pyxel.pset(x + 7, y + 4, color)
-        pyxel.pset(x + 2, y + 1, color)
+        gfx.pset(x, y + 3, color)
+        gfx.pset(x + 7, y + 4, color)
+        gfx.pset(x + 2, y + 1, color)
     except:
         pass
 
 
-def draw_potion_sprite(x, y, size=8, color=14):
+def draw_potion_sprite(x, y, size=8, color=14, target=None):
     """Draw potion sprite as a bottle shape"""
     try:
         import pyxel
 
+        gfx = pyxel if target is None else target
+
         # Bottle body (purple rectangle)
-        pyxel.rect(x + 2, y + 3, 4, 4, color)
+        gfx.rect(x + 2, y + 3, 4, 4, color)
         # Bottle neck (smaller rectangle)
-        pyxel.rect(x + 3, y + 1, 2, 2, color)
+        gfx.rect(x + 3, y + 1, 2, 2, color)
         # Cork (small pixel)
-        pyxel.pset(x + 3, y, 4)  # Brown cork
+        gfx.pset(x + 3, y, 4)  # Brown cork
     except:
         pass
 
 
-def draw_treasure_sprite(x, y, size=8, color=10):
+def draw_treasure_sprite(x, y, size=8, color=10, target=None):
     """Draw treasure sprite as a golden chest"""
     try:
         import pyxel
 
+        gfx = pyxel if target is None else target
+
         # Chest body (yellow rectangle)
-        pyxel.rect(x + 1, y + 3, 6, 4, color)
+        gfx.rect(x + 1, y + 3, 6, 4, color)
         # Chest lid (slightly offset)
-        pyxel.rect(x + 1, y + 2, 6, 2, color)
+        gfx.rect(x + 1, y + 2, 6, 2, color)
         # Lock (small dark pixel)
-        pyxel.pset(x + 4, y + 4, 0)
+        gfx.pset(x + 4, y + 4, 0)
     except:
         pass
 
 
-def draw_trap_sprite(x, y, size=8, color=8):
+def draw_trap_sprite(x, y, size=8, color=8, target=None):
     """Draw trap sprite as spikes"""
     try:
         import pyxel
 
+        gfx = pyxel if target is None else target
+
         # Spikes (red triangular shapes)
-        pyxel.tri(x + 2, y + 6, x + 1, y + 2, x + 3, y + 2, color)
-        pyxel.tri(x + 5, y + 6, x + 4, y + 2, x + 6, y + 2, color)
+        gfx.tri(x + 2, y + 6, x + 1, y + 2, x + 3, y + 2, color)
+        gfx.tri(x + 5, y + 6, x + 4, y + 2, x + 6, y + 2, color)
     except:
         pass
 
 
-def draw_merchant_sprite(x, y, size=8, color=9):
+def draw_merchant_sprite(x, y, size=8, color=9, target=None):
     """Draw merchant sprite as a robed figure"""
     try:
         import pyxel
 
+        gfx = pyxel if target is None else target
+
         # Robe (orange rectangle)
-        pyxel.rect(x + 1, y + 2, 6, 5, color)
+        gfx.rect(x + 1, y + 2, 6, 5, color)
         # Head (small circle)
-        pyxel.circ(x + 4, y + 1, 2, 12)  # Light skin tone
+        gfx.circ(x + 4, y + 1, 2, 12)  # Light skin tone
         # Hat (small rectangle)
-        pyxel.rect(x + 2, y, 4, 2, 4)  # Brown hat
+        gfx.rect(x + 2, y, 4, 2, 4)  # Brown hat
     except:
         pass
 
 
-def draw_fog_sprite(x, y, size=8, color=6):
+def draw_fog_sprite(x, y, size=8, color=6, target=None):
     """Draw fog sprite as scattered pixels"""
     try:
         import pyxel
-        import random
+
+        gfx = pyxel if target is None else target
 
         # Fog (random gray pixels)
         for i in range(3):
-            fx = x + random.randint(0, size - 1)
-            fy = y + random.randint(0, size - 1)
-            pyxel.pset(fx, fy, color)
+            fx = x + FX_RANDOM.randint(0, size - 1)
+            fy = y + FX_RANDOM.randint(0, size - 1)
+            gfx.pset(fx, fy, color)
     except:
         pass
 
 
-def draw_empty_sprite(x, y, size=8, color=4):
+def draw_empty_sprite(x, y, size=8, color=4, target=None):
     """Draw empty ground sprite"""
     try:
         import pyxel
 
+        gfx = pyxel if target is None else target
+
         # Just the ground color (filled rectangle)
-        pyxel.rect(x, y, size, size, color)
+        gfx.rect(x, y, size, size, color)
     except:
         pass
 
@@ -249,47 +275,49 @@ SHOP_ITEMS = [
 
 
 # Procedural boss sprite drawing functions
-def draw_boss_sprite(x, y, boss_type=0, size=32):
+def draw_boss_sprite(x, y, boss_type=0, size=32, target=None):
     """Draw boss sprite based on type"""
     try:
         import pyxel
 
+        gfx = pyxel if target is None else target
+
         if boss_type == 0:  # Dread Hydra
             # Three heads (large circles)
-            pyxel.circ(x + 8, y + 8, 6, 8)  # Left head (red)
-            pyxel.circ(x + 16, y + 4, 6, 8)  # Center head (red)
-            pyxel.circ(x + 24, y + 8, 6, 8)  # Right head (red)
+            gfx.circ(x + 8, y + 8, 6, 8)  # Left head (red)
+            gfx.circ(x + 16, y + 4, 6, 8)  # Center head (red)
+            gfx.circ(x + 24, y + 8, 6, 8)  # Right head (red)
             # Eyes on each head
-            pyxel.pset(x + 6, y + 6, 7)  # Left head left eye
-            pyxel.pset(x + 10, y + 6, 7)  # Left head right eye
-            pyxel.pset(x + 14, y + 2, 7)  # Center head left eye
-            pyxel.pset(x + 18, y + 2, 7)  # Center head right eye
-            pyxel.pset(x + 22, y + 6, 7)  # Right head left eye
-            pyxel.pset(x + 26, y + 6, 7)  # Right head right eye
+            gfx.pset(x + 6, y + 6, 7)  # Left head left eye
+            gfx.pset(x + 10, y + 6, 7)  # Left head right eye
+            gfx.pset(x + 14, y + 2, 7)  # Center head left eye
+            gfx.pset(x + 18, y + 2, 7)  # Center head right eye
+            gfx.pset(x + 22, y + 6, 7)  # Right head left eye
+            gfx.pset(x + 26, y + 6, 7)  # Right head right eye
             # Body (large rectangle)
-            pyxel.rect(x + 8, y + 16, 16, 12, 5)  # Dark gray body
+            gfx.rect(x + 8, y + 16, 16, 12, 5)  # Dark gray body
 
         elif boss_type == 1:  # Shadow Golem
             # Large rectangular body
-            pyxel.rect(x + 4, y + 8, 24, 20, 5)  # Dark gray body
+            gfx.rect(x + 4, y + 8, 24, 20, 5)  # Dark gray body
             # Arms (rectangles)
-            pyxel.rect(x, y + 12, 8, 8, 5)  # Left arm
-            pyxel.rect(x + 24, y + 12, 8, 8, 5)  # Right arm
+            gfx.rect(x, y + 12, 8, 8, 5)  # Left arm
+            gfx.rect(x + 24, y + 12, 8, 8, 5)  # Right arm
             # Eyes (glowing red)
-            pyxel.pset(x + 10, y + 12, 8)  # Left eye
-            pyxel.pset(x + 22, y + 12, 8)  # Right eye
+            gfx.pset(x + 10, y + 12, 8)  # Left eye
+            gfx.pset(x + 22, y + 12, 8)  # Right eye
 
         elif boss_type == 2:  # Chaos Drake
             # Dragon head (large triangle)
-            pyxel.tri(x + 16, y, x + 4, y + 16, x + 28, y + 16, 8)  # Red triangle
+            gfx.tri(x + 16, y, x + 4, y + 16, x + 28, y + 16, 8)  # Red triangle
             # Body (oval approximation)
-            pyxel.rect(x + 8, y + 16, 16, 8, 8)  # Red body
+            gfx.rect(x + 8, y + 16, 16, 8, 8)  # Red body
             # Wings (triangular shapes)
-            pyxel.tri(x + 2, y + 12, x + 8, y + 20, x + 12, y + 16, 5)  # Left wing
-            pyxel.tri(x + 20, y + 16, x + 24, y + 20, x + 30, y + 12, 5)  # Right wing
+            gfx.tri(x + 2, y + 12, x + 8, y + 20, x + 12, y + 16, 5)  # Left wing
+            gfx.tri(x + 20, y + 16, x + 24, y + 20, x + 30, y + 12, 5)  # Right wing
             # Eyes (yellow)
-            pyxel.pset(x + 12, y + 8, 10)  # Left eye
-            pyxel.pset(x + 20, y + 8, 10)  # Right eye
+            gfx.pset(x + 12, y + 8, 10)  # Left eye
+            gfx.pset(x + 20, y + 8, 10)  # Right eye
     except:
         # Handle case where pyxel is not initialized (for testing)
         pass
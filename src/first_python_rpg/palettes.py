@@ -0,0 +1,73 @@
+"""
+Weather and time-of-day palette tables
+Each (weather, time bucket) pair maps the 16 Pyxel colors to tinted ones.
+The tables are built once at import; drawing applies one with pyxel.pal
+around the cached map layer, so tinting costs nothing per tile.
+"""
+
+# One step darker for every color of the default palette
+DARKER = (0, 0, 1, 1, 2, 1, 5, 6, 2, 4, 9, 3, 5, 5, 8, 14)
+
+# Warm sunrise/sunset light
+WARMER = (0, 2, 2, 4, 9, 13, 15, 15, 8, 9, 9, 10, 6, 14, 14, 15)
+
+# Per-weather color shifts, applied before the time of day
+WEATHER_SHIFTS = {
+    "clear": tuple(range(16)),
+    "rain": (0, 1, 1, 5, 2, 1, 12, 6, 2, 4, 9, 3, 5, 5, 8, 13),
+    "fog": (5, 5, 13, 13, 13, 13, 6, 7, 13, 13, 6, 6, 6, 6, 6, 7),
+    "snow": (1, 5, 13, 6, 13, 6, 7, 7, 14, 15, 7, 7, 6, 6, 15, 7),
+}
+
+# Time buckets as (darken steps, warm light); dawn and dusk blend through
+# several buckets instead of switching in one go
+TIME_BUCKETS = {
+    "night": (2, False),
+    "twilight": (1, True),
+    "golden": (0, True),
+    "day": (0, False),
+}
+
+# Bucket of every hour of the day
+HOUR_BUCKETS = (
+    ("night",) * 5  # 00-04
+    + ("twilight", "golden", "golden")  # 05-07 dawn
+    + ("day",) * 10  # 08-17
+    + ("golden", "golden", "twilight")  # 18-20 dusk
+    + ("night",) * 3  # 21-23
+)
+
+
+def compose(first, second):
+    """Table that applies `first` and then `second`"""
+    return tuple(second[color] for color in first)
+
+
+def build_table(weather, bucket):
+    """Palette table for a weather and a time bucket"""
+    darken, warm = TIME_BUCKETS[bucket]
+    table = WEATHER_SHIFTS[weather]
+    if warm:
+        table = compose(table, WARMER)
+    for _ in range(darken):
+        table = compose(table, DARKER)
+    return table
+
+
+PALETTE_TABLES = {
+    (weather, bucket): build_table(weather, bucket)
+    for weather in WEATHER_SHIFTS
+    for bucket in TIME_BUCKETS
+}
+
+
+def time_bucket(time_of_day):
+    """Time bucket of a minute of the day (0-1439)"""
+    return HOUR_BUCKETS[(time_of_day // 60) % 24]
+
+
+def apply_palette(gfx, table):
+    """Remap the draw palette of pyxel or an image; reset with gfx.pal()"""
+    for color, tinted in enumerate(table):
+        if color != tinted:
+            gfx.pal(color, tinted)
@@ -0,0 +1,157 @@
+"""
+Grid pathfinding
+A* for point-to-point paths and breadth-first distance fields over a map's
+walkability mask. A distance field toward a target is computed once and
+shared by every agent heading there; fields are cached per target and
+dropped only when the map's walkability changes.
+"""
+
+import heapq
+from collections import OrderedDict
+import numpy as np
+
+UNREACHABLE = -1
+
+# 4-way moves, in the order next_step prefers them
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+
+class Pathfinder:
+    """Path queries over a map with `walkable` and `walkable_version`"""
+
+    def __init__(self, map_obj, max_fields=32):
+        self.map = map_obj
+        self.max_fields = max_fields
+        self.fields = OrderedDict()  # targets -> distance field, LRU order
+        self.version = None
+        self.height, self.width = map_obj.walkable.shape
+        self.padded = None  # Flat walkable mask with a blocked 1-tile border
+        self.offsets = None
+
+    def refresh(self):
+        """Drop cached fields if the map's walkability changed"""
+        if self.version == self.map.walkable_version and self.padded is not None:
+            return
+        self.version = self.map.walkable_version
+        self.fields.clear()
+        self.padded = np.pad(self.map.walkable, 1).ravel()
+        stride = self.width + 2
+        self.offsets = np.array([dy * stride + dx for dx, dy in DIRECTIONS])
+
+    def to_index(self, x, y):
+        """Flat index of a tile in the padded mask"""
+        return (y + 1) * (self.width + 2) + x + 1
+
+    def to_point(self, index):
+        """Tile coordinates of a flat padded index"""
+        y, x = divmod(index, self.width + 2)
+        return x - 1, y - 1
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def find_path(self, start, goal):
+        """A* path from start to goal as a list of (x, y), both included
+
+        Returns None when the goal cannot be reached.
+        """
+        self.refresh()
+        if not (self.in_bounds(*start) and self.in_bounds(*goal)):
+            return None
+        start_index = self.to_index(*start)
+        goal_index = self.to_index(*goal)
+        if not (self.padded[start_index] and self.padded[goal_index]):
+            return None
+
+        stride = self.width + 2
+        goal_y, goal_x = divmod(goal_index, stride)
+        walkable = self.padded
+        offsets = self.offsets.tolist()
+        came_from = {start_index: None}
+        cost = {start_index: 0}
+        open_heap = [(0, start_index)]
+        while open_heap:
+            _, index = heapq.heappop(open_heap)
+            if index == goal_index:
+                path = []
+                while index is not None:
+                    path.append(self.to_point(index))
+                    index = came_from[index]
+                return path[::-1]
+            next_cost = cost[index] + 1
+            for offset in offsets:
+                neighbor = index + offset
+                if not walkable[neighbor]:
+                    continue
+                if neighbor in cost and cost[neighbor] <= next_cost:
+                    continue
+                cost[neighbor] = next_cost
+                came_from[neighbor] = index
+                ny, nx = divmod(neighbor, stride)
+                heuristic = abs(nx - goal_x) + abs(ny - goal_y)
+                heapq.heappush(open_heap, (next_cost + heuristic, neighbor))
+        return None
+
+    def distance_field(self, targets):
+        """Steps from every tile to the nearest target, UNREACHABLE if none
+
+        `targets` is one (x, y) or a collection of them. The result is a
+        shared, cached array shaped like the map; do not modify it.
+        """
+        self.refresh()
+        if len(targets) == 2 and all(isinstance(v, (int, np.integer)) for v in targets):
+            targets = (tuple(targets),)
+        key = tuple(sorted({(int(x), int(y)) for x, y in targets}))
+        field = self.fields.get(key)
+        if field is not None:
+            self.fields.move_to_end(key)
+            return field
+
+        field = self.compute_field(key)
+        self.fields[key] = field
+        if len(self.fields) > self.max_fields:
+            self.fields.popitem(last=False)
+        return field
+
+    def compute_field(self, targets):
+        """Multi-source breadth-first search, one vectorized step per ring"""
+        stride = self.width + 2
+        distances = np.full(self.padded.shape, UNREACHABLE, dtype=np.int32)
+        frontier = np.array(
+            [self.to_index(x, y) for x, y in targets if self.in_bounds(x, y)],
+            dtype=np.int64,
+        )
+        frontier = frontier[self.padded[frontier]] if len(frontier) else frontier
+        distances[frontier] = 0
+        open_tiles = self.padded.copy()
+        open_tiles[frontier] = False
+
+        step = 0
+        while len(frontier):
+            step += 1
+            neighbors = np.unique((frontier[:, None] + self.offsets).ravel())
+            frontier = neighbors[open_tiles[neighbors]]
+            open_tiles[frontier] = False
+            distances[frontier] = step
+
+        field = distances.reshape(self.height + 2, stride)[1:-1, 1:-1]
+        field.flags.writeable = False
+        return field
+
+    def distance(self, start, targets):
+        """Steps from start to the nearest target, or UNREACHABLE"""
+        x, y = start
+        if not self.in_bounds(x, y):
+            return UNREACHABLE
+        return int(self.distance_field(targets)[y, x])
+
+    def next_step(self, x, y, targets):
+        """Move (dx, dy) one tile closer to the nearest target, or None"""
+        field = self.distance_field(targets)
+        if not self.in_bounds(x, y) or field[y, x] <= 0:
+            return None
+        for dx, dy in DIRECTIONS:
+            nx, ny = x + dx, y + dy
+            if self.in_bounds(nx, ny) and field[ny, nx] == field[y, x] - 1:
+                return dx, dy
+        return None
@@ -1,5 +1,6 @@
 import random
 from .map_data import DIFFICULTY_LEVELS, MAP_SIZE
+from .exploration import ExplorationMap
 
 
 class Player:
@@ -63,13 +64,16 @@ class Player:
         self.achievements = set()
         self.potions_used = 0
         self.bosses_defeated = 0
-        self.explored = set()
+        self.explored = ExplorationMap(MAP_SIZE, MAP_SIZE)
 
     def move(self, dx, dy, wrap=True):
         if self.confused > 0 and random.random() < 0.5:
             dx, dy = random.choice([(0, 1), (0, -1), (1, 0), (-1, 0)])
-        self.x = (self.x + dx) % MAP_SIZE
-        self.y = (self.y + dy) % MAP_SIZE
+        self.x += dx
+        self.y += dy
+        if wrap:
+            self.x %= MAP_SIZE
+            self.y %= MAP_SIZE
         if self.confused > 0:
             self.confused -= 1
 
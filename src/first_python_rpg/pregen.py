@@ -0,0 +1,103 @@
+"""
+Background map and dungeon pre-generation
+Keeps a small queue of seeded maps and dungeons per kind, generated by a
+worker process so starting a level never stalls a frame. Workers send
+back the uint8 tile array, not Python lists. Seeds come from the
+service's own stream in queue order, so the same levels come out with or
+without the background pool.
+"""
+
+import atexit
+import multiprocessing
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .map import MapPyxel
+from .map_data import MAP_SIZE
+from .pyxel_enhancements import ProceduralDungeonGenerator
+
+
+def build_map(seed, size):
+    """Worker job: overworld tiles and spawn for a seed"""
+    map_obj = MapPyxel(size=size, seed=seed)
+    return map_obj.tiles, map_obj.spawn
+
+
+def build_dungeon(seed, size, mode):
+    """Worker job: dungeon tiles and spawn for a seed"""
+    generator = ProceduralDungeonGenerator(size=size, mode=mode, seed=seed)
+    return generator.generate_tiles(), generator.spawn
+
+
+JOBS = {"map": build_map, "dungeon": build_dungeon}
+
+
+class GenerationService:
+    """Queues of ready-to-use levels, filled in the background if enabled"""
+
+    def __init__(self, seed=None, queue_size=2, background=True, max_workers=1):
+        # Draw the stream's seed from `random` so seeding it fixes every level
+        seed = random.getrandbits(32) if seed is None else seed
+        self.seed_stream = random.Random(seed)
+        self.queue_size = queue_size
+        self.executor = None
+        if background:
+            # Spawned workers never inherit the parent's Pyxel window
+            self.executor = ProcessPoolExecutor(
+                max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            # Pyxel exits the process on quit, so stop the pool from a hook
+            atexit.register(self.shutdown)
+        self.queues = {}  # job -> deque of [seed, future or None]
+
+    def prefetch(self, job):
+        """Top up the queue of a job such as ("dungeon", 32, "caves")"""
+        queue = self.queues.setdefault(job, deque())
+        while len(queue) < self.queue_size:
+            seed = self.seed_stream.getrandbits(32)
+            future = None
+            if self.executor is not None:
+                future = self.executor.submit(JOBS[job[0]], seed, *job[1:])
+            queue.append([seed, future])
+
+    def take(self, job):
+        """Next level of a job as (seed, tiles, spawn)
+
+        Waits only if the worker has not finished it yet; without a pool
+        the level is generated here.
+        """
+        self.prefetch(job)
+        seed, future = self.queues[job].popleft()
+        if future is None or future.cancelled():
+            tiles, spawn = JOBS[job[0]](seed, *job[1:])
+        else:
+            tiles, spawn = future.result()
+        self.prefetch(job)
+        return seed, tiles, spawn
+
+    def take_map(self, size=MAP_SIZE, map_class=MapPyxel):
+        """Next overworld map"""
+        seed, tiles, spawn = self.take(("map", size))
+        return map_class(seed=seed, spawn=spawn, tiles=tiles)
+
+    def take_dungeon(self, size=MAP_SIZE, mode="bsp", map_class=MapPyxel):
+        """Next dungeon, as a map starting at its spawn"""
+        seed, tiles, spawn = self.take(("dungeon", size, mode))
+        return map_class(seed=seed, spawn=spawn, tiles=tiles)
+
+    def ready(self, job):
+        """Number of queued levels of a job that are already generated"""
+        queue = self.queues.get(job, ())
+        return sum(1 for _, future in queue if future is not None and future.done())
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        if self.executor is not None:
+            # cancel_futures needs Python 3.9, so cancel queued jobs here
+            for queue in self.queues.values():
+                for entry in queue:
+                    if entry[1] is not None:
+                        entry[1].cancel()
+            self.executor.shutdown(wait=False)
+            self.executor = None
+            atexit.unregister(self.shutdown)
@@ -0,0 +1,147 @@
+"""
+Per-subsystem frame profiler
+Times each update and draw stage, keeps rolling p50/p95/max statistics
+for the in-game overlay and can stream every frame to a CSV file.
+"""
+
+import csv
+import time
+from collections import deque
+
+# Stages in the order they run during a frame
+STAGES = (
+    "particles_update",
+    "weather_update",
+    "state_update",
+    "map_draw",
+    "sprites_draw",
+    "particles_draw",
+    "hud_draw",
+    "panels_draw",
+    "message_draw",
+)
+
+
+class _Section:
+    """Context manager that adds its elapsed time to a profiler stage"""
+
+    __slots__ = ("profiler", "stage", "start")
+
+    def __init__(self, profiler, stage):
+        self.profiler = profiler
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        self.profiler.add_sample(self.stage, elapsed)
+        return False
+
+
+class _NullSection:
+    """Context manager used while profiling is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class FrameProfiler:
+    """Collects per-stage frame timings in milliseconds"""
+
+    def __init__(self, window=120):
+        self.window = window  # Frames kept for the rolling statistics
+        self.show_overlay = False
+        self.samples = {stage: deque(maxlen=window) for stage in STAGES}
+        self.samples["frame"] = deque(maxlen=window)
+        self.current = {}
+        self.frame_start = None
+        self.frame_index = 0
+        self.csv_file = None
+        self.csv_writer = None
+
+    @property
+    def enabled(self):
+        """Timing only runs while someone is looking at the results"""
+        return self.show_overlay or self.csv_writer is not None
+
+    def toggle_overlay(self):
+        """Show or hide the in-game overlay"""
+        self.show_overlay = not self.show_overlay
+
+    def section(self, stage):
+        """Time a block of code as part of a stage"""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, stage)
+
+    def run(self, systems):
+        """Call each (stage, system) in order, timing them while enabled"""
+        if not self.enabled:
+            for _, system in systems:
+                system()
+            return
+        for stage, system in systems:
+            start = time.perf_counter()
+            system()
+            self.add_sample(stage, (time.perf_counter() - start) * 1000)
+
+    def add_sample(self, stage, elapsed_ms):
+        """Add time to a stage for the current frame"""
+        self.current[stage] = self.current.get(stage, 0.0) + elapsed_ms
+
+    def begin_frame(self):
+        """Mark the start of a frame"""
+        self.current = {}
+        self.frame_start = time.perf_counter() if self.enabled else None
+
+    def end_frame(self):
+        """Close the current frame and record its samples"""
+        if self.frame_start is not None:
+            frame_ms = (time.perf_counter() - self.frame_start) * 1000
+            self.samples["frame"].append(frame_ms)
+            for stage, elapsed in self.current.items():
+                self.samples[stage].append(elapsed)
+            if self.csv_writer is not None:
+                row = [self.frame_index, f"{frame_ms:.4f}"]
+                for stage in STAGES:
+                    elapsed = self.current.get(stage)
+                    row.append("" if elapsed is None else f"{elapsed:.4f}")
+                self.csv_writer.writerow(row)
+        self.current = {}
+        self.frame_start = None
+        self.frame_index += 1
+
+    def stats(self, stage):
+        """Rolling (p50, p95, max) of a stage in ms, or None without samples"""
+        values = sorted(self.samples[stage])
+        if not values:
+            return None
+        last = len(values) - 1
+        p50 = values[min(last, int(len(values) * 0.50))]
+        p95 = values[min(last, int(len(values) * 0.95))]
+        return p50, p95, values[-1]
+
+    def start_csv(self, path):
+        """Stream every following frame to a CSV file"""
+        self.stop_csv()
+        self.csv_file = open(path, "w", newline="")
+        self.csv_writer = csv.writer(self.csv_file)
+        self.csv_writer.writerow(["frame", "frame_ms", *STAGES])
+
+    def stop_csv(self):
+        """Stop streaming samples and close the CSV file"""
+        if self.csv_file is not None:
+            self.csv_file.close()
+        self.csv_file = None
+        self.csv_writer = None
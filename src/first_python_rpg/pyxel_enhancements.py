@@ -5,18 +5,47 @@ This module adds procedural generation improvements and modern features
 
 import pyxel
 import random
-import math
-from .map import MapPyxel
+import numpy as np
+from .map import MapPyxel, TILE_CODES, MAP_OFFSET_Y, tile_chars
+from .map_data import FX_RANDOM, MAP_SIZE
+from .palettes import PALETTE_TABLES, apply_palette, time_bucket
+from .sprites import image_pixels
+from .animation import TileAnimator
+from .dungeon import generate_bsp, generate_caves, room_center
+from .connectivity import label_components
+from .quests import (
+    COLLECT_GOLD,
+    CollectGoal,
+    KillGoal,
+    Quest,
+    ReachGoal,
+    SurviveGoal,
+    far_corner,
+    pick_reach_target,
+    reach_bounds,
+)
+
+# Precipitation drawn for each weather: pool size, color, streak length and
+# the velocity ranges drops are spawned with
+WEATHER_PRECIPITATION = {
+    "rain": {"count": 1500, "color": 12, "length": 2, "vx": (-0.6, -0.3), "vy": (4, 6)},
+    "snow": {"count": 800, "color": 7, "length": 1, "vx": (-0.3, 0.3), "vy": (0.4, 1)},
+    "fog": {"count": 600, "color": 6, "length": 1, "vx": (0.2, 0.5), "vy": (-0.1, 0.1)},
+}
 
 
 class EnhancedMapPyxel(MapPyxel):
     """Enhanced map with procedural generation and advanced features"""
 
-    def __init__(self):
-        super().__init__()
+    detail_tiles = ("R", "#")  # Trees and water are drawn by the animator
+
+    def __init__(self, size=MAP_SIZE, seed=None, spawn=None, tiles=None, terrain=None):
+        super().__init__(size, seed, spawn, tiles, terrain)
         self.weather = "clear"
         self.weather_timer = 0
         self.time_of_day = 0  # 0-1440 (minutes in a day)
+        self.animator = None  # Tree and water animation, built on first draw
+        self.precipitation = PrecipitationField()
         self.generate_enhanced_features()
 
     def generate_enhanced_features(self):
@@ -41,136 +70,120 @@ class EnhancedMapPyxel(MapPyxel):
         # Update time of day
         self.time_of_day = (self.time_of_day + 1) % 1440
 
-    def get_weather_color_modifier(self):
-        """Get color modifier based on weather"""
-        if self.weather == "rain":
-            return 1  # Darker blue tint
-        elif self.weather == "fog":
-            return 6  # Gray tint
-        elif self.weather == "snow":
-            return 7  # White tint
-        return 0  # No modifier
-
-    def get_time_color_modifier(self):
-        """Get color modifier based on time of day"""
-        hour = self.time_of_day // 60
-        if hour < 6 or hour > 20:  # Night time
-            return 1  # Darker colors
-        elif hour < 8 or hour > 18:  # Dawn/dusk
-            return 9  # Orange tint
-        return 0  # Day time - no modifier
+    def palette_table(self):
+        """Palette remap for the current weather and hour"""
+        return PALETTE_TABLES[(self.weather, time_bucket(self.time_of_day))]
+
+    def draw_tile_detail(self, target, px, py, tile):
+        """Draw the static symbols for rocks and stone"""
+        center_x = px + self.tile_size // 2
+        center_y = py + self.tile_size // 2
+        if tile == "R":  # Rock
+            target.pset(center_x, center_y, 13)
+        elif tile == "#":  # Stone
+            target.pset(center_x, center_y, 5)
+
+    def set_tile(self, x, y, tile):
+        """Change a tile and rebuild the animation on the next draw"""
+        super().set_tile(x, y, tile)
+        self.animator = None
+
+    def render_layer(self):
+        """Pre-render the terrain; animated symbols are redrawn afterwards"""
+        super().render_layer()
+        if self.animator is not None:
+            self.animator.invalidate()
+
+    def animate_layer(self, frame):
+        """Redraw the animated tiles whose offset changed since last frame"""
+        if self.animator is None:
+            self.animator = TileAnimator(
+                self.tiles, TILE_CODES, self.tile_size, self.seed
+            )
+        ts = self.tile_size
+        half = ts // 2
+        for tile, spec, xs, ys, offsets in self.animator.changes(frame):
+            base = self.tile_color(tile)
+            horizontal = spec["axis"] == "x"
+            for x, y, offset in zip(xs.tolist(), ys.tolist(), offsets.tolist()):
+                px, py = x * ts, y * ts
+                self.layer.rect(px, py, ts, ts, base)
+                if horizontal:
+                    self.layer.pset(px + half + offset, py + half, spec["color"])
+                else:
+                    self.layer.pset(px + half, py + half + offset, spec["color"])
 
     def draw(self):
         """Draw enhanced map with weather and time effects"""
-        weather_modifier = self.get_weather_color_modifier()
-        time_modifier = self.get_time_color_modifier()
-
-        for y in range(self.size):
-            for x in range(self.size):
-                tile = self.grid[y][x]
-                from .map import TILE_COLORS
-
-                base_color = TILE_COLORS.get(tile, 0)
-
-                # Apply weather/time modifiers
-                if weather_modifier > 0:
-                    base_color = weather_modifier
-                elif time_modifier > 0:
-                    base_color = time_modifier
-
-                # Calculate pixel position
-                px = x * self.tile_size
-                py = y * self.tile_size + 20  # Offset for HUD
-
-                # Draw tile
-                pyxel.rect(px, py, self.tile_size, self.tile_size, base_color)
-
-                # Add enhanced symbols
-                if tile in ("T", "R", "o", "#"):
-                    center_x = px + self.tile_size // 2
-                    center_y = py + self.tile_size // 2
-
-                    if tile == "T":  # Tree - animated
-                        sway = int(math.sin(pyxel.frame_count * 0.1) * 2)
-                        pyxel.pset(center_x + sway, center_y, 3)
-                    elif tile == "R":  # Rock
-                        pyxel.pset(center_x, center_y, 13)
-                    elif tile == "o":  # Water - animated
-                        wave = int(math.sin(pyxel.frame_count * 0.2) * 1)
-                        pyxel.pset(center_x, center_y + wave, 12)
-                    elif tile == "#":  # Stone
-                        pyxel.pset(center_x, center_y, 5)
+        self.refresh_layer()
+        self.animate_layer(pyxel.frame_count)
+
+        # Tint the untouched cached layer through the draw palette
+        apply_palette(pyxel, self.palette_table())
+        super().draw()
+        pyxel.pal()
 
         # Draw weather effects
         self.draw_weather_effects()
 
     def draw_weather_effects(self):
-        """Draw weather particle effects"""
-        if self.weather == "rain":
-            # Draw rain drops
-            for _ in range(10):
-                x = random.randint(0, 256)
-                y = random.randint(20, 256)
-                pyxel.pset(x, y, 12)  # Blue rain drops
-        elif self.weather == "snow":
-            # Draw snow flakes
-            for _ in range(8):
-                x = random.randint(0, 256)
-                y = random.randint(20, 256)
-                pyxel.pset(x, y, 7)  # White snow flakes
-        elif self.weather == "fog":
-            # Draw fog effect (simple overlay)
-            for _ in range(20):
-                x = random.randint(0, 256)
-                y = random.randint(20, 256)
-                if random.random() < 0.3:
-                    pyxel.pset(x, y, 6)  # Gray fog
+        """Advance and draw the precipitation for the current weather"""
+        if self.precipitation.weather != self.weather:
+            self.precipitation.set_weather(self.weather)
+        self.precipitation.update()
+        self.precipitation.draw()
 
 
 class ProceduralDungeonGenerator:
     """Generates procedural dungeons"""
 
-    def __init__(self, size=11):
-        self.size = size
-
-    def generate_dungeon(self):
-        """Generate a simple dungeon layout"""
-        # Create a basic room-and-corridor dungeon
-        grid = [["#" for _ in range(self.size)] for _ in range(self.size)]
-
-        # Create rooms
-        rooms = []
-        for _ in range(3):
-            room_w = random.randint(3, 5)
-            room_h = random.randint(3, 5)
-            room_x = random.randint(1, self.size - room_w - 1)
-            room_y = random.randint(1, self.size - room_h - 1)
-
-            # Clear room
-            for y in range(room_y, room_y + room_h):
-                for x in range(room_x, room_x + room_w):
-                    grid[y][x] = "."
-
-            rooms.append((room_x, room_y, room_w, room_h))
+    generation_attempts = 3  # Caves tried before giving up on finding floor
 
-        # Connect rooms with corridors
-        for i in range(len(rooms) - 1):
-            room1 = rooms[i]
-            room2 = rooms[i + 1]
-
-            # Simple L-shaped corridor
-            x1, y1 = room1[0] + room1[2] // 2, room1[1] + room1[3] // 2
-            x2, y2 = room2[0] + room2[2] // 2, room2[1] + room2[3] // 2
-
-            # Horizontal corridor
-            for x in range(min(x1, x2), max(x1, x2) + 1):
-                grid[y1][x] = "."
+    def __init__(self, size=11, mode="bsp", seed=None):
+        self.size = size
+        self.mode = mode  # "bsp" rooms and corridors, or "caves"
+        self.seed = seed
+        self.rooms = []
+        self.spawn = None
+
+    def generate_tiles(self):
+        """Generate a dungeon as a uint8 tile array usable by MapPyxel"""
+        seed = random.getrandbits(32) if self.seed is None else self.seed
+        rng = np.random.default_rng(seed)
+        if self.mode == "caves":
+            tiles, self.spawn = self.generate_cave(rng)
+            self.rooms = []
+        else:
+            tiles, self.rooms = generate_bsp(self.size, rng)
+            self.spawn = room_center(self.rooms[0])
+        return tiles
+
+    def generate_cave(self, rng):
+        """Cave tiles and a spawn in the largest open region
+
+        A cave with no floor is redrawn from a fresh seed; ValueError is
+        raised if every attempt comes out solid.
+        """
+        for _ in range(self.generation_attempts):
+            tiles = generate_caves(self.size, rng)
+            labels, sizes = label_components(tiles == TILE_CODES["."])
+            if sizes.any():
+                ys, xs = np.nonzero(labels == sizes.argmax())
+                pick = int(rng.integers(len(xs)))
+                return tiles, (int(xs[pick]), int(ys[pick]))
+            rng = np.random.default_rng(rng.integers(2**32))
+        raise ValueError(
+            f"No floor in {self.generation_attempts} caves of size {self.size}"
+        )
 
-            # Vertical corridor
-            for y in range(min(y1, y2), max(y1, y2) + 1):
-                grid[y][x2] = "."
+    def generate_map(self):
+        """Generate a dungeon and wrap it in a MapPyxel starting at its spawn"""
+        tiles = self.generate_tiles()
+        return MapPyxel(tiles=tiles, spawn=self.spawn)
 
-        return grid
+    def generate_dungeon(self):
+        """Generate a dungeon as rows of tile characters"""
+        return tile_chars(self.generate_tiles()).tolist()
 
 
 class QuestGenerator:
@@ -185,9 +198,10 @@ class QuestGenerator:
         ]
         self.quest_objectives = {
             "kill_enemies": ["Defeat {count} enemies", "Slay the {enemy_type}"],
+            # Gold is the only thing the player can collect
             "collect_items": [
-                "Collect {count} {item_type}",
-                "Find the rare {item_type}",
+                "Collect {gold} gold",
+                "Find {gold} gold in hidden stashes",
             ],
             "reach_location": ["Reach the {location}", "Explore the {location}"],
             "survive_time": [
@@ -197,7 +211,15 @@ class QuestGenerator:
         }
 
     def generate_quest(self):
-        """Generate a random quest"""
+        """Generate a random quest as a plain dict"""
+        return self.create_quest().to_dict()
+
+    def create_quest(self, map_obj=None, start=None):
+        """Generate a random quest with a typed goal
+
+        With a map and a start tile, reach_location quests target a tile the
+        player can actually walk to; otherwise they target the far corner.
+        """
         quest_type = random.choice(self.quest_types)
         objective_template = random.choice(self.quest_objectives[quest_type])
 
@@ -206,63 +228,183 @@ class QuestGenerator:
             count = random.randint(3, 10)
             enemy_type = random.choice(["Goblin", "Orc", "Slime", "Wraith"])
             objective = objective_template.format(count=count, enemy_type=enemy_type)
+            if "{enemy_type}" in objective_template:
+                goal = KillGoal(1, enemy_type)
+            else:
+                goal = KillGoal(count)
         elif quest_type == "collect_items":
-            count = random.randint(2, 5)
-            item_type = random.choice(["Gold", "Potion", "Gem", "Rune"])
-            objective = objective_template.format(count=count, item_type=item_type)
+            gold = random.randint(2, 5) * COLLECT_GOLD
+            objective = objective_template.format(gold=gold)
+            goal = CollectGoal(gold)
         elif quest_type == "reach_location":
             location = random.choice(["Forest", "Mountain", "Cave", "Tower"])
             objective = objective_template.format(location=location)
+            target = None
+            if map_obj is not None and start is not None:
+                target = pick_reach_target(map_obj, start)
+            if target is None:
+                goal = ReachGoal(far_corner())
+            else:
+                goal = ReachGoal(reach_bounds(target, map_obj.size), target)
+                objective += f" ({target[0]},{target[1]})"
         elif quest_type == "survive_time":
             time = random.randint(2, 10)
             location = random.choice(["Dungeon", "Wilderness", "Battlefield"])
             objective = objective_template.format(time=time, location=location)
+            goal = SurviveGoal(time * 60)  # Seconds
+
+        return Quest(quest_type, objective, random.randint(10, 50), goal)
+
+
+class PrecipitationField:
+    """Persistent pool of rain, snow or fog drops drawn as one overlay blit
+
+    Drops keep falling between frames and are recycled at the upwind edge
+    when they leave the screen. Purely visual, so it uses its own RNG.
+    """
+
+    def __init__(
+        self, width=256, height=256 - MAP_OFFSET_Y, capacity=4096, density=1.0
+    ):
+        self.width = width
+        self.height = height
+        self.capacity = capacity
+        self.density = density  # Scales every weather's drop count
+        self.rng = np.random.default_rng(FX_RANDOM.getrandbits(32))
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.count = 0  # Active drops occupy the first `count` slots
+        self.weather = None
+        self.spec = None
+        self.overlay = None  # Created on first render
+
+    def set_weather(self, weather):
+        """Switch to a weather, scattering its drops over the whole screen"""
+        self.weather = weather
+        self.spec = WEATHER_PRECIPITATION.get(weather)
+        if self.spec is None:
+            self.count = 0
+            return
+        n = self.count = min(int(self.spec["count"] * self.density), self.capacity)
+        self.x[:n] = self.rng.uniform(0, self.width, n)
+        self.y[:n] = self.rng.uniform(0, self.height, n)
+        self.vx[:n] = self.rng.uniform(*self.spec["vx"], n)
+        self.vy[:n] = self.rng.uniform(*self.spec["vy"], n)
 
-        return {
-            "type": quest_type,
-            "objective": objective,
-            "reward": random.randint(10, 50),
-            "completed": False,
-        }
+    def update(self):
+        """Move every drop and recycle the ones that left the screen"""
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        vx, vy = self.vx[:n], self.vy[:n]
+        x += vx
+        y += vy
+
+        gone = np.flatnonzero(
+            (x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)
+        )
+        if len(gone):
+            # Re-enter along the edge the drop's motion comes from
+            along = self.rng.random(len(gone))
+            falling = np.abs(vy[gone]) >= np.abs(vx[gone])
+            top = np.where(vy[gone] > 0, 0, self.height - 1)
+            side = np.where(vx[gone] > 0, 0, self.width - 1)
+            x[gone] = np.where(falling, along * self.width, side)
+            y[gone] = np.where(falling, top, along * self.height)
+
+    def render_overlay(self):
+        """Draw the drops into the overlay image; color 0 is transparent"""
+        if self.overlay is None:
+            self.overlay = pyxel.Image(self.width, self.height)
+        pixels = image_pixels(self.overlay)
+        pixels.fill(0)
+        n = self.count
+        if n == 0:
+            return self.overlay
+        xs = self.x[:n].astype(np.intp)
+        ys = self.y[:n].astype(np.intp)
+        color = self.spec["color"]
+        for offset in range(self.spec["length"]):
+            pixels[np.maximum(ys - offset, 0), xs] = color
+        return self.overlay
 
+    def draw(self):
+        """Draw the precipitation over the map"""
+        if self.count == 0:
+            return
+        overlay = self.render_overlay()
+        pyxel.blt(0, MAP_OFFSET_Y, overlay, 0, 0, self.width, self.height, 0)
 
-class ParticleSystem:
-    """Simple particle system for effects"""
 
-    def __init__(self):
-        self.particles = []
+class ParticleSystem:
+    """Fixed-capacity particle pool stored as one array per field"""
+
+    FIELDS = ("x", "y", "vx", "vy", "color", "lifetime", "max_lifetime")
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.count = 0  # Live particles occupy the first `count` slots
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.color = np.zeros(capacity, dtype=np.uint8)
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.max_lifetime = np.ones(capacity, dtype=np.int32)
+
+    @property
+    def particles(self):
+        """Snapshot of the live particles as dicts"""
+        columns = [getattr(self, field)[: self.count].tolist() for field in self.FIELDS]
+        return [dict(zip(self.FIELDS, values)) for values in zip(*columns)]
 
     def add_particle(self, x, y, vx, vy, color, lifetime):
-        """Add a particle"""
-        self.particles.append(
-            {
-                "x": x,
-                "y": y,
-                "vx": vx,
-                "vy": vy,
-                "color": color,
-                "lifetime": lifetime,
-                "max_lifetime": lifetime,
-            }
-        )
+        """Add a particle, dropping it if the pool is full"""
+        if self.count >= self.capacity:
+            return
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.color[i] = color
+        self.lifetime[i] = lifetime
+        self.max_lifetime[i] = lifetime
+        self.count += 1
 
     def update(self):
-        """Update all particles"""
-        for particle in self.particles[:]:
-            particle["x"] += particle["vx"]
-            particle["y"] += particle["vy"]
-            particle["lifetime"] -= 1
-
-            if particle["lifetime"] <= 0:
-                self.particles.remove(particle)
+        """Update all particles in one vectorized step"""
+        n = self.count
+        if n == 0:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.lifetime[:n] -= 1
+
+        # Swap-remove: move live particles from the tail into the dead slots
+        alive = self.lifetime[:n] > 0
+        live_count = int(np.count_nonzero(alive))
+        if live_count < n:
+            holes = np.flatnonzero(~alive[:live_count])
+            movers = np.flatnonzero(alive[live_count:]) + live_count
+            for field in self.FIELDS:
+                values = getattr(self, field)
+                values[holes] = values[movers]
+            self.count = live_count
 
     def draw(self):
         """Draw all particles"""
-        for particle in self.particles:
-            # Fade particles as they age
-            alpha = particle["lifetime"] / particle["max_lifetime"]
-            if alpha > 0.5:
-                pyxel.pset(int(particle["x"]), int(particle["y"]), particle["color"])
+        n = self.count
+        # Fade particles as they age
+        visible = self.lifetime[:n] * 2 > self.max_lifetime[:n]
+        xs = self.x[:n][visible].astype(int).tolist()
+        ys = self.y[:n][visible].astype(int).tolist()
+        colors = self.color[:n][visible].tolist()
+        for x, y, color in zip(xs, ys, colors):
+            pyxel.pset(x, y, color)
 
     def create_spell_effect(self, x, y, spell_type):
         """Create spell effect particles"""
@@ -0,0 +1,267 @@
+"""
+Event-driven quest tracking
+Quests carry a typed goal that names the one event it depends on. The
+quest manager subscribes once per event and hands each event only to the
+quests waiting for it. Location goals live in a grid-bucket index, so
+entering a tile reads one bucket however many quests are active.
+"""
+
+import random
+import numpy as np
+from .map_data import MAP_SIZE
+
+COLLECT_GOLD = 5  # collect_items: gold asked for per unit of the quest size
+REACH_AREA = 0.8  # reach_location without a map: past this share of both axes
+REACH_RADIUS = 1  # Tiles around a reach target that count as arriving
+BUCKET_SIZE = 4  # Side of a grid-index bucket in tiles
+ACTIVE_QUESTS = 3  # Quests the engine keeps running at once
+
+
+class Goal:
+    """Progress toward a target count of one event"""
+
+    event = None
+
+    def __init__(self, total):
+        self.total = total
+        self.progress = 0
+
+    @property
+    def done(self):
+        return self.progress >= self.total
+
+    def advance(self, **data):
+        """Count an event; True once the goal is met"""
+        self.progress += 1
+        return self.done
+
+
+class KillGoal(Goal):
+    """Defeat `total` enemies, or one named enemy"""
+
+    event = "enemy_defeated"
+
+    def __init__(self, total, target=None):
+        super().__init__(total)
+        self.target = target
+
+    def advance(self, name, **data):
+        if self.target not in (None, name):
+            return False
+        return super().advance()
+
+
+class CollectGoal(Goal):
+    """Gain `total` gold, not counting quest rewards"""
+
+    event = "gold_changed"
+
+    def advance(self, delta, reward=False, **data):
+        if reward:
+            return False
+        self.progress += max(0, delta)
+        return self.done
+
+
+class SurviveGoal(Goal):
+    """Keep playing for `total` seconds"""
+
+    event = "time_elapsed"
+
+    def advance(self, seconds, **data):
+        self.progress += seconds
+        return self.done
+
+
+class ReachGoal(Goal):
+    """Enter any tile inside inclusive `bounds` (x0, y0, x1, y1)"""
+
+    event = "tile_entered"
+
+    def __init__(self, bounds, target=None):
+        super().__init__(1)
+        self.bounds = bounds
+        self.target = target  # The picked tile, if the goal has one
+
+
+class Quest:
+    """A quest with a typed goal"""
+
+    def __init__(self, kind, objective, reward, goal):
+        self.kind = kind
+        self.objective = objective
+        self.reward = reward
+        self.goal = goal
+        self.completed = False
+
+    def to_dict(self):
+        """The loose dict form that QuestGenerator.generate_quest returns"""
+        return {
+            "type": self.kind,
+            "objective": self.objective,
+            "reward": self.reward,
+            "completed": self.completed,
+            "goal": self.goal.total,
+            "target": getattr(self.goal, "target", None),
+            "progress": self.goal.progress,
+        }
+
+
+def far_corner(size=MAP_SIZE):
+    """Bounds of the map corner used by reach quests without a map"""
+    start = int(size * REACH_AREA) + 1
+    return (start, start, size - 1, size - 1)
+
+
+def pick_reach_target(map_obj, start, min_share=0.5):
+    """A walkable tile reachable from `start`, in the farther part of its region
+
+    Returns None if nothing but `start` itself is reachable.
+    """
+    field = map_obj.get_pathfinder().distance_field(start)
+    farthest = int(field.max())
+    if farthest <= 0:
+        return None
+    ys, xs = np.nonzero(field >= max(1, int(farthest * min_share)))
+    index = random.randrange(len(xs))
+    return int(xs[index]), int(ys[index])
+
+
+def reach_bounds(target, size, radius=REACH_RADIUS):
+    x, y = target
+    return (
+        max(0, x - radius),
+        max(0, y - radius),
+        min(size - 1, x + radius),
+        min(size - 1, y + radius),
+    )
+
+
+class GridIndex:
+    """Rectangles bucketed by grid cell, so a point query reads one bucket"""
+
+    def __init__(self, bucket_size=BUCKET_SIZE):
+        self.bucket_size = bucket_size
+        self.buckets = {}  # (bx, by) -> items overlapping that cell
+        self.bounds = {}  # item -> (x0, y0, x1, y1)
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def cells(self, bounds):
+        x0, y0, x1, y1 = bounds
+        size = self.bucket_size
+        for by in range(y0 // size, y1 // size + 1):
+            for bx in range(x0 // size, x1 // size + 1):
+                yield bx, by
+
+    def insert(self, item, bounds):
+        self.bounds[item] = bounds
+        for cell in self.cells(bounds):
+            self.buckets.setdefault(cell, []).append(item)
+
+    def remove(self, item):
+        bounds = self.bounds.pop(item, None)
+        if bounds is None:
+            return
+        for cell in self.cells(bounds):
+            bucket = self.buckets[cell]
+            bucket.remove(item)
+            if not bucket:
+                del self.buckets[cell]
+
+    def query(self, x, y):
+        """Items whose bounds contain the tile"""
+        size = self.bucket_size
+        bucket = self.buckets.get((x // size, y // size))
+        if not bucket:
+            return []
+        found = []
+        for item in bucket:
+            x0, y0, x1, y1 = self.bounds[item]
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                found.append(item)
+        return found
+
+
+class QuestManager:
+    """Active quests, each fed only the events its goal needs"""
+
+    def __init__(self, bus, on_complete):
+        self.bus = bus
+        self.on_complete = on_complete
+        self.active = []
+        # event -> quests, except location goals; dicts keep the order
+        # quests were added and make membership checks constant time
+        self.waiting = {
+            "enemy_defeated": {},
+            "gold_changed": {},
+            "time_elapsed": {},
+        }
+        self.locations = GridIndex()
+        self.handlers = [
+            (event, bus.subscribe(event, self.make_handler(event)))
+            for event in self.waiting
+        ]
+        self.handlers.append(
+            ("tile_entered", bus.subscribe("tile_entered", self.on_tile_entered))
+        )
+
+    def __len__(self):
+        return len(self.active)
+
+    def make_handler(self, event):
+        waiting = self.waiting[event]
+
+        def handle(**data):
+            if waiting:
+                for quest in tuple(waiting):
+                    # An earlier completion in this dispatch may have
+                    # finished or removed the quest already
+                    if quest.completed or quest not in waiting:
+                        continue
+                    if quest.goal.advance(**data):
+                        self.complete(quest)
+
+        return handle
+
+    def on_tile_entered(self, x, y, **data):
+        for quest in self.locations.query(x, y):
+            if quest.completed or quest not in self.locations.bounds:
+                continue
+            quest.goal.advance()
+            self.complete(quest)
+
+    def add(self, quest):
+        self.active.append(quest)
+        goal = quest.goal
+        if goal.event == "tile_entered":
+            self.locations.insert(quest, goal.bounds)
+        else:
+            self.waiting[goal.event][quest] = None
+        return quest
+
+    def remove(self, quest):
+        if quest not in self.active:
+            return
+        self.active.remove(quest)
+        if quest.goal.event == "tile_entered":
+            self.locations.remove(quest)
+        else:
+            del self.waiting[quest.goal.event][quest]
+
+    def complete(self, quest):
+        self.remove(quest)
+        quest.completed = True
+        self.on_complete(quest)
+
+    def clear(self):
+        for quest in tuple(self.active):
+            self.remove(quest)
+
+    def close(self):
+        """Drop every quest and unsubscribe from the bus"""
+        self.clear()
+        for event, handler in self.handlers:
+            self.bus.unsubscribe(event, handler)
+        self.handlers = []
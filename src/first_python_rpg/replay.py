@@ -0,0 +1,163 @@
+"""
+Deterministic input recording and replay
+A recording is the RNG seed plus the input actions of every simulation
+tick. Ticks are stored as action bitmasks, run-length encoded and written
+as varints, so long idle stretches cost a couple of bytes.
+"""
+
+import random
+import time
+from .engine import ACTIONS, GameEngine
+
+MAGIC = b"RPGR"
+VERSION = 1
+
+ACTION_BITS = {action: 1 << bit for bit, action in enumerate(ACTIONS)}
+
+
+def encode_actions(actions):
+    """Pack a set of actions into a bitmask"""
+    mask = 0
+    for action in actions:
+        mask |= ACTION_BITS[action]
+    return mask
+
+
+def decode_actions(mask):
+    """Unpack a bitmask into a set of actions"""
+    return {action for action, bit in ACTION_BITS.items() if mask & bit}
+
+
+def write_varint(out, value):
+    """Append an unsigned LEB128 varint to a bytearray"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    """Read an unsigned LEB128 varint, returning (value, next position)"""
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated replay data")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Replay:
+    """A seed and a run-length encoded stream of per-frame action masks"""
+
+    def __init__(self, seed, runs=None):
+        self.seed = seed
+        self.runs = runs if runs is not None else []  # [mask, frame count]
+
+    def __len__(self):
+        return sum(count for _, count in self.runs)
+
+    def append(self, mask):
+        """Add one frame's action mask"""
+        if self.runs and self.runs[-1][0] == mask:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([mask, 1])
+
+    def frames(self):
+        """Yield the action set of every frame in order"""
+        for mask, count in self.runs:
+            actions = decode_actions(mask)
+            for _ in range(count):
+                yield actions
+
+    def to_bytes(self):
+        """Serialize to the compact replay format"""
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        write_varint(out, self.seed)
+        write_varint(out, len(self.runs))
+        for mask, count in self.runs:
+            write_varint(out, mask)
+            write_varint(out, count)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Parse the compact replay format"""
+        if data[: len(MAGIC)] != MAGIC:
+            raise ValueError("Not a replay file")
+        if data[len(MAGIC)] != VERSION:
+            raise ValueError(f"Unsupported replay version {data[len(MAGIC)]}")
+        pos = len(MAGIC) + 1
+        seed, pos = read_varint(data, pos)
+        run_count, pos = read_varint(data, pos)
+        runs = []
+        for _ in range(run_count):
+            mask, pos = read_varint(data, pos)
+            count, pos = read_varint(data, pos)
+            runs.append([mask, count])
+        return cls(seed, runs)
+
+    def save(self, path):
+        """Write the replay to a file"""
+        with open(path, "wb") as replay_file:
+            replay_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """Read a replay from a file"""
+        with open(path, "rb") as replay_file:
+            return cls.from_bytes(replay_file.read())
+
+    def run(self, engine=None, **options):
+        """Play the replay through a headless engine as fast as possible
+
+        Without an engine, one is built after seeding with `options` passed
+        to GameEngine; they must match the options the recording used.
+        """
+        random.seed(self.seed)
+        if engine is None:
+            engine = GameEngine(**options)
+        for actions in self.frames():
+            if not engine.running:
+                break
+            engine.step(actions)
+        return engine
+
+
+class InputRecorder:
+    """Seeds the gameplay RNG and records the input actions of every tick"""
+
+    def __init__(self, seed=None):
+        self.replay = Replay(random.getrandbits(32) if seed is None else seed)
+
+    def start(self):
+        """Seed the RNG; call before the game creates any random state"""
+        random.seed(self.replay.seed)
+
+    def record(self, actions):
+        """Record one tick's actions"""
+        self.replay.append(encode_actions(actions))
+
+    def save(self, path):
+        """Write the recording to a file"""
+        self.replay.save(path)
+
+
+def benchmark_replay(path, **options):
+    """Replay a recording headless and report how fast it ran"""
+    replay = Replay.load(path)
+    start = time.perf_counter()
+    engine = replay.run(**options)
+    elapsed = time.perf_counter() - start
+    return {
+        "frames": engine.frame,
+        "seconds": elapsed,
+        "frames_per_second": engine.frame / elapsed if elapsed > 0 else 0.0,
+        "state": engine.state,
+    }
@@ -0,0 +1,159 @@
+"""
+Scene stack
+Each screen of the game (feature select, playing, paused, game over, boss
+battle) is a scene with its own update and draw. Scenes are built the
+first time they are entered and kept for reuse. Overlay scenes such as
+pause draw over a frozen picture of the scene below instead of
+re-rendering it.
+"""
+
+import pyxel
+from .boss import update_boss_battle, draw_boss_battle
+
+
+class Scene:
+    """One screen of the game"""
+
+    name = None
+    stacked = False  # Entered on top of the current scene, which resumes after
+    overlay = False  # Drawn over the last frame of the scene below
+
+    def __init__(self, game):
+        self.game = game
+
+    def enter(self):
+        """Called each time the scene is pushed onto the stack"""
+
+    def update(self, actions):
+        """Advance the scene by one tick"""
+
+    def draw(self):
+        """Render the scene; only called by the Pyxel front-end"""
+
+
+class MenuScene(Scene):
+    """Feature selection menu"""
+
+    name = "feature_select"
+
+    def update(self, actions):
+        self.game.update_feature_select(actions)
+
+    def draw(self):
+        self.game.draw_feature_select()
+
+
+class PlayingScene(Scene):
+    """The overworld"""
+
+    name = "playing"
+
+    def update(self, actions):
+        self.game.update_playing(actions)
+
+    def draw(self):
+        self.game.draw_playing()
+
+
+class PauseScene(Scene):
+    """Pause menu over a frozen snapshot of the game"""
+
+    name = "paused"
+    stacked = True
+    overlay = True
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.snapshot = None
+
+    def enter(self):
+        self.snapshot = None
+
+    def update(self, actions):
+        self.game.update_paused(actions)
+
+    def draw(self):
+        width, height = self.game.WINDOW_WIDTH, self.game.WINDOW_HEIGHT
+        if self.snapshot is not None:
+            pyxel.blt(0, 0, self.snapshot, 0, 0, width, height)
+            return
+        # The screen still holds the last playing frame: add the pause
+        # panel once and keep the result for every later frame
+        self.game.draw_paused()
+        self.snapshot = pyxel.Image(width, height)
+        self.snapshot.blt(0, 0, pyxel.screen, 0, 0, width, height)
+
+
+class GameOverScene(Scene):
+    """Final score screen"""
+
+    name = "gameover"
+
+    def update(self, actions):
+        self.game.update_gameover(actions)
+
+    def draw(self):
+        self.game.draw_gameover()
+
+
+class BossScene(Scene):
+    """Boss battle, returning to the overworld when it ends"""
+
+    name = "boss_battle"
+    stacked = True
+
+    def update(self, actions):
+        update_boss_battle(self.game, actions)
+
+    def draw(self):
+        draw_boss_battle(self.game)
+
+
+SCENES = {
+    scene.name: scene
+    for scene in (MenuScene, PlayingScene, PauseScene, GameOverScene, BossScene)
+}
+
+
+class SceneStack:
+    """Active scenes, top last, built lazily from their classes"""
+
+    def __init__(self, game, scene_classes=None):
+        self.game = game
+        self.scene_classes = SCENES if scene_classes is None else scene_classes
+        self.scenes = {}  # name -> scene, once first entered
+        self.stack = []
+
+    @property
+    def top(self):
+        return self.stack[-1]
+
+    def get(self, name):
+        """The scene with a name, built on first use"""
+        scene = self.scenes.get(name)
+        if scene is None:
+            scene = self.scenes[name] = self.scene_classes[name](self.game)
+        return scene
+
+    def push(self, name):
+        scene = self.get(name)
+        self.stack.append(scene)
+        scene.enter()
+
+    def pop(self):
+        return self.stack.pop()
+
+    def go(self, name):
+        """Make a scene the top one
+
+        Returning to a scene further down pops the ones above it. Stacked
+        scenes are pushed on top of the current one; any other scene
+        replaces the whole stack.
+        """
+        if any(scene.name == name for scene in self.stack):
+            while self.top.name != name:
+                self.pop()
+            return
+        if not self.get(name).stacked:
+            self.stack.clear()
+        self.push(name)
@@ -0,0 +1,142 @@
+"""
+Baked sprite atlas
+The procedural sprite functions in map_data stay the source of truth: each
+sprite is rendered once per (kind, size, color) into an atlas image and
+drawn afterwards with a single blt.
+"""
+
+import pyxel
+import numpy as np
+from .map_data import SPRITES, BOSS_NAMES, draw_boss_sprite
+
+ATLAS_SIZE = 256
+BOSS_SPRITE_SIZE = 32
+UNBAKED_SPRITES = ("fog",)  # Random on every call, so never cached
+
+
+def image_pixels(image):
+    """Writable numpy view of an image's color indices (valid while it lives)"""
+    pixels = np.frombuffer(image.data_ptr(), dtype=np.uint8)
+    return pixels.reshape(image.height, image.width)
+
+
+def find_color_key(width, height, render):
+    """Pick a transparent color the sprite never draws with
+
+    The sprite is drawn over two different backgrounds; pixels that agree
+    between the two belong to the sprite. Returns None if it uses all 16.
+    """
+    scratch = pyxel.Image(width, height)
+    scratch.cls(0)
+    render(scratch, 0, 0)
+    over_black = image_pixels(scratch).copy()
+    scratch.cls(1)
+    render(scratch, 0, 0)
+    over_navy = image_pixels(scratch)
+
+    used = set(over_black[over_black == over_navy].tolist())
+    free = [color for color in range(16) if color not in used]
+    return free[0] if free else None
+
+
+class SpriteAtlas:
+    """Shelf-packed atlas of pre-rendered procedural sprites"""
+
+    def __init__(self, width=ATLAS_SIZE, height=ATLAS_SIZE):
+        self.image = pyxel.Image(width, height)
+        self.slots = {}  # key -> (u, v, w, h, colkey)
+        self.cursor_x = 0
+        self.cursor_y = 0
+        self.row_height = 0
+
+    def allocate(self, w, h):
+        """Reserve a w x h area in the atlas, or return None if it is full"""
+        if self.cursor_x + w > self.image.width:
+            self.cursor_x = 0
+            self.cursor_y += self.row_height
+            self.row_height = 0
+        if w > self.image.width or self.cursor_y + h > self.image.height:
+            return None
+        u, v = self.cursor_x, self.cursor_y
+        self.cursor_x += w
+        self.row_height = max(self.row_height, h)
+        return u, v
+
+    def bake(self, key, w, h, render):
+        """Render a sprite into the atlas; render(target, x, y) draws it"""
+        position = self.allocate(w, h)
+        if position is None:
+            return None
+        u, v = position
+        colkey = find_color_key(w, h, render)
+
+        self.image.clip(u, v, w, h)
+        self.image.rect(u, v, w, h, 0 if colkey is None else colkey)
+        render(self.image, u, v)
+        self.image.clip()
+
+        self.slots[key] = (u, v, w, h, colkey)
+        return self.slots[key]
+
+    def blit(self, slot, x, y, target=None):
+        """Draw a baked sprite with one blt"""
+        gfx = pyxel if target is None else target
+        u, v, w, h, colkey = slot
+        if colkey is None:
+            gfx.blt(x, y, self.image, u, v, w, h)
+        else:
+            gfx.blt(x, y, self.image, u, v, w, h, colkey)
+
+    def sprite_slot(self, kind, size=8, color=8):
+        """Atlas slot of one of the SPRITES, baking it on first use"""
+        key = (kind, size, color)
+        if key not in self.slots and kind not in UNBAKED_SPRITES:
+            extent = max(size, 8)  # Some sprites reach 8 pixels whatever the size
+            self.bake(
+                key,
+                extent,
+                extent,
+                lambda gfx, x, y: SPRITES[kind](x, y, size, color, gfx),
+            )
+        return self.slots.get(key)
+
+    def boss_slot(self, boss_type):
+        """Atlas slot of a boss sprite, baking it on first use"""
+        key = ("boss", boss_type, BOSS_SPRITE_SIZE)
+        if key not in self.slots:
+            self.bake(
+                key,
+                BOSS_SPRITE_SIZE,
+                BOSS_SPRITE_SIZE,
+                lambda gfx, x, y: draw_boss_sprite(
+                    x, y, boss_type, BOSS_SPRITE_SIZE, gfx
+                ),
+            )
+        return self.slots.get(key)
+
+    def draw_sprite(self, kind, x, y, size=8, color=8, target=None):
+        """Draw one of the SPRITES, falling back to drawing it procedurally"""
+        slot = self.sprite_slot(kind, size, color)
+        if slot is None:
+            SPRITES[kind](x, y, size, color, target)
+        else:
+            self.blit(slot, x, y, target)
+
+    def draw_boss(self, boss_type, x, y, target=None):
+        """Draw a boss sprite, falling back to drawing it procedurally"""
+        slot = self.boss_slot(boss_type)
+        if slot is None:
+            draw_boss_sprite(x, y, boss_type, BOSS_SPRITE_SIZE, target)
+        else:
+            self.blit(slot, x, y, target)
+
+    def bake_startup(self, tile_size):
+        """Bake the sprites the game draws every frame ahead of time"""
+        for kind, color in (("player", 8), ("tree", 11), ("rock", 13)):
+            self.sprite_slot(kind, tile_size, color)
+        for boss_type in range(len(BOSS_NAMES)):
+            self.boss_slot(boss_type)
+
+
+# Shared atlas used by the map, the game and the boss screen
+ATLAS = SpriteAtlas()
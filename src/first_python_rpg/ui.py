@@ -0,0 +1,59 @@
+"""
+Retained-mode UI
+Panels render their text into an image only when the values they show
+change, and are blitted in one call on every other frame. Word-wrapped
+layouts are cached by their text and width.
+"""
+
+from functools import lru_cache
+import pyxel
+
+MESSAGE_WIDTH = 30  # Characters per line in the event message box
+
+
+@lru_cache(maxsize=64)
+def wrap_text(text, width=MESSAGE_WIDTH):
+    """Lines of `text` broken at spaces once they pass `width` characters"""
+    if len(text) <= width:
+        return (text,)
+    lines = []
+    line = ""
+    for word in text.split():
+        if len(line + word) > width:
+            lines.append(line)
+            line = word + " "
+        else:
+            line += word + " "
+    if line:
+        lines.append(line)
+    return tuple(lines)
+
+
+class Panel:
+    """A block of UI kept in an image and redrawn when its values change
+
+    `render(image, *values)` draws the panel into the image, and may return
+    the (width, height) it used for panels whose size depends on the values.
+    """
+
+    def __init__(self, width, height, render):
+        self.image = pyxel.Image(width, height)
+        self.render = render
+        self.width = width
+        self.height = height
+        self.values = None
+        self.renders = 0
+
+    def update(self, *values):
+        """Re-render if the values differ from the last ones; True if so"""
+        if values == self.values:
+            return False
+        self.values = values
+        size = self.render(self.image, *values)
+        if size is not None:
+            self.width, self.height = size
+        self.renders += 1
+        return True
+
+    def draw(self, x, y):
+        pyxel.blt(x, y, self.image, 0, 0, self.width, self.height)
@@ -0,0 +1,259 @@
+"""
+Wave-function-collapse terrain
+Every cell holds the set of tiles it may still become as an integer
+bitmask over TILE_CHARS. The lowest-entropy cell is taken from a heap,
+collapsed to one tile, and the adjacency rules are propagated to its
+neighbours with single table lookups, so a 256x256 map collapses in
+about half a second.
+
+Benchmark: python -m first_python_rpg.wfc
+"""
+
+import heapq
+import random
+import time
+import numpy as np
+from .map import TILE_CHARS, TILE_CODES
+
+TILE_COUNT = len(TILE_CHARS)
+ALL_TILES = (1 << TILE_COUNT) - 1
+
+# Tiles allowed next to each tile (made symmetric by AdjacencyRules)
+DEFAULT_ADJACENCY = {
+    ".": ".~^#RT",  # Dirt borders everything but water
+    "~": "~.^oT#",  # Sand rings the lakes
+    "#": "#R.^",
+    "^": "^.~T#",
+    "o": "o~",  # Water only touches water and sand
+    "T": "T^.",  # Forests grow out of grass and dirt
+    "R": "R#.",  # Rock ridges run through stone and dirt
+}
+
+# Base weight of each tile, and the factor each collapsed neighbour of the
+# same tile multiplies it by. Growth keeps lakes and forests in blobs: a
+# cell walled in by water is almost surely water, a lone spur rarely is
+WFC_WEIGHTS = {".": 20, "~": 6, "#": 4, "^": 20, "o": 3, "T": 8, "R": 4}
+WFC_GROWTH = {".": 2.2, "~": 1.2, "#": 2.2, "^": 2.5, "o": 2, "T": 3, "R": 2.6}
+
+# Biome seeds per map cell. A tile can only appear where all its collapsed
+# neighbours allow it, so lakes, forests and ridges are started from
+# scattered pre-collapsed cells instead of waiting for a sand beach
+WFC_SEEDS = {"o": 0.001, "T": 0.002, "R": 0.001}
+
+
+def popcount_table():
+    return [bin(mask).count("1") for mask in range(ALL_TILES + 1)]
+
+
+POPCOUNT = popcount_table()
+MASK_TILES = [
+    tuple(t for t in range(TILE_COUNT) if mask >> t & 1)
+    for mask in range(ALL_TILES + 1)
+]
+
+
+class AdjacencyRules:
+    """Which tiles may sit next to each other, as bitmask lookup tables"""
+
+    def __init__(self, allowed):
+        # allowed[t] is the bitmask of tiles that may neighbour tile t
+        allowed = list(allowed)
+        for a in range(TILE_COUNT):
+            for b in range(TILE_COUNT):
+                if allowed[a] >> b & 1:
+                    allowed[b] |= 1 << a
+        self.allowed = allowed
+        # Tiles that may appear at all, the starting state of every cell
+        self.tiles = sum(1 << t for t in range(TILE_COUNT) if allowed[t])
+        # Union of the neighbours allowed by any tile in a mask
+        self.support = [0] * (ALL_TILES + 1)
+        for mask in range(1, ALL_TILES + 1):
+            for tile in MASK_TILES[mask]:
+                self.support[mask] |= allowed[tile]
+
+    @classmethod
+    def from_table(cls, table=None):
+        """Rules declared as tile -> string of allowed neighbour tiles"""
+        table = DEFAULT_ADJACENCY if table is None else table
+        allowed = [0] * TILE_COUNT
+        for tile, neighbours in table.items():
+            for neighbour in neighbours:
+                allowed[TILE_CODES[tile]] |= 1 << TILE_CODES[neighbour]
+        return cls(allowed)
+
+    @classmethod
+    def learn(cls, samples):
+        """Rules learned from the neighbouring tile pairs of sample tile arrays"""
+        seen = np.zeros((TILE_COUNT, TILE_COUNT), dtype=bool)
+        for tiles in samples:
+            seen[tiles[:, :-1], tiles[:, 1:]] = True
+            seen[tiles[:-1, :], tiles[1:, :]] = True
+        allowed = [
+            int(sum(1 << b for b in range(TILE_COUNT) if seen[a, b]))
+            for a in range(TILE_COUNT)
+        ]
+        return cls(allowed)
+
+
+def collapse(
+    width, height, rules, rng, weights=None, growth=None, fixed=None, stats=None
+):
+    """Run wave function collapse and return a (height, width) uint8 tile array
+
+    `fixed` maps (x, y) cells to tile codes that are set before the first
+    collapse, in order; an entry the earlier ones already rule out is
+    skipped. Every collapse is propagated to all the cells it narrows, so
+    a cell's options never run out. Should one still be emptied, the cell
+    is left unconstrained and counted in `stats["contradictions"]` when a
+    `stats` dict is passed.
+    """
+    weights = WFC_WEIGHTS if weights is None else weights
+    growth = WFC_GROWTH if growth is None else growth
+    # scores_by_count[t][n]: weight of tile t next to n collapsed tiles t
+    scores_by_count = [
+        [weights[tile] * growth[tile] ** (n * n) for n in range(5)]
+        for tile in TILE_CHARS
+    ]
+    support = rules.support
+    bits = random.Random(int(rng.integers(1 << 32))).getrandbits
+
+    # One cell of padding all around that counts as collapsed, so the
+    # neighbours of a cell never need a bounds check
+    stride = width + 2
+    padded_size = stride * (height + 2)
+    outside = TILE_COUNT
+    result = [outside] * padded_size
+    for y in range(1, height + 1):
+        result[y * stride + 1 : y * stride + 1 + width] = [-1] * width
+    masks = [rules.tiles] * padded_size
+    offsets = (-stride, stride, -1, 1)
+
+    # Heap keys pack (entropy, random tie-break, cell) into one int. Cells
+    # enter the heap once a neighbour narrows them; untouched cells are
+    # picked up in scan order when the heap runs dry
+    heap = []
+    push = heapq.heappush
+    pop = heapq.heappop
+    cell_bits = padded_size.bit_length()
+    cell_mask = (1 << cell_bits) - 1
+    entropy_shift = cell_bits + 16
+    contradictions = 0
+
+    def settle(index, tile):
+        """Fix a cell to a tile and propagate the rules outward"""
+        nonlocal contradictions
+        masks[index] = 1 << tile
+        result[index] = tile
+        stack = [index]
+        while stack:
+            cell = stack.pop()
+            allowed = support[masks[cell]]
+            for offset in offsets:
+                neighbour = cell + offset
+                if result[neighbour] >= 0:
+                    continue
+                mask = masks[neighbour]
+                narrowed = mask & allowed
+                if narrowed == mask:
+                    continue
+                if not narrowed:
+                    contradictions += 1
+                    continue
+                masks[neighbour] = narrowed
+                stack.append(neighbour)
+                push(
+                    heap,
+                    POPCOUNT[narrowed] << entropy_shift
+                    | bits(16) << cell_bits
+                    | neighbour,
+                )
+
+    for (x, y), tile in (fixed or {}).items():
+        index = (y + 1) * stride + x + 1
+        if result[index] < 0 and masks[index] >> tile & 1:
+            settle(index, tile)
+
+    scan = stride + 1
+    while True:
+        if heap:
+            key = pop(heap)
+            index = key & cell_mask
+            if result[index] >= 0 or key >> entropy_shift != POPCOUNT[masks[index]]:
+                continue  # Already collapsed or a stale heap entry
+        else:
+            while scan < padded_size and result[scan] >= 0:
+                scan += 1
+            if scan == padded_size:
+                break
+            index = scan
+
+        candidates = MASK_TILES[masks[index]]
+        if len(candidates) == 1:
+            settle(index, candidates[0])
+            continue
+
+        # Weight each option by how many collapsed neighbours share it
+        near = (
+            result[index - stride],
+            result[index + stride],
+            result[index - 1],
+            result[index + 1],
+        )
+        scores = [scores_by_count[t][near.count(t)] for t in candidates]
+        pick = bits(30) / (1 << 30) * sum(scores)
+        for tile, score in zip(candidates, scores):
+            pick -= score
+            if pick < 0:
+                break
+        settle(index, tile)
+
+    if stats is not None:
+        stats["contradictions"] = contradictions
+    tiles = np.array(result, dtype=np.uint8).reshape(height + 2, stride)
+    return tiles[1:-1, 1:-1]
+
+
+def generate_wfc_tiles(rng, shape, rules=None, spawn=None, seeds=None, stats=None):
+    """Wave-function-collapse terrain with a rock border, like generate_tiles"""
+    height, width = shape
+    rules = AdjacencyRules.from_table() if rules is None else rules
+    seeds = WFC_SEEDS if seeds is None else seeds
+
+    # The border and spawn go first, so biome seeds that clash with them
+    # or with each other are the ones skipped
+    fixed = {}
+    rock = TILE_CODES["R"]
+    for x in range(width):
+        fixed[x, 0] = fixed[x, height - 1] = rock
+    for y in range(height):
+        fixed[0, y] = fixed[width - 1, y] = rock
+    if spawn is not None:
+        fixed[spawn] = TILE_CODES["."]  # Never start the player inside a lake
+    for tile, density in seeds.items():
+        count = int(density * width * height)
+        xs = rng.integers(1, width - 1, count)
+        ys = rng.integers(1, height - 1, count)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            fixed.setdefault((x, y), TILE_CODES[tile])
+    return collapse(width, height, rules, rng, fixed=fixed, stats=stats)
+
+
+def benchmark_wfc(sizes=(64, 128, 256), seed=0):
+    """Seconds to collapse a map of each size"""
+    results = []
+    for size in sizes:
+        rng = np.random.default_rng(seed)
+        start = time.perf_counter()
+        generate_wfc_tiles(rng, (size, size))
+        results.append((size, time.perf_counter() - start))
+    return results
+
+
+def main():
+    """Print the generation benchmark"""
+    for size, seconds in benchmark_wfc():
+        print(f"{size:>4}x{size:<4} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Tests for the precomputed tile animation tables"""
+
+import numpy as np
+
+from first_python_rpg.animation import TILE_ANIMATIONS, TileAnimator, build_cycle
+from first_python_rpg.map import TILE_CODES
+from first_python_rpg.pyxel_enhancements import EnhancedMapPyxel
+
+
+def test_cycle_matches_sine():
+    """A cycle holds one period of the integer sine offsets"""
+    table = build_cycle(0.1, 2)
+    assert len(table) == 63
+    assert table[0] == 0
+    assert table.max() == 2 and table.min() == -2
+    assert len(build_cycle(0.2, 1)) == 31
+
+
+def test_phases_desynchronize_tiles():
+    """Tiles of one class do not all sit at the same offset"""
+    tiles = np.full((20, 20), TILE_CODES["T"], dtype=np.uint8)
+    animator = TileAnimator(tiles, TILE_CODES, tile_size=16, seed=1)
+    offsets = animator.offsets("T", 5)
+    assert len(offsets) == 400
+    assert len(set(offsets.tolist())) > 1
+
+
+def test_only_changed_tiles_are_redrawn():
+    """After the first frame only tiles whose offset moved come back"""
+    tiles = np.full((10, 10), TILE_CODES["o"], dtype=np.uint8)
+    animator = TileAnimator(tiles, TILE_CODES, tile_size=16, seed=2)
+    first = list(animator.changes(0))
+    assert len(first[0][2]) == 100
+    assert list(animator.changes(0)) == []
+    later = list(animator.changes(1))
+    changed = len(later[0][2]) if later else 0
+    assert changed < 100
+
+
+def test_tiny_tiles_stay_still():
+    """Symbols never move outside a tile too small to hold them"""
+    tiles = np.full((4, 4), TILE_CODES["T"], dtype=np.uint8)
+    animator = TileAnimator(tiles, TILE_CODES, tile_size=2, seed=3)
+    for frame in range(70):
+        assert not animator.offsets("T", frame).any()
+
+
+def test_animation_draws_into_layer():
+    """Animated symbols land in the cached layer at their offset"""
+    tiles = np.full((16, 16), TILE_CODES["."], dtype=np.uint8)
+    tiles[0, :] = tiles[-1, :] = tiles[:, 0] = tiles[:, -1] = TILE_CODES["R"]
+    tiles[3:6, 3:6] = TILE_CODES["T"]
+    tiles[9:12, 8:13] = TILE_CODES["o"]
+    map_obj = EnhancedMapPyxel(size=16, tiles=tiles, spawn=(2, 2))
+    map_obj.render_layer()
+    map_obj.animate_layer(0)
+    ts = map_obj.tile_size
+    for tile, spec in TILE_ANIMATIONS.items():
+        ys, xs = np.nonzero(map_obj.tiles == TILE_CODES[tile])
+        assert len(xs) > 0
+        offsets = map_obj.animator.offsets(tile, 0)
+        for x, y, offset in zip(xs.tolist(), ys.tolist(), offsets.tolist()):
+            px = x * ts + ts // 2
+            py = y * ts + ts // 2
+            if spec["axis"] == "x":
+                px += offset
+            else:
+                py += offset
+            assert map_obj.layer.pget(px, py) == spec["color"]
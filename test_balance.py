@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Tests for the Monte Carlo balance simulator"""
+
+import random
+
+import numpy as np
+
+from first_python_rpg.balance import difficulty_rules, event_outcomes, simulate
+from first_python_rpg.engine import GameEngine
+from first_python_rpg.map_data import EVENT_TYPES
+
+
+def test_report_shape():
+    """Survival starts at 100% and never rises; gold never falls on average"""
+    report = simulate("Easy", runs=500, steps=100, workers=1, seed=1, chunk_size=200)
+    assert report.alive[0] == 500
+    assert len(report.survival) == 101
+    assert np.all(np.diff(report.survival) <= 0)
+    assert np.all(np.diff(report.mean_gold) >= 0)
+    assert sum(report.death_causes.values()) == 500 - report.alive[-1]
+    assert "Easy" in report.summary()
+
+
+def test_disabled_features_are_harmless():
+    """With no events or encounters every run survives without gold"""
+    report = simulate(
+        "Hard",
+        runs=100,
+        steps=50,
+        workers=1,
+        seed=2,
+        random_events=False,
+        enemy_encounters=False,
+    )
+    assert report.alive[-1] == 100
+    assert report.gold[-1] == 0
+    assert report.death_causes == {}
+
+
+def test_hard_is_deadlier():
+    """Hard scales enemy damage up and so kills runs sooner"""
+    easy = simulate("Easy", runs=2000, steps=100, workers=1, seed=3)
+    hard = simulate("Hard", runs=2000, steps=100, workers=1, seed=3)
+    assert hard.median_lifetime() < easy.median_lifetime()
+
+
+def test_process_pool_matches_serial():
+    """Chunks are seeded independently, so the pool gives identical results"""
+    serial = simulate("Easy", runs=600, steps=60, workers=1, seed=4, chunk_size=200)
+    pooled = simulate("Easy", runs=600, steps=60, workers=2, seed=4, chunk_size=200)
+    assert np.array_equal(serial.alive, pooled.alive)
+    assert np.array_equal(serial.gold, pooled.gold)
+    assert serial.death_causes == pooled.death_causes
+
+
+def test_event_outcomes_follow_the_events():
+    """Outcomes come from the event effects, so edits to them carry over"""
+    outcomes = event_outcomes()
+    assert set(outcomes) == {event["name"] for event in EVENT_TYPES}
+    assert outcomes["Wandering Merchant"] == (0, 0)
+    trap = EVENT_TYPES[1]
+    EVENT_TYPES[1] = dict(trap, effect=lambda p: p.take_damage(7))
+    try:
+        assert event_outcomes()[trap["name"]] == (-7, 0)
+    finally:
+        EVENT_TYPES[1] = trap
+
+
+def test_engine_scales_encounter_damage_like_the_simulator():
+    """Hard encounters hit for randint(1, strength) * 1.5, rounded"""
+    random.seed(4)
+    engine = GameEngine()
+    engine.features["enemy_encounters"] = True
+    engine.features["difficulty_levels"] = True
+    engine.step({"confirm"})
+    assert engine.player.difficulty == "Hard"
+    hits = set()
+    for tick in range(4000):
+        engine.player.health = engine.player.max_health
+        health = engine.player.health
+        engine.step({"left" if tick % 4 < 2 else "right"})
+        if engine.player.health < health:
+            hits.add(health - engine.player.health)
+    # Strengths 1-4 scale to 2, 3, 4 (4.5 rounds to even) and 6
+    assert len(hits) > 1 and hits <= {2, 3, 4, 6}
+    assert difficulty_rules("Hard")["damage_scale"] == 1.5
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Tests for the chunked, streamed overworld"""
+
+import random
+
+import numpy as np
+
+from first_python_rpg.chunks import ChunkManager, ChunkedMapPyxel, ring_tiles
+from first_python_rpg.engine import GameEngine
+from first_python_rpg.map import TILE_COLOR_TABLE
+from first_python_rpg.map_data import MAP_SIZE
+from first_python_rpg.player import Player
+
+
+def test_chunks_are_deterministic():
+    """The same seed and chunk coordinates give the same terrain"""
+    first = ChunkManager(seed=42, chunk_size=16)
+    second = ChunkManager(seed=42, chunk_size=16)
+    for cx, cy in [(0, 0), (-3, 7), (1000, -1000)]:
+        assert np.array_equal(
+            first.get_chunk(cx, cy).tiles, second.get_chunk(cx, cy).tiles
+        )
+    assert not np.array_equal(first.get_chunk(0, 0).tiles, first.get_chunk(1, 0).tiles)
+
+
+def test_lru_eviction_bounds_working_set():
+    """Only max_chunks chunks stay resident, oldest evicted first"""
+    manager = ChunkManager(seed=7, chunk_size=8, max_chunks=4)
+    original = manager.get_chunk(0, 0).tiles.copy()
+    for cx in range(1, 4):
+        manager.get_chunk(cx, 0)
+    manager.get_chunk(0, 0)  # Touch so (1, 0) becomes the oldest
+    manager.get_chunk(9, 9)
+    assert len(manager.chunks) == 4
+    assert (0, 0) in manager.chunks
+    assert (1, 0) not in manager.chunks
+    assert manager.evicted == 1
+
+    # Evicted chunks regenerate identically
+    for cx in range(10, 20):
+        manager.get_chunk(cx, 0)
+    assert np.array_equal(manager.get_chunk(0, 0).tiles, original)
+
+
+def test_world_coordinates_cross_chunks():
+    """World tile lookups agree with the owning chunk, including negatives"""
+    manager = ChunkManager(seed=3, chunk_size=8)
+    assert manager.tile_code(-1, -1) == manager.get_chunk(-1, -1).tiles[7, 7]
+    assert manager.tile_code(8, 0) == manager.get_chunk(1, 0).tiles[0, 0]
+
+
+def test_player_walks_without_wrapping():
+    """A player can walk far past MAP_SIZE on a chunked map"""
+    world = ChunkedMapPyxel(seed=1, chunk_size=16, max_chunks=9)
+    player = Player()
+    player.x, player.y = world.find_spawn()
+    world.follow(player.x, player.y)
+    # Depth-first walk that prefers heading east and backtracks when stuck
+    path = [(player.x, player.y)]
+    visited = set(path)
+    for _ in range(5000):
+        if player.x >= 2 * MAP_SIZE:
+            break
+        for dx, dy in [(1, 0), (0, 1), (0, -1), (-1, 0)]:
+            tile = (player.x + dx, player.y + dy)
+            if tile not in visited and world.is_walkable(*tile):
+                world.move_player(player, dx, dy)
+                visited.add(tile)
+                path.append(tile)
+                break
+        else:
+            path.pop()
+            x, y = path[-1]
+            world.move_player(player, x - player.x, y - player.y)
+        assert (player.x, player.y) == path[-1]
+    assert player.x >= MAP_SIZE
+    assert world.is_walkable(player.x, player.y)
+    assert len(world.chunks.chunks) <= 9
+
+
+def test_player_move_without_wrap():
+    """Player.move only wraps when asked to"""
+    player = Player()
+    player.x, player.y = 0, 0
+    player.move(-1, 0, wrap=False)
+    assert player.x == -1
+
+
+def test_view_reads_each_chunk_once():
+    """The view is stitched from whole chunks and matches per-tile lookups"""
+    world = ChunkedMapPyxel(seed=4, view_size=40, chunk_size=16, max_chunks=16)
+    world.follow(-23, 37)
+    origin_x, origin_y = world.view_origin()
+    view = world.view_tiles()
+    assert view.shape == (40, 40)
+    for vy in range(0, 40, 3):
+        for vx in range(0, 40, 3):
+            code = world.chunks.tile_code(origin_x + vx, origin_y + vy)
+            assert view[vy, vx] == code
+
+
+def test_spawn_rings_cover_only_their_perimeter():
+    """Each ring lists its perimeter tiles once"""
+    for radius in range(4):
+        tiles = list(ring_tiles(2, -1, radius))
+        assert len(tiles) == len(set(tiles)) == max(1, 8 * radius)
+        assert all(max(abs(x - 2), abs(y + 1)) == radius for x, y in tiles)
+
+
+def test_engine_plays_on_a_chunked_world():
+    """The engine option streams the world and draws the player mid-view"""
+    random.seed(3)
+    engine = GameEngine(chunked_world=True)
+    engine.start_game()
+    engine.state = "playing"
+    assert isinstance(engine.map, ChunkedMapPyxel)
+    center = engine.player_screen_pos()
+    for _ in range(200):
+        engine.move_player(1, 0)
+        engine.move_player(0, random.choice([-1, 1]))
+        assert engine.player_screen_pos() == center
+    assert engine.map.is_walkable(engine.player.x, engine.player.y)
+    assert (engine.map.focus_x, engine.map.focus_y) == (
+        engine.player.x,
+        engine.player.y,
+    )
+
+
+def test_view_layer_renders_only_after_moving():
+    """The cached view layer matches the tile colors and follows the focus"""
+    world = ChunkedMapPyxel(seed=2, chunk_size=16, max_chunks=9)
+    world.render_layer()
+    layer = world.layer
+    ts = world.tile_size
+    colors = TILE_COLOR_TABLE[world.view_tiles()]
+    for vy in range(world.size):
+        for vx in range(world.size):
+            assert layer.pget(vx * ts, vy * ts) == colors[vy, vx]
+    assert world.layer_origin == world.view_origin()
+    world.follow(5, 0)
+    assert world.layer_origin != world.view_origin()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Tests for the fixed-timestep simulation clock"""
+
+from first_python_rpg.clock import SimulationClock
+
+
+class FakeTime:
+    """Manually advanced time source"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_steady_frames_run_one_tick():
+    """At the tick rate every frame runs exactly one tick"""
+    now = FakeTime()
+    clock = SimulationClock(tick_rate=60, time_source=now)
+    ticks = []
+    for _ in range(120):
+        ticks.append(clock.advance())
+        now.now += 1 / 60
+    assert ticks == [1] * 120
+    assert clock.ticks == 120
+
+
+def test_slow_frames_catch_up():
+    """Rendering at 20 fps still simulates 60 ticks per second"""
+    now = FakeTime()
+    clock = SimulationClock(tick_rate=60, time_source=now)
+    clock.advance()
+    total = 0
+    for _ in range(20):
+        now.now += 1 / 20
+        total += clock.advance()
+    assert total == 60
+    assert not clock.behind
+
+
+def test_fast_frames_accumulate():
+    """Frames shorter than a tick carry their time over"""
+    now = FakeTime()
+    clock = SimulationClock(tick_rate=60, time_source=now)
+    clock.advance()
+    ticks = []
+    for _ in range(4):
+        now.now += 1 / 120
+        ticks.append(clock.advance())
+    assert ticks == [0, 1, 0, 1]
+    assert 0.0 <= clock.alpha < 1.0
+
+
+def test_catch_up_is_capped():
+    """A long stall runs at most max_ticks and drops the rest"""
+    now = FakeTime()
+    clock = SimulationClock(tick_rate=60, max_ticks=5, time_source=now)
+    clock.advance()
+    now.now += 2.0
+    assert clock.advance() == 5
+    assert clock.behind
+    assert abs(clock.dropped_seconds - 115 / 60) < 1e-9
+    now.now += 1 / 60
+    assert clock.advance() == 1
+    assert not clock.behind
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Tests for the turn-based boss combat scheduler"""
+
+import random
+
+from first_python_rpg.boss import boss_battle
+from first_python_rpg.combat import (
+    ABILITY_COOLDOWN,
+    BOSS_TURN_DELAY,
+    SPELL_COST,
+    BossCombat,
+)
+from first_python_rpg.engine import GameEngine
+from first_python_rpg.player import Player
+
+
+def test_idle_ticks_change_nothing():
+    """Without input the fight waits on the player's turn"""
+    player = Player()
+    combat = BossCombat(player, 2, 2, 30)
+    message, health, mana = combat.message, player.health, player.mana
+    for _ in range(600):
+        assert combat.update() == []
+    assert (player.health, player.mana, combat.boss_health) == (health, mana, 30)
+    assert combat.message == message and combat.player_turn
+
+
+def test_boss_replies_after_its_timer():
+    """An attack queues one boss turn; input before it comes due is ignored"""
+    random.seed(1)
+    player = Player()
+    combat = BossCombat(player, 2, 2, 30)
+    events = combat.update({"attack"})
+    assert [event.kind for event in events] == ["attack"]
+    assert combat.boss_health == 30 - events[0].data["damage"]
+    health = player.health
+    for _ in range(BOSS_TURN_DELAY - 1):
+        assert combat.update({"attack"}) == []
+    assert player.health == health
+    events = combat.update()
+    assert [event.kind for event in events] == ["boss_attack"]
+    assert player.health == health - events[0].data["damage"]
+    assert combat.message == "Boss hits you for %d!" % events[0].data["damage"]
+    assert combat.player_turn
+
+
+def test_abilities_and_mana_follow_turns():
+    """Abilities come every few boss turns and a failed spell keeps the turn"""
+    random.seed(2)
+    player = Player()
+    player.health = player.max_health = 10000
+    combat = BossCombat(player, 0, 0, 10000)
+    player.mana = SPELL_COST - 1
+    assert [event.kind for event in combat.update({"spell"})] == ["no_mana"]
+    assert combat.player_turn and player.mana == SPELL_COST - 1
+    kinds = []
+    for _ in range(2 * ABILITY_COOLDOWN):
+        combat.update({"attack"})
+        for _ in range(BOSS_TURN_DELAY):
+            kinds += [event.kind for event in combat.update()]
+    assert kinds.count("lash") == 2 and kinds.count("boss_attack") == 6
+    assert player.mana == player.max_mana
+
+
+def test_battle_outcomes_drive_the_engine():
+    """Victory returns to the map and reports the boss; flight does too"""
+    random.seed(3)
+    engine = GameEngine()
+    engine.step({"confirm"})
+    defeated = []
+    engine.events.subscribe("enemy_defeated", lambda name: defeated.append(name))
+    boss_battle(engine, engine.player, 2, 1, 5)
+    assert engine.state == "boss_battle"
+    for _ in range(BOSS_TURN_DELAY * 4):
+        engine.step({"attack"})
+        if engine.state != "boss_battle":
+            break
+    assert engine.state == "playing" and engine.combat.outcome == "victory"
+    assert defeated == ["Shadow Golem"] and engine.player.bosses_defeated == 1
+
+    boss_battle(engine, engine.player, 3, 1, 50)
+    engine.step({"menu"})
+    assert engine.state == "playing" and engine.combat.outcome == "fled"
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Tests for connected-component labeling and spawn reachability"""
+
+import time
+
+import numpy as np
+
+from first_python_rpg.connectivity import (
+    label_components,
+    reachable_fraction,
+    repair_mask,
+)
+from first_python_rpg.map import MapPyxel
+
+
+def test_labels_separate_regions():
+    """Regions split by a wall get different labels and exact sizes"""
+    walkable = np.ones((5, 7), dtype=bool)
+    walkable[:, 3] = False
+    walkable[0, 0] = walkable[1, 1] = False  # Diagonal gaps do not split
+    labels, sizes = label_components(walkable)
+    assert labels[0, 3] == 0
+    assert labels[4, 0] != labels[4, 6]
+    assert labels[0, 1] == labels[1, 0]
+    assert sorted(sizes[1:].tolist()) == [13, 15]
+
+
+def test_serpentine_corridor_is_one_region():
+    """A long winding corridor is labeled as a single component"""
+    size = 101
+    walkable = np.zeros((size, size), dtype=bool)
+    walkable[::2] = True
+    for row in range(1, size, 2):
+        walkable[row, size - 1 if row % 4 == 1 else 0] = True
+    labels, sizes = label_components(walkable)
+    assert len(sizes) == 2
+    assert sizes[1] == walkable.sum()
+
+
+def test_repair_connects_spawn():
+    """Repair opens tiles until the spawn reaches the requested share"""
+    walkable = np.zeros((9, 9), dtype=bool)
+    walkable[1:4, 1:4] = True
+    walkable[5:8, 5:8] = True
+    walkable[1, 7] = True
+    assert reachable_fraction(walkable, (2, 2)) < 0.5
+
+    opened = repair_mask(walkable, (2, 2), 1.0)
+    repaired = walkable | opened
+    assert reachable_fraction(repaired, (2, 2)) == 1.0
+    assert not opened[0, :].any() and not opened[:, 0].any()
+
+
+def test_generated_maps_reach_spawn_coverage():
+    """Every generated map lets the spawn reach the configured share"""
+    for seed in range(20):
+        map_obj = MapPyxel(size=24, seed=seed)
+        assert map_obj.is_walkable(*map_obj.spawn)
+        assert map_obj.reachable_fraction() >= MapPyxel.spawn_coverage
+        sizes = map_obj.component_sizes()
+        assert sizes[0] >= sizes[-1]
+        assert sizes.sum() == map_obj.walkable.sum()
+
+
+def test_reachability_cache_follows_edits():
+    """Walling off a tile updates is_reachable"""
+    map_obj = MapPyxel(size=8, seed=3)
+    for y in range(1, 7):
+        for x in range(1, 7):
+            map_obj.set_tile(x, y, ".")
+    assert map_obj.is_reachable((1, 1), (6, 6))
+    for y in range(1, 7):
+        map_obj.set_tile(4, y, "o")
+    assert not map_obj.is_reachable((1, 1), (6, 6))
+    assert map_obj.component_sizes().tolist() == [18, 12]
+
+
+def test_large_map_labeling():
+    """A 1024x1024 mask is labeled in well under a second"""
+    walkable = MapPyxel(size=1024, seed=7).walkable
+    start = time.perf_counter()
+    labels, sizes = label_components(walkable)
+    elapsed = time.perf_counter() - start
+    print(f"✓ 1024x1024 labeled into {len(sizes) - 1} regions in {elapsed:.3f}s")
+    assert sizes.sum() == walkable.sum()
+    assert elapsed < 2.0
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Tests for the BSP and cellular-automata dungeon generators"""
+
+import numpy as np
+import pytest
+
+from first_python_rpg.dungeon import (
+    FLOOR,
+    WALL,
+    benchmark_dungeons,
+    generate_bsp,
+    generate_caves,
+)
+from first_python_rpg.connectivity import label_components
+from first_python_rpg.pyxel_enhancements import ProceduralDungeonGenerator
+
+
+def test_bsp_rooms_stay_in_bounds_and_apart():
+    """Rooms fit inside the border and never overlap"""
+    for seed in range(20):
+        tiles, rooms = generate_bsp(64, np.random.default_rng(seed))
+        assert tiles.dtype == np.uint8
+        occupied = np.zeros_like(tiles, dtype=bool)
+        for x, y, w, h in rooms:
+            assert x >= 1 and y >= 1 and x + w <= 63 and y + h <= 63
+            assert not occupied[y : y + h, x : x + w].any()
+            occupied[y : y + h, x : x + w] = True
+        assert len(rooms) > 10
+
+
+def test_dungeons_are_fully_connected():
+    """Every floor tile is reachable in both modes, walls close the edge"""
+    generators = (
+        lambda rng: generate_bsp(48, rng)[0],
+        lambda rng: generate_caves(48, rng),
+    )
+    for generate in generators:
+        for seed in range(10):
+            tiles = generate(np.random.default_rng(seed))
+            floor = tiles == FLOOR
+            _, sizes = label_components(floor)
+            assert len(sizes) == 2
+            assert (tiles[0, :] == WALL).all() and (tiles[:, -1] == WALL).all()
+
+
+def test_small_dungeon_has_several_rooms():
+    """Even the default 11x11 dungeon gets more than one room"""
+    generator = ProceduralDungeonGenerator(size=11, seed=5)
+    dungeon = generator.generate_dungeon()
+    assert len(dungeon) == 11 and len(dungeon[0]) == 11
+    assert sum(row.count(".") for row in dungeon) > 20
+    assert len(generator.rooms) >= 2
+
+
+def test_dungeon_plugs_into_map():
+    """Generated tiles load into a MapPyxel with a walkable spawn"""
+    for mode in ("bsp", "caves"):
+        generator = ProceduralDungeonGenerator(size=32, mode=mode, seed=9)
+        dungeon_map = generator.generate_map()
+        assert dungeon_map.size == 32
+        assert dungeon_map.is_walkable(*dungeon_map.spawn)
+        assert dungeon_map.reachable_fraction() == 1.0
+
+
+def test_generation_benchmark():
+    """Generation time at 64 and 256 tiles square; the CLI also runs 1024"""
+    for mode, size, seconds in benchmark_dungeons(sizes=(64, 256)):
+        print(f"✓ {mode} {size}x{size}: {seconds * 1000:.1f} ms")
+        assert seconds < 5.0
+
+
+def test_cave_spawn_is_in_the_largest_region():
+    """Cave spawns sit in the biggest region, not on the first floor tile"""
+    firsts = []
+    for seed in range(20):
+        generator = ProceduralDungeonGenerator(size=24, mode="caves", seed=seed)
+        tiles = generator.generate_tiles()
+        labels, sizes = label_components(tiles == FLOOR)
+        x, y = generator.spawn
+        assert labels[y, x] == sizes.argmax()
+        ys, xs = np.nonzero(tiles == FLOOR)
+        firsts.append((int(xs[0]), int(ys[0])) == generator.spawn)
+    assert not all(firsts)
+
+
+def test_solid_caves_are_retried_then_raise():
+    """A cave without floor is redrawn; one too small for any floor raises"""
+    # Seed 3 draws a solid 7x7 cave first
+    assert not (generate_caves(7, np.random.default_rng(3)) == FLOOR).any()
+    generator = ProceduralDungeonGenerator(size=7, mode="caves", seed=3)
+    tiles = generator.generate_tiles()
+    x, y = generator.spawn
+    assert tiles[y, x] == FLOOR
+
+    generator = ProceduralDungeonGenerator(size=3, mode="caves", seed=1)
+    with pytest.raises(ValueError):
+        generator.generate_tiles()
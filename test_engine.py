@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Tests for the headless game engine"""
+
+import random
+import time
+
+from first_python_rpg.benchmark import benchmark_features, feature_costs, main
+from first_python_rpg.engine import ACTIONS, GameEngine
+
+
+def start_engine(*features):
+    """Create an engine, switch on the given features and start playing"""
+    engine = GameEngine()
+    for feature in features:
+        engine.features[feature] = True
+    engine.step({"confirm"})
+    return engine
+
+
+def test_menu_runs_on_actions():
+    """The feature menu is driven by abstract actions"""
+    engine = GameEngine()
+    engine.step({"down"})
+    engine.step({"toggle"})
+    assert engine.features["difficulty_levels"]
+    engine.step({"confirm"})
+    assert engine.state == "playing"
+    assert engine.player.difficulty == "Hard"
+
+
+def test_pause_and_resume():
+    """Escape pauses and resumes, Q from pause returns to the menu"""
+    engine = start_engine()
+    engine.step({"back"})
+    assert engine.state == "paused"
+    engine.step({"back"})
+    assert engine.state == "playing"
+    engine.step({"back"})
+    engine.step({"menu"})
+    assert engine.state == "feature_select"
+
+
+def test_soak_without_a_window():
+    """Thousands of random ticks run headless with every feature on"""
+    random.seed(1)
+    engine = start_engine(
+        "random_events",
+        "enemy_encounters",
+        "dynamic_quests",
+        "weather_system",
+        "particle_effects",
+    )
+    moves = ["up", "down", "left", "right"]
+    first_frame = engine.frame
+    start = time.perf_counter()
+    for tick in range(5000):
+        if engine.state == "gameover":
+            engine.step({"toggle"})
+            engine.step({"confirm"})
+        engine.step({random.choice(moves)} if tick % 2 else ())
+    elapsed = time.perf_counter() - start
+    print(f"✓ 5000 ticks in {elapsed:.2f}s ({5000 / elapsed:.0f} ticks/s)")
+    assert set(moves) <= set(ACTIONS)
+    assert engine.frame - first_frame >= 5000
+    assert engine.state in ("playing", "gameover")
+
+
+def test_pipelines_follow_the_features():
+    """Only enabled features get an update system, in a fixed order"""
+    engine = start_engine()
+    assert engine.update_systems == []
+    engine = start_engine("particle_effects", "weather_system")
+    stages = [stage for stage, _ in engine.update_systems]
+    assert stages == ["particles_update", "weather_update"]
+
+
+def test_feature_benchmark_covers_every_combination():
+    """The benchmark times all 128 combinations of the seven flags"""
+    results = benchmark_features(ticks=5)
+    assert len(results) == 2**7
+    assert len({enabled for enabled, _ in results}) == 2**7
+    assert all(micros > 0 for _, micros in results)
+    assert set(feature_costs(results)) == set(GameEngine().features)
+
+
+def test_benchmark_states_what_it_times(capsys):
+    """The headless run says that drawing is left out"""
+    main(["--ticks", "2"])
+    assert "update systems only" in capsys.readouterr().out
@@ -82,11 +82,10 @@ def test_weather_system():
         # Test time of day
         assert 0 <= enhanced_map.time_of_day < 1440, "Time of day should be 0-1439"
 
-        # Test color modifiers
-        weather_mod = enhanced_map.get_weather_color_modifier()
-        time_mod = enhanced_map.get_time_color_modifier()
-        assert weather_mod >= 0, "Weather modifier should be non-negative"
-        assert time_mod >= 0, "Time modifier should be non-negative"
+        # Test the palette remap for the current weather and hour
+        palette = enhanced_map.palette_table()
+        assert len(palette) == 16, "Palette table should cover all 16 colors"
+        assert all(0 <= color < 16 for color in palette), "Invalid palette color"
 
         print("✓ Weather system tests passed")
         return True
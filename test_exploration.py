@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Tests for bitset exploration tracking and the Explorer achievement"""
+
+import numpy as np
+
+from first_python_rpg.engine import GameEngine
+from first_python_rpg.exploration import ExplorationMap, revealable_mask
+from first_python_rpg.map import MapPyxel
+from first_python_rpg.player import Player
+
+
+def test_reveal_counts_new_tiles_once():
+    """Revealing overlapping squares only counts each tile once"""
+    explored = ExplorationMap(10, 10)
+    assert explored.reveal(5, 5) == 9
+    assert explored.reveal(6, 5) == 3
+    assert explored.reveal(6, 5) == 0
+    assert explored.reveal(0, 0) == 4  # Clipped at the corner
+    assert len(explored) == 16
+    assert (5, 5) in explored and (9, 9) not in explored
+    assert not explored.complete
+
+
+def test_complete_when_goal_revealed():
+    """Completion only needs the goal tiles"""
+    goal = np.zeros((6, 6), dtype=bool)
+    goal[2:4, 2:4] = True
+    explored = ExplorationMap(6, 6, goal)
+    explored.reveal(0, 0)
+    assert explored.progress == 0.0
+    explored.reveal(1, 1)
+    assert explored.progress == 0.25
+    explored.reveal(3, 3)
+    assert explored.complete
+
+
+def test_revealable_mask_grows_by_radius():
+    """The goal covers the reachable tiles and what can be seen from them"""
+    reachable = np.zeros((7, 7), dtype=bool)
+    reachable[3, 3] = True
+    assert revealable_mask(reachable, 1).sum() == 9
+    assert revealable_mask(reachable, 2).sum() == 25
+
+
+def test_player_starts_with_empty_exploration():
+    """The player keeps a bitset, not a set of tuples"""
+    player = Player()
+    assert len(player.explored) == 0
+    assert isinstance(player.explored, ExplorationMap)
+
+
+def test_explorer_achievement():
+    """Walking every reachable tile unlocks Explorer"""
+    engine = GameEngine()
+    engine.step({"confirm"})
+    engine.map = MapPyxel(size=11, seed=1)
+    for y in range(1, 10):
+        for x in range(1, 10):
+            engine.map.set_tile(x, y, ".")
+    engine.player.explored = ExplorationMap.for_map(engine.map)
+    engine.player.x, engine.player.y = 1, 1
+    engine.player.explored.reveal(1, 1)
+
+    # Sweep the open area row by row
+    for row in range(1, 10):
+        step = 1 if row % 2 else -1
+        for _ in range(8):
+            engine.move_player(step, 0)
+        if row < 9:
+            engine.move_player(0, 1)
+    assert engine.player.explored.complete
+    assert "Explorer" in engine.player.achievements
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Tests for the cached, pre-rendered map layer"""
+
+from first_python_rpg.map import MapPyxel, TILE_COLORS
+from first_python_rpg.pyxel_enhancements import EnhancedMapPyxel
+
+
+def tile_pixel(map_obj, x, y):
+    """Color of a tile's top-left pixel in the cached layer"""
+    return map_obj.layer.pget(x * map_obj.tile_size, y * map_obj.tile_size)
+
+
+def test_layer_matches_tiles():
+    """The pre-rendered layer holds each tile's base color"""
+    map_obj = MapPyxel(size=16)
+    map_obj.render_layer()
+    assert map_obj.layer.width == 16 * map_obj.tile_size
+    for y in range(map_obj.size):
+        for x in range(map_obj.size):
+            assert tile_pixel(map_obj, x, y) == TILE_COLORS[map_obj.tile_at(x, y)]
+
+
+def test_only_dirty_tiles_are_rerendered():
+    """Changing a tile marks it dirty and re-renders just that tile"""
+    map_obj = MapPyxel(size=16)
+    map_obj.render_layer()
+    assert not map_obj.dirty_tiles
+
+    map_obj.set_tile(5, 6, "^")
+    assert map_obj.dirty_tiles == {(5, 6)}
+    map_obj.render_dirty_tiles()
+    assert not map_obj.dirty_tiles
+    assert tile_pixel(map_obj, 5, 6) == TILE_COLORS["^"]
+
+
+def test_enhanced_layer_is_untinted():
+    """The enhanced map tints through the palette, not the cached layer"""
+    map_obj = EnhancedMapPyxel()
+    map_obj.weather = "fog"
+    map_obj.render_layer()
+    assert tile_pixel(map_obj, 3, 3) == TILE_COLORS[map_obj.tile_at(3, 3)]
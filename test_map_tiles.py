@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Tests for the integer tile grid behind MapPyxel"""
+
+import time
+
+import numpy as np
+
+from first_python_rpg.map import (
+    MapPyxel,
+    TILE_CHARS,
+    TILE_CODES,
+    WALKABLE,
+    BLOCKING_TILES,
+)
+
+
+def test_tiles_are_compact_codes():
+    """Tiles are stored as a uint8 array of valid codes"""
+    map_obj = MapPyxel(size=32)
+    assert map_obj.tiles.dtype == np.uint8
+    assert map_obj.tiles.shape == (32, 32)
+    assert map_obj.tiles.max() < len(TILE_CHARS)
+
+
+def test_rock_border():
+    """The border slice is always rock"""
+    map_obj = MapPyxel(size=16)
+    rock = TILE_CODES["R"]
+    assert (map_obj.tiles[0, :] == rock).all()
+    assert (map_obj.tiles[-1, :] == rock).all()
+    assert (map_obj.tiles[:, 0] == rock).all()
+    assert (map_obj.tiles[:, -1] == rock).all()
+
+
+def test_walkable_mask_matches_tiles():
+    """The walkability mask agrees with the blocking tile list"""
+    map_obj = MapPyxel(size=24)
+    for y in range(map_obj.size):
+        for x in range(map_obj.size):
+            expected = map_obj.tile_at(x, y) not in BLOCKING_TILES
+            assert map_obj.is_walkable(x, y) == expected
+    assert not map_obj.is_walkable(-1, 0)
+    assert not map_obj.is_walkable(0, map_obj.size)
+
+
+def test_seed_is_deterministic():
+    """The same seed produces the same terrain"""
+    first = MapPyxel(size=20, seed=1234)
+    second = MapPyxel(size=20, seed=1234)
+    assert np.array_equal(first.tiles, second.tiles)
+
+
+def test_set_tile_updates_walkability():
+    """Changing a tile keeps the mask in sync"""
+    map_obj = MapPyxel(size=8)
+    map_obj.set_tile(3, 3, ".")
+    assert map_obj.is_walkable(3, 3)
+    map_obj.set_tile(3, 3, "o")
+    assert not map_obj.is_walkable(3, 3)
+    assert map_obj.grid[3][3] == "o"
+    assert WALKABLE[TILE_CODES["."]]
+
+
+def test_large_map_generation():
+    """A 1024x1024 map generates quickly"""
+    start = time.perf_counter()
+    map_obj = MapPyxel(size=1024)
+    elapsed = time.perf_counter() - start
+    print(f"✓ 1024x1024 map generated in {elapsed * 1000:.1f} ms")
+    assert map_obj.walkable.shape == (1024, 1024)
+    assert elapsed < 2.0
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Tests for the weather and time-of-day palette tables"""
+
+import pyxel
+
+from first_python_rpg.palettes import (
+    HOUR_BUCKETS,
+    PALETTE_TABLES,
+    apply_palette,
+    time_bucket,
+)
+from first_python_rpg.pyxel_enhancements import EnhancedMapPyxel
+
+
+def test_tables_cover_every_combination():
+    """Every (weather, bucket) pair has a full 16-color table"""
+    assert len(HOUR_BUCKETS) == 24
+    assert len(PALETTE_TABLES) == 16
+    for table in PALETTE_TABLES.values():
+        assert len(table) == 16
+        assert all(0 <= color < 16 for color in table)
+    assert PALETTE_TABLES[("clear", "day")] == tuple(range(16))
+
+
+def test_dusk_blends_into_night():
+    """Dusk passes through intermediate tables on its way to night"""
+    hours = [time_bucket(hour * 60) for hour in range(17, 23)]
+    assert hours == ["day", "golden", "golden", "twilight", "night", "night"]
+    grass = 3
+    day, golden, twilight, night = (
+        PALETTE_TABLES[("clear", bucket)][grass]
+        for bucket in ("day", "golden", "twilight", "night")
+    )
+    assert len({day, golden, twilight, night}) == 4
+
+
+def test_map_picks_table_for_weather_and_hour():
+    """The enhanced map looks up the table for its weather and time"""
+    map_obj = EnhancedMapPyxel()
+    map_obj.weather = "rain"
+    map_obj.time_of_day = 23 * 60
+    assert map_obj.palette_table() == PALETTE_TABLES[("rain", "night")]
+
+
+def test_palette_remaps_blits():
+    """Applying a table recolors a blitted layer without touching it"""
+    layer = pyxel.Image(4, 4)
+    layer.cls(3)
+    screen = pyxel.Image(4, 4)
+    table = PALETTE_TABLES[("clear", "night")]
+    apply_palette(screen, table)
+    screen.blt(0, 0, layer, 0, 0, 4, 4)
+    assert screen.pget(1, 1) == table[3]
+    assert layer.pget(1, 1) == 3
+    screen.pal()
+    screen.blt(0, 0, layer, 0, 0, 4, 4)
+    assert screen.pget(1, 1) == 3
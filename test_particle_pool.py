@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Tests for the struct-of-arrays particle pool"""
+
+from first_python_rpg.pyxel_enhancements import ParticleSystem
+
+
+def test_dead_particles_are_compacted():
+    """Dead particles are swap-removed and survivors keep their state"""
+    system = ParticleSystem()
+    for i in range(10):
+        # Even particles die after one update, odd ones live longer
+        system.add_particle(i, 0, 1, 0, i, 1 if i % 2 == 0 else 5)
+    system.update()
+    assert system.count == 5
+    survivors = sorted(p["color"] for p in system.particles)
+    assert survivors == [1, 3, 5, 7, 9]
+    for particle in system.particles:
+        assert particle["x"] == particle["color"] + 1
+        assert particle["lifetime"] == 4
+
+
+def test_pool_capacity_is_fixed():
+    """Particles past capacity are dropped"""
+    system = ParticleSystem(capacity=16)
+    for _ in range(3):
+        system.create_spell_effect(50, 50, "ice")
+    assert system.count == 16
+
+
+def test_heavy_load_drains():
+    """Thousands of particles update and expire together"""
+    system = ParticleSystem()
+    for _ in range(400):
+        system.create_spell_effect(128, 128, "fireball")
+    assert system.count == 3200
+    for _ in range(20):
+        system.update()
+    assert system.count == 0
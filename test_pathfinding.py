@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Tests for A* paths and cached distance fields"""
+
+from first_python_rpg.map import MapPyxel
+from first_python_rpg.pathfinding import UNREACHABLE, Pathfinder
+
+
+def open_map(size=12):
+    """A map of grass surrounded by the usual rock border"""
+    map_obj = MapPyxel(size=size, seed=1)
+    for y in range(1, size - 1):
+        for x in range(1, size - 1):
+            map_obj.set_tile(x, y, "^")
+    return map_obj
+
+
+def test_astar_goes_around_walls():
+    """A* finds a shortest path that steps around a wall"""
+    map_obj = open_map()
+    for y in range(1, 10):
+        map_obj.set_tile(5, y, "#")
+    pathfinder = Pathfinder(map_obj)
+
+    path = pathfinder.find_path((2, 2), (8, 2))
+    assert path[0] == (2, 2) and path[-1] == (8, 2)
+    assert all(map_obj.is_walkable(x, y) for x, y in path)
+    for (x1, y1), (x2, y2) in zip(path, path[1:]):
+        assert abs(x1 - x2) + abs(y1 - y2) == 1
+    assert len(path) - 1 == pathfinder.distance((2, 2), (8, 2)) == 22
+
+    assert pathfinder.find_path((2, 2), (0, 0)) is None  # Goal is rock
+
+
+def test_distance_field_is_cached_until_walkability_changes():
+    """Fields are shared per target and dropped only on walkability edits"""
+    map_obj = open_map()
+    pathfinder = Pathfinder(map_obj)
+    field = pathfinder.distance_field((6, 6))
+    assert field[6, 6] == 0
+    assert field[6, 8] == 2
+    assert field[0, 0] == UNREACHABLE
+    assert pathfinder.distance_field((6, 6)) is field
+
+    map_obj.set_tile(3, 3, "~")  # Still walkable
+    assert pathfinder.distance_field((6, 6)) is field
+
+    map_obj.set_tile(3, 3, "T")
+    new_field = pathfinder.distance_field((6, 6))
+    assert new_field is not field
+    assert new_field[3, 3] == UNREACHABLE
+
+
+def test_next_step_follows_field():
+    """Agents reach the target by following next_step"""
+    map_obj = open_map()
+    pathfinder = Pathfinder(map_obj)
+    x, y = 1, 1
+    for _ in range(20):
+        move = pathfinder.next_step(x, y, [(9, 9), (10, 1)])
+        if move is None:
+            break
+        x, y = x + move[0], y + move[1]
+    assert (x, y) == (10, 1)
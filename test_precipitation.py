@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Tests for the pooled weather precipitation field"""
+
+import time
+
+import numpy as np
+
+from first_python_rpg.pyxel_enhancements import (
+    WEATHER_PRECIPITATION,
+    PrecipitationField,
+)
+
+
+def test_drops_persist_and_fall():
+    """Drops move by their velocity instead of jumping around"""
+    field = PrecipitationField()
+    field.set_weather("snow")
+    assert field.count == WEATHER_PRECIPITATION["snow"]["count"]
+    y_before = field.y[: field.count].copy()
+    field.update()
+    moved = field.y[: field.count] - y_before
+    # Everything either fell a little or was recycled to the top
+    assert np.all((moved > 0) | (field.y[: field.count] == 0))
+
+
+def test_drops_are_recycled_on_screen():
+    """Drops that leave the screen come back in at the upwind edge"""
+    field = PrecipitationField()
+    field.set_weather("rain")
+    for _ in range(200):
+        field.update()
+    n = field.count
+    assert n == WEATHER_PRECIPITATION["rain"]["count"]
+    assert np.all((field.x[:n] >= 0) & (field.x[:n] < field.width))
+    assert np.all((field.y[:n] >= 0) & (field.y[:n] < field.height))
+
+
+def test_clear_weather_has_no_drops():
+    """Clear skies empty the pool"""
+    field = PrecipitationField()
+    field.set_weather("rain")
+    field.set_weather("clear")
+    assert field.count == 0
+    field.update()
+    assert not field.render_overlay().pget(10, 10)
+
+
+def test_overlay_holds_drops():
+    """Rendering writes each drop's color into the overlay"""
+    field = PrecipitationField()
+    field.set_weather("fog")
+    overlay = field.render_overlay()
+    x, y = int(field.x[0]), int(field.y[0])
+    assert overlay.pget(x, y) == WEATHER_PRECIPITATION["fog"]["color"]
+
+
+def test_thousands_of_drops_are_cheap():
+    """A full pool updates and renders in well under a frame"""
+    field = PrecipitationField(capacity=4096, density=4.0)
+    field.set_weather("rain")
+    assert field.count == 4096
+    start = time.perf_counter()
+    for _ in range(60):
+        field.update()
+        field.render_overlay()
+    per_frame = (time.perf_counter() - start) / 60
+    print(f"✓ {field.count} drops in {per_frame * 1000:.3f} ms per frame")
+    assert per_frame < 0.016
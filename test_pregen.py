@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Tests for the background map and dungeon pre-generation service"""
+
+import numpy as np
+
+from first_python_rpg.engine import GameEngine
+from first_python_rpg.map_data import MAP_SIZE
+from first_python_rpg.pregen import GenerationService
+from first_python_rpg.pyxel_enhancements import EnhancedMapPyxel
+
+
+def test_levels_follow_the_seed_stream():
+    """The same service seed yields the same levels in the same order"""
+    first = GenerationService(seed=42, background=False)
+    second = GenerationService(seed=42, background=False)
+    for job in (("map", 16), ("dungeon", 24, "caves"), ("map", 16)):
+        seed_a, tiles_a, spawn_a = first.take(job)
+        seed_b, tiles_b, spawn_b = second.take(job)
+        assert seed_a == seed_b and spawn_a == spawn_b
+        assert np.array_equal(tiles_a, tiles_b)
+
+
+def test_queue_is_kept_topped_up():
+    """Taking a level queues another one"""
+    service = GenerationService(seed=1, queue_size=3, background=False)
+    service.take(("map", 16))
+    assert len(service.queues[("map", 16)]) == 3
+
+
+def test_background_pool_matches_inline_generation():
+    """Worker processes return the same compact arrays as inline generation"""
+    background = GenerationService(seed=7, background=True)
+    inline = GenerationService(seed=7, background=False)
+    try:
+        for job in (("map", 32), ("dungeon", 32, "bsp")):
+            background.prefetch(job)
+            inline.prefetch(job)
+            seed_a, tiles_a, _ = background.take(job)
+            seed_b, tiles_b, _ = inline.take(job)
+            assert seed_a == seed_b
+            assert tiles_a.dtype == np.uint8
+            assert np.array_equal(tiles_a, tiles_b)
+    finally:
+        background.shutdown()
+
+
+def test_take_builds_maps():
+    """Queued levels come back as ready maps of the requested class"""
+    service = GenerationService(seed=3, background=False)
+    overworld = service.take_map(16, EnhancedMapPyxel)
+    assert isinstance(overworld, EnhancedMapPyxel)
+    assert overworld.size == 16
+    dungeon = service.take_dungeon(20, "caves")
+    assert dungeon.is_walkable(*dungeon.spawn)
+
+
+def test_engine_takes_map_from_queue():
+    """Starting a game uses the pre-generated map queue"""
+    engine = GameEngine()
+    job = ("map", MAP_SIZE)
+    engine.step({"confirm"})
+    assert engine.map is not None
+    assert len(engine.generation.queues[job]) == engine.generation.queue_size
+
+
+def test_shutdown_cancels_queued_jobs():
+    """After shutdown queued levels are generated inline instead"""
+    service = GenerationService(seed=5, queue_size=3, background=True)
+    service.prefetch(("map", 16))
+    service.shutdown()
+    assert service.executor is None
+    seed, tiles, _ = service.take(("map", 16))
+    _, expected, _ = GenerationService(seed=5, background=False).take(("map", 16))
+    assert np.array_equal(tiles, expected)
+    service.shutdown()  # A second call is harmless
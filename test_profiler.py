@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Tests for the per-subsystem frame profiler"""
+
+import csv
+
+from first_python_rpg.engine import GameEngine
+from first_python_rpg.profiler import FrameProfiler, STAGES
+
+
+def test_disabled_profiler_records_nothing():
+    """With no overlay and no CSV the profiler stays idle"""
+    profiler = FrameProfiler()
+    profiler.begin_frame()
+    with profiler.section("map_draw"):
+        pass
+    profiler.end_frame()
+    assert profiler.stats("map_draw") is None
+    assert profiler.stats("frame") is None
+
+
+def test_rolling_stats():
+    """Stats report p50, p95 and max over the rolling window"""
+    profiler = FrameProfiler(window=100)
+    profiler.toggle_overlay()
+    for ms in range(1, 101):
+        profiler.begin_frame()
+        profiler.add_sample("hud_draw", float(ms))
+        profiler.end_frame()
+    p50, p95, worst = profiler.stats("hud_draw")
+    assert p50 == 51.0
+    assert p95 == 96.0
+    assert worst == 100.0
+
+
+def test_engine_stages_stream_to_csv(tmp_path):
+    """Headless engine ticks produce one CSV row per frame"""
+    path = tmp_path / "frames.csv"
+    engine = GameEngine()
+    engine.features["particle_effects"] = True
+    engine.features["weather_system"] = True
+    engine.profiler.start_csv(path)
+    engine.step({"confirm"})
+    for _ in range(9):
+        engine.profiler.begin_frame()
+        engine.step({"right"})
+        engine.profiler.end_frame()
+    engine.profiler.stop_csv()
+
+    with open(path, newline="") as csv_file:
+        rows = list(csv.reader(csv_file))
+    assert rows[0] == ["frame", "frame_ms", *STAGES]
+    assert len(rows) == 10
+    header = rows[0]
+    assert rows[-1][header.index("state_update")] != ""
+    assert rows[-1][header.index("weather_update")] != ""
+    assert rows[-1][header.index("map_draw")] == ""
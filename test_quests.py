@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Tests for the event bus, quest goals and the quest manager"""
+
+import random
+
+import numpy as np
+import pytest
+
+from first_python_rpg.clock import TICK_RATE
+from first_python_rpg.engine import GameEngine
+from first_python_rpg.events import EventBus
+from first_python_rpg.map import MapPyxel, TILE_CODES
+from first_python_rpg.pathfinding import Pathfinder
+from first_python_rpg.pyxel_enhancements import QuestGenerator
+from first_python_rpg.quests import (
+    ACTIVE_QUESTS,
+    COLLECT_GOLD,
+    CollectGoal,
+    Goal,
+    GridIndex,
+    KillGoal,
+    Quest,
+    QuestManager,
+    ReachGoal,
+    SurviveGoal,
+    pick_reach_target,
+)
+
+
+def test_bus_dispatches_to_subscribers():
+    """Handlers only see their own event and may unsubscribe mid-dispatch"""
+    bus = EventBus()
+    seen = []
+
+    def once(**data):
+        seen.append(("once", data["gold"]))
+        bus.unsubscribe("gold_changed", once)
+
+    bus.subscribe("gold_changed", once)
+    bus.subscribe("gold_changed", lambda **data: seen.append(("all", data["gold"])))
+    bus.emit("gold_changed", gold=5, delta=5)
+    bus.emit("gold_changed", gold=7, delta=2)
+    bus.emit("enemy_defeated", name="Orc")
+    assert seen == [("once", 5), ("all", 5), ("all", 7)]
+    with pytest.raises(ValueError):
+        bus.subscribe("level_up", print)
+
+
+def test_goals_count_their_events():
+    """Typed goals only count the events that match them"""
+    slay = KillGoal(1, target="Orc")
+    assert not slay.advance(name="Goblin")
+    assert slay.advance(name="Orc")
+    collect = CollectGoal(COLLECT_GOLD)
+    assert not collect.advance(gold=0, delta=-5)
+    assert collect.advance(gold=COLLECT_GOLD, delta=COLLECT_GOLD)
+    survive = SurviveGoal(2)
+    assert not survive.advance(seconds=1)
+    assert survive.advance(seconds=1) and survive.progress == 2
+
+
+def test_grid_index_reads_one_bucket():
+    """Rectangles spanning buckets are found from any tile inside them"""
+    index = GridIndex(bucket_size=4)
+    index.insert("wide", (2, 2, 9, 3))
+    index.insert("dot", (5, 5, 5, 5))
+    assert index.query(2, 2) == ["wide"] and index.query(9, 3) == ["wide"]
+    assert index.query(5, 5) == ["dot"]
+    assert index.query(5, 4) == [] and index.query(10, 3) == []
+    index.remove("wide")
+    assert len(index) == 1 and index.query(2, 2) == []
+    assert set(index.buckets) == {(1, 1)}
+
+
+def test_manager_runs_many_quests_at_once():
+    """Dozens of quests only see their own events and leave when done"""
+    bus = EventBus()
+    done = []
+    manager = QuestManager(bus, done.append)
+    reach = [
+        manager.add(Quest("reach_location", "Go", 10, ReachGoal((x, 1, x, 1))))
+        for x in range(40)
+    ]
+    slay = manager.add(Quest("kill_enemies", "Slay", 10, KillGoal(1, "Orc")))
+    survive = manager.add(Quest("survive_time", "Wait", 10, SurviveGoal(3)))
+    assert len(manager) == 42
+
+    bus.emit("tile_entered", x=7, y=1)
+    bus.emit("tile_entered", x=7, y=2)
+    bus.emit("enemy_defeated", name="Goblin")
+    assert done == [reach[7]] and reach[7].completed
+    bus.emit("enemy_defeated", name="Orc")
+    for _ in range(3):
+        bus.emit("time_elapsed", seconds=1)
+    assert done == [reach[7], slay, survive]
+    assert len(manager) == 39 and len(manager.locations) == 39
+
+    manager.close()
+    assert len(manager) == 0
+    assert not any(bus.handlers.values())
+
+
+def test_reach_targets_are_reachable():
+    """Generated location goals sit in the player's region of the map"""
+    tiles = np.full((16, 16), TILE_CODES["."], dtype=np.uint8)
+    tiles[0, :] = tiles[-1, :] = tiles[:, 0] = tiles[:, -1] = TILE_CODES["R"]
+    tiles[:, 6] = TILE_CODES["o"]  # A river cuts off the left side
+    map_obj = MapPyxel(tiles=tiles, spawn=(10, 8))
+    field = Pathfinder(map_obj).distance_field((10, 8))
+    random.seed(4)
+    for _ in range(30):
+        x, y = pick_reach_target(map_obj, (10, 8))
+        assert x > 6 and field[y, x] > 0
+    # Every pick reuses the map's one cached distance field
+    assert map_obj.get_pathfinder() is map_obj.pathfinder
+    assert len(map_obj.pathfinder.fields) == 1
+
+    tiles[7:10, 9:12] = TILE_CODES["R"]
+    tiles[8, 10] = TILE_CODES["."]
+    assert pick_reach_target(MapPyxel(tiles=tiles, spawn=(10, 8)), (10, 8)) is None
+
+
+def test_generator_builds_typed_quests():
+    """create_quest gives typed goals, generate_quest the legacy dict"""
+    random.seed(2)
+    map_obj = MapPyxel(seed=3)
+    generator = QuestGenerator()
+    for _ in range(40):
+        quest = generator.create_quest(map_obj, map_obj.spawn)
+        assert isinstance(quest.goal, Goal) and quest.reward > 0
+        if quest.kind == "reach_location" and quest.goal.target:
+            assert map_obj.is_reachable(map_obj.spawn, quest.goal.target)
+    legacy = generator.generate_quest()
+    assert {"type", "objective", "reward", "completed", "progress"} <= set(legacy)
+
+
+def test_engine_rewards_quests_from_events():
+    """Play time and quest rewards reach quests through the engine's bus"""
+    engine = GameEngine()
+    engine.features["dynamic_quests"] = True
+    engine.step({"confirm"})
+    assert len(engine.quests) == ACTIVE_QUESTS
+    engine.quests.clear()
+    engine.quests.add(Quest("survive_time", "Wait", 20, SurviveGoal(2)))
+    gold = engine.player.gold
+    for _ in range(2 * TICK_RATE):
+        engine.step()
+    assert engine.player.gold >= gold + 20
+    assert engine.event_message.startswith("Quest completed")
+    assert len(engine.quests) == 1
+    assert not engine.quests.active[0].completed
+
+
+def test_collect_quests_complete_once_per_gain():
+    """Reward payouts neither re-complete nor advance other collect quests"""
+    engine = GameEngine()
+    engine.features["dynamic_quests"] = True
+    engine.step({"confirm"})
+    engine.quests.clear()
+    collect = [
+        engine.quests.add(Quest("collect_items", name, 20, CollectGoal(10)))
+        for name in "ABC"
+    ]
+    gold = engine.player.gold
+    engine.player.gold += 10
+    engine.events.emit("gold_changed", gold=engine.player.gold, delta=10)
+    assert all(quest.completed for quest in collect)
+    assert engine.player.gold == gold + 10 + 3 * 20
+    assert len(engine.quests) == ACTIVE_QUESTS
+    assert not any(quest in engine.quests.active for quest in collect)
+
+    done = []
+    manager = QuestManager(EventBus(), done.append)
+    for name in "ABC":
+        manager.add(Quest("collect_items", name, 10, CollectGoal(10)))
+    manager.bus.emit("gold_changed", gold=10, delta=10)
+    assert [quest.objective for quest in done] == ["A", "B", "C"]
+
+
+def test_only_defeated_enemies_advance_kill_goals():
+    """Taking a hit from an enemy that gets away does not count as a kill"""
+    random.seed(6)
+    engine = GameEngine()
+    engine.features["enemy_encounters"] = True
+    engine.step({"confirm"})
+    slay = engine.quests.add(Quest("kill_enemies", "Slay", 10, KillGoal(10000)))
+    hits = kills = 0
+    for tick in range(3000):
+        engine.player.health = engine.player.max_health
+        engine.event_message = None
+        engine.step({"left" if tick % 4 < 2 else "right"})
+        if engine.player.health < engine.player.max_health:
+            hits += 1
+            kills += engine.event_message.endswith("You defeated it!")
+    assert 0 < kills < hits
+    assert slay.goal.progress == kills
+
+
+def test_generated_goals_match_their_objectives():
+    """The numbers and names in the objective text are what the goal counts"""
+    random.seed(8)
+    generator = QuestGenerator()
+    seen = set()
+    for _ in range(200):
+        quest = generator.create_quest()
+        goal = quest.goal
+        seen.add(quest.objective.split()[0])
+        if quest.kind == "collect_items":
+            assert isinstance(goal, CollectGoal)
+            assert f"{goal.total} gold" in quest.objective
+        elif quest.kind == "kill_enemies" and quest.objective.startswith("Slay"):
+            assert goal.total == 1 and quest.objective.endswith(goal.target)
+        elif quest.kind == "kill_enemies":
+            assert goal.target is None
+            assert quest.objective == f"Defeat {goal.total} enemies"
+    assert {"Collect", "Find", "Slay", "Defeat"} <= seen
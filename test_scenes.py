@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Tests for the scene stack"""
+
+from first_python_rpg.engine import GameEngine
+from first_python_rpg.scenes import Scene, SceneStack
+from first_python_rpg.sprites import ATLAS
+
+
+def test_scenes_are_built_on_first_entry():
+    """The menu comes up alone; other scenes are built when entered"""
+    engine = GameEngine()
+    assert list(engine.scenes.scenes) == ["feature_select"]
+    baked = dict(ATLAS.slots)
+    engine.step({"confirm"})
+    assert set(engine.scenes.scenes) == {"feature_select", "playing"}
+    assert ATLAS.slots == baked  # The headless engine renders nothing
+    playing = engine.scenes.top
+    engine.step({"back"})
+    engine.step({"menu"})
+    engine.step({"confirm"})
+    assert engine.scenes.top is playing
+
+
+def test_pause_stacks_over_the_game():
+    """Pausing freezes play time and resuming returns to the same scene"""
+    engine = GameEngine()
+    engine.step({"confirm"})
+    engine.step({"back"})
+    assert [scene.name for scene in engine.scenes.stack] == ["playing", "paused"]
+    assert engine.scenes.top.overlay
+    ticks = engine.play_ticks
+    for _ in range(30):
+        engine.step()
+    assert engine.play_ticks == ticks
+    engine.step({"back"})
+    assert [scene.name for scene in engine.scenes.stack] == ["playing"]
+    engine.step({"back"})
+    engine.step({"menu"})
+    assert [scene.name for scene in engine.scenes.stack] == ["feature_select"]
+
+
+def test_stacked_scenes_return_to_the_scene_below():
+    """Going back to a scene further down pops everything above it"""
+    entered = []
+
+    class Tracked(Scene):
+        def enter(self):
+            entered.append(self.name)
+
+    scene_classes = {
+        name: type(name, (Tracked,), {"name": name, "stacked": stacked})
+        for name, stacked in (("world", False), ("battle", True), ("menu", False))
+    }
+    stack = SceneStack(None, scene_classes)
+    stack.go("world")
+    stack.go("battle")
+    stack.go("world")
+    assert [scene.name for scene in stack.stack] == ["world"]
+    stack.go("battle")
+    stack.go("menu")
+    assert [scene.name for scene in stack.stack] == ["menu"]
+    assert entered == ["world", "battle", "battle", "menu"]
+    assert len(stack.scenes) == 3
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Tests for the baked sprite atlas"""
+
+import pyxel
+
+from first_python_rpg.map_data import SPRITES, draw_boss_sprite
+from first_python_rpg.sprites import SpriteAtlas, image_pixels
+
+
+def render_both_ways(atlas, kind, size, color):
+    """Draw a sprite procedurally and from the atlas onto matching images"""
+    procedural = pyxel.Image(size, size)
+    procedural.cls(3)
+    SPRITES[kind](0, 0, size, color, procedural)
+    baked = pyxel.Image(size, size)
+    baked.cls(3)
+    atlas.draw_sprite(kind, 0, 0, size, color, baked)
+    return image_pixels(procedural).copy(), image_pixels(baked).copy()
+
+
+def test_baked_sprites_match_procedural():
+    """Blitting from the atlas gives the same pixels as the procedural draw"""
+    atlas = SpriteAtlas()
+    for kind in ("player", "enemy", "tree", "rock", "potion", "treasure", "trap"):
+        procedural, baked = render_both_ways(atlas, kind, 8, 8)
+        assert (procedural == baked).all(), f"{kind} sprite differs"
+
+
+def test_sprites_are_baked_once():
+    """Each (kind, size, color) is baked a single time"""
+    atlas = SpriteAtlas()
+    target = pyxel.Image(32, 32)
+    atlas.draw_sprite("tree", 0, 0, 23, 11, target)
+    atlas.draw_sprite("tree", 5, 5, 23, 11, target)
+    atlas.draw_sprite("tree", 0, 0, 23, 3, target)
+    assert len(atlas.slots) == 2
+    atlas.draw_sprite("fog", 0, 0, 8, 6, target)
+    assert len(atlas.slots) == 2
+
+
+def test_boss_sprites_bake():
+    """Boss sprites bake into 32x32 slots and match their procedural draw"""
+    atlas = SpriteAtlas()
+    atlas.bake_startup(23)
+    for boss_type in range(3):
+        procedural = pyxel.Image(32, 32)
+        draw_boss_sprite(0, 0, boss_type, 32, procedural)
+        baked = pyxel.Image(32, 32)
+        atlas.draw_boss(boss_type, 0, 0, baked)
+        assert (image_pixels(procedural) == image_pixels(baked)).all()
+
+
+def test_full_atlas_falls_back():
+    """A full atlas still draws the sprite procedurally"""
+    atlas = SpriteAtlas(width=8, height=8)
+    target = pyxel.Image(16, 16)
+    atlas.draw_sprite("player", 0, 0, 8, 8, target)
+    atlas.draw_sprite("player", 0, 0, 16, 9, target)
+    assert len(atlas.slots) == 1
+    assert target.pget(10, 0) == 9
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Tests for the retained-mode UI panels and text layout cache"""
+
+from first_python_rpg.ui import MESSAGE_WIDTH, Panel, wrap_text
+
+
+def test_wrap_text_caches_layouts():
+    """Long messages wrap at spaces and the layout is computed once"""
+    message = "A travelling merchant offers you a rare potion for free!"
+    lines = wrap_text(message)
+    assert len(lines) > 1
+    assert all(len(line.rstrip()) <= MESSAGE_WIDTH for line in lines)
+    assert " ".join(line.strip() for line in lines) == message
+    hits = wrap_text.cache_info().hits
+    assert wrap_text(message) is lines
+    assert wrap_text.cache_info().hits == hits + 1
+    assert wrap_text("Short") == ("Short",)
+
+
+def test_panel_renders_only_when_values_change():
+    """Unchanged values reuse the image; sized panels report their size"""
+    calls = []
+
+    def render(image, health, gold):
+        calls.append((health, gold))
+        image.cls(6)
+        image.text(1, 1, f"HP: {health}", 7)
+        return 40, 10
+
+    panel = Panel(64, 20, render)
+    assert panel.update(10, 0)
+    for _ in range(100):
+        assert not panel.update(10, 0)
+    assert panel.update(9, 0)
+    assert calls == [(10, 0), (9, 0)] and panel.renders == 2
+    assert (panel.width, panel.height) == (40, 10)
+    assert panel.image.pget(0, 0) == 6
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Tests for the wave-function-collapse terrain generator"""
+
+import numpy as np
+
+from first_python_rpg.map import MapPyxel, TILE_CODES, TILE_CHARS
+from first_python_rpg.wfc import (
+    AdjacencyRules,
+    benchmark_wfc,
+    collapse,
+    generate_wfc_tiles,
+)
+
+
+def broken_pairs(tiles, rules):
+    """Number of neighbouring tile pairs the rules do not allow"""
+    allowed = np.array(
+        [
+            [rules.allowed[a] >> b & 1 for b in range(len(TILE_CHARS))]
+            for a in TILE_CODES.values()
+        ],
+        dtype=bool,
+    )
+    horizontal = ~allowed[tiles[:, :-1], tiles[:, 1:]]
+    vertical = ~allowed[tiles[:-1, :], tiles[1:, :]]
+    return int(horizontal.sum() + vertical.sum())
+
+
+def test_rules_are_symmetric_bitmasks():
+    """Declared rules are mirrored and summarised per mask"""
+    rules = AdjacencyRules.from_table({".": ".", "o": "o~", "~": "~"})
+    water, sand = TILE_CODES["o"], TILE_CODES["~"]
+    assert rules.allowed[sand] >> water & 1
+    assert rules.support[1 << water | 1 << sand] == 1 << water | 1 << sand
+
+
+def test_generated_terrain_follows_the_rules():
+    """Water only ever touches water or sand, and the border is rock"""
+    rules = AdjacencyRules.from_table()
+    for seed in range(5):
+        stats = {}
+        tiles = generate_wfc_tiles(np.random.default_rng(seed), (64, 64), stats=stats)
+        assert tiles.dtype == np.uint8 and tiles.shape == (64, 64)
+        assert (tiles[0, :] == TILE_CODES["R"]).all()
+        assert (tiles[:, -1] == TILE_CODES["R"]).all()
+        assert stats["contradictions"] == 0
+        assert broken_pairs(tiles, rules) == 0
+
+
+def test_terrain_forms_biomes():
+    """Neighbours share a tile far more often than independent noise does"""
+    rng = np.random.default_rng(3)
+    tiles = generate_wfc_tiles(rng, (96, 96))
+    same = (tiles[:, :-1] == tiles[:, 1:]).mean()
+    counts = np.bincount(tiles.ravel(), minlength=len(TILE_CHARS)) / tiles.size
+    assert same > (counts**2).sum() + 0.15
+    assert counts[TILE_CODES["o"]] > 0 and counts[TILE_CODES["T"]] > 0
+
+
+def test_learned_rules_reproduce_sample_pairs():
+    """Rules learned from a sample never put sand next to rock"""
+    sample = np.array(
+        [[6, 6, 0, 1, 4], [6, 0, 0, 1, 4], [0, 0, 1, 1, 4]],
+        dtype=np.uint8,
+    )
+    rules = AdjacencyRules.learn([sample])
+    assert not rules.allowed[TILE_CODES["~"]] >> TILE_CODES["R"] & 1
+    stats = {}
+    tiles = collapse(32, 32, rules, np.random.default_rng(0), stats=stats)
+    assert stats["contradictions"] == 0
+    assert broken_pairs(tiles, rules) == 0
+    assert set(np.unique(tiles)) <= {0, 1, 4, 6}
+
+
+def test_wfc_map_is_deterministic_and_walkable_at_spawn():
+    """The same seed gives the same map, and the spawn is open ground"""
+    first = MapPyxel(size=48, seed=11, terrain="wfc")
+    second = MapPyxel(size=48, seed=11, terrain="wfc")
+    assert np.array_equal(first.tiles, second.tiles)
+    assert first.is_walkable(*first.spawn)
+    assert first.reachable_fraction() >= MapPyxel.spawn_coverage
+
+
+def test_generation_benchmark():
+    """A 256x256 map collapses in well under a second"""
+    for size, seconds in benchmark_wfc():
+        print(f"✓ wfc {size}x{size}: {seconds * 1000:.1f} ms")
+        assert seconds < 1.0